@@ -1,79 +1,64 @@
-import asyncio
 from typing import Optional
 
 from msmart.device import air_conditioning
-from msmart.scanner import MideaDiscovery
 
-from homecontrol.aircon.exceptions import ACInvalidStateError
-from homecontrol.aircon.structs import ACAccountConfig, ACConnectionInfo, ACState
-from homecontrol.exceptions import DeviceConnectionError
+from homecontrol import event_loop
+from homecontrol.aircon.async_aircon import AsyncACDevice
+from homecontrol.aircon.structs import (
+    ACAccountConfig,
+    ACConnectionInfo,
+    ACState,
+    ACStateSnapshot,
+)
 
 
 class ACDevice:
     """
-    Wrapper for msmart's air_conditioning object
+    Synchronous wrapper for an AsyncACDevice (runs its methods on the shared
+    event loop)
     """
 
-    device: air_conditioning
-    connection_info: ACConnectionInfo
+    _async_device: AsyncACDevice
 
-    def __init__(self, connection_info: ACConnectionInfo) -> None:
+    def __init__(self, async_device: AsyncACDevice) -> None:
+        self._async_device = async_device
+
+    @property
+    def async_device(self) -> AsyncACDevice:
         """
-        Creates the msmart device instance and authenticates it
+        Returns the AsyncACDevice this wraps
         """
-        self.connection_info = connection_info
-        self.device = air_conditioning(
-            self.connection_info.ip_address,
-            self.connection_info.identifier,
-            self.connection_info.port,
-        )
-        self.device.authenticate(self.connection_info.key, self.connection_info.token)
-        self.device.get_capabilities()
-
-    def _get_state_from_device(self) -> ACState:
-        """
-        Returns the current state from the device (but does not refresh it first)
-        """
-        return ACState(
-            power=self.device.power_state,
-            prompt_tone=self.device.prompt_tone,
-            target=self.device.target_temperature,
-            mode=self.device.operational_mode,
-            fan=self.device.fan_speed,
-            swing=self.device.swing_mode,
-            eco=self.device.eco_mode,
-            turbo=self.device.turbo_mode,
-            fahrenheit=self.device.fahrenheit,
-            indoor=self.device.indoor_temperature,
-            outdoor=self.device.outdoor_temperature,
-        )
+        return self._async_device
 
-    def _assign_state_to_device(self, state: ACState):
+    @property
+    def device(self) -> air_conditioning:
         """
-        Assigns the state of the device (but does not update it)
+        Returns the msmart device
         """
-        self.device.power_state = state.power
-        self.device.prompt_tone = state.prompt_tone
-        self.device.target_temperature = state.target
-        self.device.operational_mode = state.mode
-        self.device.fan_speed = state.fan
-        self.device.swing_mode = state.swing
-        self.device.eco_mode = state.eco
-        self.device.turbo_mode = state.turbo
-        self.device.fahrenheit = state.fahrenheit
+        return self._async_device.device
 
-    def _validate_state(self, state: ACState):
+    @property
+    def connection_info(self) -> ACConnectionInfo:
+        """
+        Returns the information used to connect to the device
         """
-        Validates a state (for use before it is sent to a device)
+        return self._async_device.connection_info
 
-        TODO: Take account of fahrenheit
+    @property
+    def connected(self) -> bool:
         """
-        if state.eco and state.turbo:
-            raise ACInvalidStateError(
-                "Cannot have both eco and turbo true at the same time"
-            )
-        if not 16 <= state.target <= 30:
-            raise ACInvalidStateError("target_temp must be between 16 and 30")
+        Returns whether the device has been authenticated successfully
+        """
+        return self._async_device.connected
+
+    def connect(self):
+        """
+        Authenticates with the device and obtains its capabilities
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue
+        """
+        event_loop.run(self._async_device.connect())
 
     def get_state(self) -> ACState:
         """
@@ -82,36 +67,47 @@ class ACDevice:
         Raises:
             DeviceConnectionError: When there is a connection issue
         """
-        # Attempt to refresh the device
-        try:
-            self.device.refresh()
+        return event_loop.run(self._async_device.get_state())
 
-            return self._get_state_from_device()
-        except UnboundLocalError as err:
-            raise DeviceConnectionError(
-                "An error occurred while attempting to refresh an AC unit's state"
-            ) from err
+    def get_snapshot(self, max_age: Optional[float] = None) -> ACStateSnapshot:
+        """
+        Returns the last state obtained from the device, only refreshing it
+        if there isn't one or it is older than max_age
 
-    def set_state(self, state: ACState) -> Optional[ACState]:
+        Args:
+            max_age (Optional[float]): Maximum age of the state (seconds).
+                                       When None any previous state is
+                                       returned.
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue
         """
-        Attempts to assign the devices state
+        return event_loop.run(self._async_device.get_snapshot(max_age))
+
+    def set_state(self, state: ACState) -> ACState:
+        """
+        Attempts to assign the devices state and returns the state of the
+        device afterwards
 
         Raises:
             DeviceConnectionError: When there is a connection issue
             ACInvalidState: When the given state is invalid
         """
-        self._validate_state(state)
-        self._assign_state_to_device(state)
+        return event_loop.run(self._async_device.set_state(state))
+
+    def update_state(self, **changes) -> ACState:
+        """
+        Assigns only the given fields of the devices state and returns the
+        state of the device afterwards
 
-        # Attempt to apply the state
-        try:
-            self.device.apply()
+        Changes made within the debounce window of each other (e.g. from
+        other threads) are combined and applied to the device at once
 
-            return state
-        except UnboundLocalError as err:
-            raise DeviceConnectionError(
-                "An error occurred while attempting to apply a state to a AC unit"
-            ) from err
+        Raises:
+            DeviceConnectionError: When there is a connection issue
+            ACInvalidState: When the changes or resulting state are invalid
+        """
+        return event_loop.run(self._async_device.update_state(**changes))
 
     @staticmethod
     def discover(
@@ -123,36 +119,8 @@ class ACDevice:
         Raises:
             DeviceConnectionError: When there is a connection issue
         """
-        found_devices = None
-        try:
-            discovery = MideaDiscovery(
-                account=account_config.username,
-                password=account_config.password,
-                amount=1,
-            )
-            loop = asyncio.new_event_loop()
-            found_devices = loop.run_until_complete(discovery.get(ip_address))
-            loop.close()
-        except Exception as err:
-            raise DeviceConnectionError(
-                "An error occurred while attempting to discover an AC unit"
-            ) from err
-
-        if found_devices:
-            # Only looked for one anyway
-            found_device = list(found_devices)[0]
-
-            # Validate auth data was obtained correctly
-            if found_device.key is None or found_device.token is None:
-                raise DeviceConnectionError("Unable to obtain authentication info")
-
-            # Package the required info
-            return ACConnectionInfo(
-                name=name,
-                ip_address=found_device.ip,
-                port=found_device.port,
-                identifier=found_device.id,
-                key=found_device.key,
-                token=found_device.token,
+        return event_loop.run(
+            AsyncACDevice.discover(
+                name=name, ip_address=ip_address, account_config=account_config
             )
-        raise DeviceConnectionError(f"Unable to find the AC unit with ip {ip_address}")
+        )
@@ -0,0 +1,485 @@
+import asyncio
+import dataclasses
+import time
+from typing import Any, Dict, Optional
+
+from msmart.device import air_conditioning
+from msmart.scanner import MideaDiscovery
+
+from homecontrol.aircon.command_queue import ACCommandQueue, ACCommandType
+from homecontrol.aircon.exceptions import ACInvalidStateError
+from homecontrol.aircon.structs import (
+    ACAccountConfig,
+    ACCommandQueueStats,
+    ACConnectionInfo,
+    ACState,
+    ACStateSnapshot,
+)
+from homecontrol.circuit_breaker import CircuitBreaker
+from homecontrol.exceptions import DeviceConnectionError
+
+# Fields of an ACState that can be changed, along with the attribute of the
+# msmart device they are assigned to
+UPDATABLE_FIELDS = {
+    "power": "power_state",
+    "prompt_tone": "prompt_tone",
+    "target": "target_temperature",
+    "mode": "operational_mode",
+    "fan": "fan_speed",
+    "swing": "swing_mode",
+    "eco": "eco_mode",
+    "turbo": "turbo_mode",
+    "fahrenheit": "fahrenheit",
+}
+
+
+class AsyncACDevice:
+    """
+    Asynchronous wrapper for msmart's air_conditioning object
+
+    msmart's device communication is blocking, so it is run in the event
+    loop's executor allowing multiple devices to be communicated with at once
+    """
+
+    device: air_conditioning
+    connection_info: ACConnectionInfo
+
+    # Last state obtained from the device (if any)
+    _snapshot: Optional[ACStateSnapshot]
+
+    # msmart devices aren't thread safe, so every communication with the
+    # device is queued and sent one at a time
+    _queue: ACCommandQueue
+
+    # Whether connect() has succeeded
+    _connected: bool
+
+    # Records whether communication with the device succeeds (if given)
+    _circuit_breaker: Optional[CircuitBreaker]
+
+    # Changes given to update_state() are collected for this long (seconds)
+    # and then applied together, with every caller receiving the result
+    _debounce: float
+    _pending_changes: Dict[str, Any]
+    _pending_update: Optional[asyncio.Future]
+
+    # Changes are only applied to the last known state if it is no older
+    # than this, otherwise the device is refreshed first (seconds)
+    _update_max_age: float
+
+    def __init__(
+        self,
+        connection_info: ACConnectionInfo,
+        debounce: float = 0,
+        update_max_age: float = 0,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        """
+        Creates the msmart device instance (connect() should be called before
+        using it)
+        """
+        self.connection_info = connection_info
+        self._snapshot = None
+        self._queue = ACCommandQueue(self._execute)
+        self._connected = False
+        self._circuit_breaker = circuit_breaker
+        self._debounce = debounce
+        self._pending_changes = {}
+        self._pending_update = None
+        self._update_max_age = update_max_age
+        self.device = air_conditioning(
+            self.connection_info.ip_address,
+            self.connection_info.identifier,
+            self.connection_info.port,
+        )
+
+    @property
+    def connected(self) -> bool:
+        """
+        Returns whether the device has been authenticated successfully
+        """
+        return self._connected
+
+    def _execute(self, command_type: ACCommandType, argument: Any) -> Any:
+        """
+        Runs a command taken from the queue, recording whether the device
+        could be reached (blocking)
+        """
+        try:
+            result = self._execute_command(command_type, argument)
+        except DeviceConnectionError:
+            if self._circuit_breaker is not None:
+                self._circuit_breaker.record_failure()
+            raise
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.record_success()
+        return result
+
+    def _execute_command(self, command_type: ACCommandType, argument: Any) -> Any:
+        """
+        Runs a command taken from the queue (blocking)
+        """
+        if command_type == ACCommandType.CONNECT:
+            return self._connect()
+        if command_type == ACCommandType.REFRESH:
+            return self._refresh()
+        if command_type == ACCommandType.SET:
+            return self._apply(argument)
+        return self._apply_changes(argument)
+
+    def get_queue_stats(self) -> ACCommandQueueStats:
+        """
+        Returns statistics about the queue of commands sent to the device
+        """
+        return self._queue.get_stats()
+
+    def _connect(self):
+        """
+        Authenticates with the device and obtains its capabilities (blocking)
+        """
+        try:
+            authenticated = self.device.authenticate(
+                self.connection_info.key, self.connection_info.token
+            )
+            if authenticated:
+                self.device.get_capabilities()
+        except Exception as err:
+            raise DeviceConnectionError(
+                f"An error occurred while attempting to connect to the AC unit "
+                f"'{self.connection_info.name}'"
+            ) from err
+        if not authenticated:
+            raise DeviceConnectionError(
+                f"Failed to authenticate with the AC unit "
+                f"'{self.connection_info.name}'"
+            )
+        self._check_response("obtain its capabilities")
+        self._connected = True
+
+    async def connect(self):
+        """
+        Authenticates with the device and obtains its capabilities
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue
+        """
+        await self._queue.submit(ACCommandType.CONNECT)
+
+    def _get_state_from_device(self) -> ACState:
+        """
+        Returns the current state from the device (but does not refresh it first)
+        """
+        return ACState(
+            power=self.device.power_state,
+            prompt_tone=self.device.prompt_tone,
+            target=self.device.target_temperature,
+            mode=self.device.operational_mode,
+            fan=self.device.fan_speed,
+            swing=self.device.swing_mode,
+            eco=self.device.eco_mode,
+            turbo=self.device.turbo_mode,
+            fahrenheit=self.device.fahrenheit,
+            indoor=self.device.indoor_temperature,
+            outdoor=self.device.outdoor_temperature,
+        )
+
+    def _assign_state_to_device(self, state: ACState):
+        """
+        Assigns the state of the device (but does not update it)
+        """
+        self.device.power_state = state.power
+        self.device.prompt_tone = state.prompt_tone
+        self.device.target_temperature = state.target
+        self.device.operational_mode = state.mode
+        self.device.fan_speed = state.fan
+        self.device.swing_mode = state.swing
+        self.device.eco_mode = state.eco
+        self.device.turbo_mode = state.turbo
+        self.device.fahrenheit = state.fahrenheit
+
+    def _validate_state(self, state: ACState):
+        """
+        Validates a state (for use before it is sent to a device)
+
+        TODO: Take account of fahrenheit
+        """
+        if state.eco and state.turbo:
+            raise ACInvalidStateError(
+                "Cannot have both eco and turbo true at the same time"
+            )
+        if not 16 <= state.target <= 30:
+            raise ACInvalidStateError("target_temp must be between 16 and 30")
+
+    def _check_response(self, action: str):
+        """
+        Raises a DeviceConnectionError if the device didn't respond to the
+        last command sent to it (msmart doesn't raise in that case, it just
+        leaves the device's attributes as they were)
+        """
+        if not self.device.active:
+            raise DeviceConnectionError(
+                f"The AC unit '{self.connection_info.name}' did not respond while "
+                f"attempting to {action}"
+            )
+
+    def _refresh(self) -> ACStateSnapshot:
+        """
+        Refreshes the device and returns a snapshot of its current state
+        (blocking)
+
+        The previous snapshot is kept if the device doesn't respond so that
+        its age still reflects when the state was last obtained
+        """
+        try:
+            self.device.refresh()
+            self._check_response("refresh its state")
+
+            state = self._get_state_from_device()
+        except UnboundLocalError as err:
+            raise DeviceConnectionError(
+                "An error occurred while attempting to refresh an AC unit's state"
+            ) from err
+        self._snapshot = ACStateSnapshot(state=state, timestamp=time.time())
+        return self._snapshot
+
+    async def refresh(self) -> ACStateSnapshot:
+        """
+        Refreshes the device and returns a snapshot of its current state
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue
+        """
+        return await self._queue.submit(ACCommandType.REFRESH)
+
+    async def get_state(self) -> ACState:
+        """
+        Refreshes the device and returns the current state
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue
+        """
+        return (await self.refresh()).state
+
+    async def get_snapshot(self, max_age: Optional[float] = None) -> ACStateSnapshot:
+        """
+        Returns the last state obtained from the device, only refreshing it
+        if there isn't one or it is older than max_age
+
+        Args:
+            max_age (Optional[float]): Maximum age of the state (seconds).
+                                       When None any previous state is
+                                       returned.
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue
+        """
+        snapshot = self._snapshot
+        if snapshot is None or (
+            max_age is not None and time.time() - snapshot.timestamp > max_age
+        ):
+            snapshot = await self.refresh()
+        return snapshot
+
+    def _apply(self, state: ACState) -> ACStateSnapshot:
+        """
+        Assigns and applies a state to the device and returns a snapshot of
+        the resulting state (blocking)
+
+        msmart updates the device's attributes from the state included in the
+        response to the apply, so reading them back gives the state reported
+        by the device (or the state assigned merged with the last known
+        temperatures if the device didn't report one) without another refresh
+        """
+        # May have had queued changes merged into it
+        self._validate_state(state)
+
+        self._assign_state_to_device(state)
+        try:
+            self.device.apply()
+            self._check_response("apply a state")
+
+            new_state = self._get_state_from_device()
+        except DeviceConnectionError:
+            self._snapshot = None
+            raise
+        except UnboundLocalError as err:
+            # Previous state may no longer be accurate
+            self._snapshot = None
+            raise DeviceConnectionError(
+                "An error occurred while attempting to apply a state to a AC unit"
+            ) from err
+        self._snapshot = ACStateSnapshot(state=new_state, timestamp=time.time())
+        return self._snapshot
+
+    async def set_state(self, state: ACState) -> ACState:
+        """
+        Attempts to assign the devices state and returns the state of the
+        device afterwards
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue
+            ACInvalidState: When the given state is invalid
+        """
+        self._validate_state(state)
+
+        # Attempt to apply the state
+        snapshot = await self._queue.submit(ACCommandType.SET, state)
+        return snapshot.state
+
+    def _check_changes(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validates that changes only refer to fields of the state that can be
+        assigned, returning them with each value converted to the type of its
+        field (such as an ACMode)
+        """
+        field_types = {field.name: field.type for field in dataclasses.fields(ACState)}
+        checked = {}
+        for field, value in changes.items():
+            if field not in UPDATABLE_FIELDS:
+                raise ACInvalidStateError(f"Cannot change the AC state field '{field}'")
+
+            # Every field is either a bool or an int (bools are also ints)
+            field_type = field_types[field]
+            if not isinstance(value, int) or isinstance(value, bool) != (
+                field_type is bool
+            ):
+                raise ACInvalidStateError(
+                    f"The AC state field '{field}' must be "
+                    f"{'a boolean' if field_type is bool else 'an integer'}"
+                )
+            try:
+                checked[field] = field_type(value)
+            except ValueError as err:
+                raise ACInvalidStateError(
+                    f"{value} is not a valid value for the AC state field '{field}'"
+                ) from err
+        return checked
+
+    def _apply_changes(self, changes: Dict[str, Any]) -> ACStateSnapshot:
+        """
+        Applies changes to the last known state of the device and returns a
+        snapshot of the resulting state (blocking)
+
+        Only fields that differ from the last known state are assigned, and
+        nothing is sent to the device if there aren't any. The device is
+        refreshed first if the last known state is older than the update
+        max age, so that changes made by other means aren't reverted.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or time.time() - snapshot.timestamp > self._update_max_age:
+            snapshot = self._refresh()
+
+        changed = {
+            field: value
+            for field, value in changes.items()
+            if getattr(snapshot.state, field) != value
+        }
+        if not changed:
+            return snapshot
+
+        new_state = dataclasses.replace(snapshot.state, **changed)
+        self._validate_state(new_state)
+
+        # msmart sends the whole state, so ensure the rest is as last known
+        self._assign_state_to_device(snapshot.state)
+        for field, value in changed.items():
+            setattr(self.device, UPDATABLE_FIELDS[field], value)
+        try:
+            self.device.apply()
+            self._check_response("apply a state")
+
+            new_state = self._get_state_from_device()
+        except DeviceConnectionError:
+            self._snapshot = None
+            raise
+        except UnboundLocalError as err:
+            self._snapshot = None
+            raise DeviceConnectionError(
+                "An error occurred while attempting to apply a state to a AC unit"
+            ) from err
+        self._snapshot = ACStateSnapshot(state=new_state, timestamp=time.time())
+        return self._snapshot
+
+    async def _apply_pending_changes(self, future: asyncio.Future):
+        """
+        Waits for the debounce window to pass and then applies all the
+        changes collected in it, giving the result to the future
+        """
+        await asyncio.sleep(self._debounce)
+
+        changes = self._pending_changes
+        self._pending_changes = {}
+        self._pending_update = None
+        try:
+            snapshot = await self._queue.submit(ACCommandType.UPDATE, changes)
+        except Exception as err:
+            future.set_exception(err)
+        else:
+            future.set_result(snapshot.state)
+
+    async def update_state(self, **changes) -> ACState:
+        """
+        Assigns only the given fields of the devices state and returns the
+        state of the device afterwards
+
+        Changes made within the debounce window of each other are combined
+        (later values taking priority) and applied to the device at once
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue
+            ACInvalidState: When the changes or resulting state are invalid
+        """
+        changes = self._check_changes(changes)
+
+        if self._pending_update is None:
+            self._pending_update = asyncio.get_running_loop().create_future()
+            # Avoid warnings when every caller has been cancelled
+            self._pending_update.add_done_callback(
+                lambda future: future.cancelled() or future.exception()
+            )
+            asyncio.ensure_future(self._apply_pending_changes(self._pending_update))
+        self._pending_changes.update(changes)
+
+        return await asyncio.shield(self._pending_update)
+
+    @staticmethod
+    async def discover(
+        name: str, ip_address: str, account_config: ACAccountConfig
+    ) -> ACConnectionInfo:
+        """
+        Obtains connection information for air conditioning unit given its ip address
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue
+        """
+        found_devices = None
+        try:
+            discovery = MideaDiscovery(
+                account=account_config.username,
+                password=account_config.password,
+                amount=1,
+            )
+            found_devices = await discovery.get(ip_address)
+        except Exception as err:
+            raise DeviceConnectionError(
+                "An error occurred while attempting to discover an AC unit"
+            ) from err
+
+        if found_devices:
+            # Only looked for one anyway
+            found_device = list(found_devices)[0]
+
+            # Validate auth data was obtained correctly
+            if found_device.key is None or found_device.token is None:
+                raise DeviceConnectionError("Unable to obtain authentication info")
+
+            # Package the required info
+            return ACConnectionInfo(
+                name=name,
+                ip_address=found_device.ip,
+                port=found_device.port,
+                identifier=found_device.id,
+                key=found_device.key,
+                token=found_device.token,
+            )
+        raise DeviceConnectionError(f"Unable to find the AC unit with ip {ip_address}")
@@ -0,0 +1,384 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Future
+from threading import Lock
+from typing import Dict, List, Optional
+
+from homecontrol import event_loop
+from homecontrol.aircon.async_aircon import AsyncACDevice
+from homecontrol.aircon.config import ACConfig
+from homecontrol.aircon.poller import ACStatePoller
+from homecontrol.aircon.structs import (
+    ACCommandQueueStats,
+    ACConnectConfig,
+    ACPollingConfig,
+    ACStateResult,
+    ACStateSnapshot,
+    ACUpdateConfig,
+)
+from homecontrol.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerStats,
+)
+from homecontrol.exceptions import DeviceConnectionError, DeviceNotRegisteredError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncACManager:
+    """
+    Handles a set of aircon devices asynchronously (coroutines should be run
+    on the shared event loop)
+    """
+
+    _config: ACConfig
+    _loaded_devices: Dict[str, AsyncACDevice]
+
+    # Refreshes the states of the devices in the background
+    _polling_config: ACPollingConfig
+    _poller: ACStatePoller
+
+    # Devices are connected to in parallel, and any that fail are degraded
+    # (connection is retried in the background when they are next used)
+    _connect_config: ACConnectConfig
+    _connect_lock: Lock
+    _connecting: Dict[str, bool]
+    _last_connect_attempt: Dict[str, float]
+
+    _update_config: ACUpdateConfig
+
+    # Requests to devices that are repeatedly failing fail immediately
+    # rather than waiting for them to time out
+    _circuit_breaker_config: CircuitBreakerConfig
+    _circuit_breakers: Dict[str, CircuitBreaker]
+
+    def __init__(self) -> None:
+        """
+        Loads the config (load_devices() should be awaited before using any
+        devices)
+        """
+        self._config = ACConfig()
+        self._loaded_devices = {}
+        self._polling_config = self._config.get_polling()
+        self._poller = ACStatePoller(
+            interval=self._polling_config.interval, refresh=self.refresh_all
+        )
+        self._connect_config = self._config.get_connect()
+        self._connect_lock = Lock()
+        self._connecting = {}
+        self._last_connect_attempt = {}
+        self._update_config = self._config.get_updates()
+        self._circuit_breaker_config = self._config.get_circuit_breaker()
+        self._circuit_breakers = {}
+
+    def list_devices(self) -> List[str]:
+        """
+        Returns a list of loaded devices
+        """
+        return list(self._loaded_devices.keys())
+
+    async def register_device(self, name: str, ip_address: str):
+        """
+        Attempts to register a device
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue
+        """
+        result = await AsyncACDevice.discover(
+            name=name, ip_address=ip_address, account_config=self._config.get_account()
+        )
+        if result:
+            self._config.register_device(result)
+            self._config.save()
+
+            await self._load_device(name)
+
+    def _create_device(self, name: str) -> AsyncACDevice:
+        """
+        Creates (but does not connect) a device from the config
+
+        Raises
+            DeviceNotRegisteredError: If the device has not been registered
+        """
+        if not self._config.has_device(name):
+            raise DeviceNotRegisteredError(
+                f"Aircon device with name '{name}' has not been registered"
+            )
+        connection_info = self._config.get_device(name=name)
+        circuit_breaker = CircuitBreaker(
+            name,
+            self._circuit_breaker_config,
+            probe=lambda: event_loop.run(self._probe(device)),
+        )
+        device = AsyncACDevice(
+            connection_info,
+            debounce=self._update_config.debounce,
+            update_max_age=self._update_config.max_age,
+            circuit_breaker=circuit_breaker,
+        )
+        self._circuit_breakers.update({name: circuit_breaker})
+        self._loaded_devices.update({name: device})
+        return device
+
+    async def _probe(self, device: AsyncACDevice):
+        """
+        Checks whether a device is reachable (for its circuit breaker)
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue
+        """
+        if device.connected:
+            await device.refresh()
+        else:
+            await device.connect()
+
+    async def _load_device(self, name: str) -> AsyncACDevice:
+        """
+        Loads a device from the config and connects to it
+
+        Raises
+            DeviceNotRegisteredError: If the device has not been registered
+            DeviceConnectionError: When there is a connection issue
+        """
+        device = self._create_device(name)
+        self._last_connect_attempt[name] = time.monotonic()
+        await device.connect()
+        return device
+
+    async def load_devices(self):
+        """
+        Loads all registered devices from config, connecting to them in
+        parallel
+
+        Devices that fail to connect within the timeout are left degraded
+        rather than preventing the others from loading
+        """
+        if self._config.has_devices():
+            devices = self._config.get_devices()
+
+            # Load the devices
+            futures = {}
+            for name in devices.keys():
+                device = self._create_device(name)
+                futures[asyncio.wrap_future(self._start_connect(name, device))] = name
+
+            _, pending = await asyncio.wait(
+                futures, timeout=self._connect_config.timeout
+            )
+            for future in pending:
+                # Will still become available if it finishes connecting
+                logger.warning(
+                    "Timed out connecting to the AC unit '%s'", futures[future]
+                )
+
+    async def _connect(self, name: str, device: AsyncACDevice):
+        """
+        Attempts to connect to a device (run in the background)
+        """
+        try:
+            await device.connect()
+        except DeviceConnectionError as err:
+            logger.warning(
+                "Failed to connect to the AC unit '%s' (will retry when next "
+                "used): %s",
+                name,
+                err,
+            )
+        finally:
+            with self._connect_lock:
+                self._connecting[name] = False
+
+    def _start_connect(self, name: str, device: AsyncACDevice) -> Optional[Future]:
+        """
+        Starts connecting to a device in the background unless already doing
+        so, or it was attempted less than the retry interval ago (may be
+        called from any thread)
+
+        Returns:
+            Optional[Future]: Future of the attempt if one was started
+        """
+        with self._connect_lock:
+            if self._connecting.get(name):
+                return None
+            now = time.monotonic()
+            last_attempt = self._last_connect_attempt.get(name)
+            if (
+                last_attempt is not None
+                and now - last_attempt < self._connect_config.retry_interval
+            ):
+                return None
+            self._connecting[name] = True
+            self._last_connect_attempt[name] = now
+        return event_loop.submit(self._connect(name, device))
+
+    def _get_available_devices(self) -> Dict[str, AsyncACDevice]:
+        """
+        Returns the loaded devices that are connected (retrying any that are
+        degraded in the background)
+        """
+        available = {}
+        for name, device in list(self._loaded_devices.items()):
+            try:
+                self._circuit_breakers[name].check()
+            except DeviceConnectionError:
+                continue
+            if device.connected:
+                available[name] = device
+            else:
+                self._start_connect(name, device)
+        return available
+
+    def close(self):
+        """
+        Stops polling and unloads all devices (any connection attempts in
+        progress are left to finish in the background)
+        """
+        self.stop_polling()
+        self._loaded_devices.clear()
+        self._circuit_breakers.clear()
+        with self._connect_lock:
+            self._connecting.clear()
+            self._last_connect_attempt.clear()
+
+    def get_device(self, name: str) -> AsyncACDevice:
+        """
+        Returns a loaded AsyncACDevice
+
+        Raises:
+            DeviceNotRegisteredError: If the device is not registered
+            DeviceConnectionError: If the device is degraded (a reconnect
+                                   will be attempted in the background) or
+                                   its circuit breaker is open
+        """
+        if name in self._loaded_devices:
+            device = self._loaded_devices[name]
+            self._circuit_breakers[name].check()
+            if not device.connected:
+                self._start_connect(name, device)
+                raise DeviceConnectionError(
+                    f"Aircon device '{name}' is currently unavailable"
+                )
+            return device
+        raise DeviceNotRegisteredError(f"Aircon device '{name}' is not registered")
+
+    def start_polling(self):
+        """
+        Starts refreshing the states of the devices in the background (if
+        enabled in the config)
+        """
+        if self._polling_config.enabled:
+            self._poller.start()
+
+    def stop_polling(self):
+        """
+        Stops refreshing the states of the devices in the background
+        """
+        self._poller.stop()
+
+    async def get_state_snapshot(
+        self, name: str, max_age: Optional[float] = None
+    ) -> ACStateSnapshot:
+        """
+        Returns the last known state of a device, refreshing it first if it
+        is older than max_age
+
+        Args:
+            name (str): Name of the device
+            max_age (Optional[float]): Maximum age of the state (seconds).
+                            When None the max_age from the polling config is
+                            used while polling, otherwise the device is
+                            always refreshed.
+
+        Raises:
+            DeviceNotRegisteredError: If the device has not been registered
+            DeviceConnectionError: When there is a connection issue
+        """
+        if max_age is None:
+            max_age = self._polling_config.max_age if self._poller.running else 0
+        return await self.get_device(name).get_snapshot(max_age)
+
+    async def get_states(
+        self, names: Optional[List[str]] = None, max_age: Optional[float] = None
+    ) -> Dict[str, ACStateResult]:
+        """
+        Returns the states of several devices at once, refreshing any older
+        than max_age at the same time
+
+        Devices whose state can't be obtained are given an error instead
+        rather than failing the rest
+
+        Args:
+            names (Optional[List[str]]): Names of the devices. When None
+                            every loaded device is used.
+            max_age (Optional[float]): Maximum age of the states (seconds),
+                            see get_state_snapshot()
+        """
+        if names is None:
+            names = self.list_devices()
+        results = await asyncio.gather(
+            *(self.get_state_snapshot(name, max_age) for name in names),
+            return_exceptions=True,
+        )
+
+        states = {}
+        for name, result in zip(names, results):
+            if isinstance(result, (DeviceNotRegisteredError, DeviceConnectionError)):
+                states[name] = ACStateResult(error=str(result))
+            elif isinstance(result, Exception):
+                logger.error(
+                    "Unexpected error obtaining the state of the AC unit '%s'",
+                    name,
+                    exc_info=result,
+                )
+                states[name] = ACStateResult(
+                    error=f"An unexpected error occurred obtaining the state of "
+                    f"'{name}'"
+                )
+            else:
+                states[name] = ACStateResult(state=result.state)
+        return states
+
+    async def refresh_all(self) -> Dict[str, ACStateSnapshot]:
+        """
+        Refreshes every available device at the same time and returns their
+        new states (any that fail to refresh are left out)
+        """
+        devices = self._get_available_devices()
+        results = await asyncio.gather(
+            *(device.refresh() for device in devices.values()),
+            return_exceptions=True,
+        )
+
+        snapshots = {}
+        for name, result in zip(devices, results):
+            if isinstance(result, DeviceConnectionError):
+                logger.warning("Failed to refresh the state of the AC unit '%s'", name)
+            elif isinstance(result, Exception):
+                logger.error(
+                    "Unexpected error refreshing the state of the AC unit '%s'",
+                    name,
+                    exc_info=result,
+                )
+            else:
+                snapshots[name] = result
+        return snapshots
+
+    def get_queue_stats(self) -> Dict[str, ACCommandQueueStats]:
+        """
+        Returns statistics about the command queue of each loaded device
+        """
+        return {
+            name: device.get_queue_stats()
+            for name, device in list(self._loaded_devices.items())
+        }
+
+    def get_circuit_breaker_stats(self) -> Dict[str, CircuitBreakerStats]:
+        """
+        Returns the state of the circuit breaker of each loaded device
+        """
+        return {
+            name: circuit_breaker.get_stats()
+            for name, circuit_breaker in list(self._circuit_breakers.items())
+        }
@@ -0,0 +1,202 @@
+import asyncio
+import dataclasses
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Deque, Optional
+
+from homecontrol.aircon.structs import ACCommandQueueStats
+
+
+class ACCommandType(Enum):
+    """
+    Types of command that can be queued for a device
+    """
+
+    CONNECT = "connect"
+    REFRESH = "refresh"
+
+    # Argument is a full ACState
+    SET = "set"
+
+    # Argument is a dictionary of changes to the last known ACState
+    UPDATE = "update"
+
+
+# Commands that change the state of the device
+WRITE_COMMANDS = (ACCommandType.SET, ACCommandType.UPDATE)
+
+
+@dataclass
+class ACQueuedCommand:
+    """
+    For storing a command waiting to be sent to a device
+    """
+
+    command_type: ACCommandType
+    argument: Any
+
+    # Result of the command (shared by every caller combined into it)
+    future: asyncio.Future
+
+    # Time the command was first queued (time.monotonic())
+    queued_at: float
+
+
+class ACCommandQueue:
+    """
+    Sends commands to a device one at a time in the order they are queued
+    (coroutines should be run on the shared event loop)
+
+    msmart devices aren't thread safe, so every communication with a device
+    goes through its queue. While waiting, sets are combined with any set
+    already queued and reads share the result of any refresh already queued
+    or in progress, so a burst of requests results in fewer commands.
+    """
+
+    # Runs a command (blocking, so is run in the event loop's executor)
+    _execute: Callable[[ACCommandType, Any], Any]
+
+    _queue: Deque[ACQueuedCommand]
+    _in_flight: Optional[ACQueuedCommand]
+    _worker: Optional[asyncio.Task]
+
+    _max_depth: int
+    _executed: int
+    _merged_sets: int
+    _shared_reads: int
+    _total_wait_time: float
+    _max_wait_time: float
+
+    def __init__(self, execute: Callable[[ACCommandType, Any], Any]) -> None:
+        self._execute = execute
+        self._queue = deque()
+        self._in_flight = None
+        self._worker = None
+
+        self._max_depth = 0
+        self._executed = 0
+        self._merged_sets = 0
+        self._shared_reads = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    def _find_queued(self, *command_types: ACCommandType) -> Optional[ACQueuedCommand]:
+        """
+        Returns the first queued (not in progress) command of one of the
+        given types
+        """
+        for command in self._queue:
+            if command.command_type in command_types:
+                return command
+        return None
+
+    def _merge_write(
+        self, command_type: ACCommandType, argument: Any
+    ) -> Optional[ACQueuedCommand]:
+        """
+        Combines a set with one already queued (if any), returning the
+        command it was combined into
+        """
+        queued = self._find_queued(*WRITE_COMMANDS)
+        if queued is None:
+            return None
+
+        if command_type == ACCommandType.SET:
+            # A full state replaces whatever was queued
+            queued.command_type = ACCommandType.SET
+            queued.argument = argument
+        elif queued.command_type == ACCommandType.SET:
+            queued.argument = dataclasses.replace(queued.argument, **argument)
+        else:
+            queued.argument = {**queued.argument, **argument}
+        self._merged_sets += 1
+        return queued
+
+    def _find_read(self) -> Optional[ACQueuedCommand]:
+        """
+        Returns a refresh that is in progress or queued (if any)
+        """
+        if (
+            self._in_flight is not None
+            and self._in_flight.command_type == ACCommandType.REFRESH
+        ):
+            return self._in_flight
+        return self._find_queued(ACCommandType.REFRESH)
+
+    async def submit(self, command_type: ACCommandType, argument: Any = None) -> Any:
+        """
+        Queues a command and waits for its result
+
+        Cancelling the caller doesn't remove the command from the queue
+        """
+        command = None
+        if command_type in WRITE_COMMANDS:
+            command = self._merge_write(command_type, argument)
+        elif command_type == ACCommandType.REFRESH:
+            command = self._find_read()
+            if command is not None:
+                self._shared_reads += 1
+
+        if command is None:
+            future = asyncio.get_running_loop().create_future()
+            # Avoid warnings when every caller has been cancelled
+            future.add_done_callback(
+                lambda future: future.cancelled() or future.exception()
+            )
+            command = ACQueuedCommand(
+                command_type=command_type,
+                argument=argument,
+                future=future,
+                queued_at=time.monotonic(),
+            )
+            self._queue.append(command)
+            self._max_depth = max(self._max_depth, len(self._queue))
+
+            if self._worker is None:
+                self._worker = asyncio.ensure_future(self._run())
+
+        return await asyncio.shield(command.future)
+
+    async def _run(self):
+        """
+        Sends queued commands one at a time until the queue is empty
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while self._queue:
+                command = self._queue.popleft()
+                self._in_flight = command
+
+                wait_time = time.monotonic() - command.queued_at
+                self._total_wait_time += wait_time
+                self._max_wait_time = max(self._max_wait_time, wait_time)
+
+                try:
+                    result = await loop.run_in_executor(
+                        None, self._execute, command.command_type, command.argument
+                    )
+                except Exception as err:
+                    command.future.set_exception(err)
+                else:
+                    command.future.set_result(result)
+                finally:
+                    self._in_flight = None
+                    self._executed += 1
+        finally:
+            self._worker = None
+
+    def get_stats(self) -> ACCommandQueueStats:
+        """
+        Returns statistics about the queue
+        """
+        return ACCommandQueueStats(
+            depth=len(self._queue),
+            max_depth=self._max_depth,
+            executed=self._executed,
+            merged_sets=self._merged_sets,
+            shared_reads=self._shared_reads,
+            total_wait_time=self._total_wait_time,
+            max_wait_time=self._max_wait_time,
+        )
@@ -1,6 +1,13 @@
 from typing import Dict
 
-from homecontrol.aircon.structs import ACAccountConfig, ACConnectionInfo
+from homecontrol.aircon.structs import (
+    ACAccountConfig,
+    ACConnectConfig,
+    ACConnectionInfo,
+    ACPollingConfig,
+    ACUpdateConfig,
+)
+from homecontrol.circuit_breaker import CircuitBreakerConfig
 from homecontrol.config import Config
 
 
@@ -18,6 +25,34 @@ class ACConfig(Config):
         """
         return ACAccountConfig(**self.data["account"])
 
+    def get_connect(self) -> ACConnectConfig:
+        """
+        Returns an ACConnectConfig instance from loaded config (defaults are
+        used if not given)
+        """
+        return ACConnectConfig(**self.data.get("connect", {}))
+
+    def get_polling(self) -> ACPollingConfig:
+        """
+        Returns an ACPollingConfig instance from loaded config (polling is
+        disabled if not given)
+        """
+        return ACPollingConfig(**self.data.get("polling", {}))
+
+    def get_updates(self) -> ACUpdateConfig:
+        """
+        Returns an ACUpdateConfig instance from loaded config (defaults are
+        used if not given)
+        """
+        return ACUpdateConfig(**self.data.get("updates", {}))
+
+    def get_circuit_breaker(self) -> CircuitBreakerConfig:
+        """
+        Returns a CircuitBreakerConfig instance from loaded config (defaults
+        are used if not given)
+        """
+        return CircuitBreakerConfig(**self.data.get("circuit_breaker", {}))
+
     def has_devices(self):
         """
         Returns whether the loaded config has any devices stored in it
@@ -1,29 +1,63 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+from homecontrol import event_loop
 from homecontrol.aircon.aircon import ACDevice
-from homecontrol.aircon.config import ACConfig
-from homecontrol.exceptions import DeviceNotRegisteredError
+from homecontrol.aircon.async_manager import AsyncACManager
+from homecontrol.aircon.structs import (
+    ACCommandQueueStats,
+    ACStateResult,
+    ACStateSnapshot,
+)
+from homecontrol.circuit_breaker import CircuitBreakerStats
 
 
 class ACManager:
     """
-    Handles a set of aircon devices
+    Handles a set of aircon devices (synchronous wrapper for an
+    AsyncACManager)
     """
 
-    _config: ACConfig
-    _loaded_devices: Dict[str, ACDevice] = {}
+    _async_manager: AsyncACManager
 
     def __init__(self) -> None:
-        self._config = ACConfig()
+        """
+        Loads the config (start() should be called before using any devices)
+        """
+        self._async_manager = AsyncACManager()
+
+    def start(self) -> "ACManager":
+        """
+        Loads all registered devices, connecting to them in parallel (if not
+        already loaded)
+        """
+        if not self._async_manager.list_devices():
+            event_loop.run(self._async_manager.load_devices())
+        return self
+
+    def close(self):
+        """
+        Stops polling and unloads all devices
+        """
+        self._async_manager.close()
+
+    def __enter__(self) -> "ACManager":
+        return self.start()
 
-        # Load all registered devices immediately
-        self._load_devices()
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def async_manager(self) -> AsyncACManager:
+        """
+        Returns the AsyncACManager this wraps
+        """
+        return self._async_manager
 
     def list_devices(self) -> List[str]:
         """
         Returns a list of loaded devices
         """
-        return list(self._loaded_devices.keys())
+        return self._async_manager.list_devices()
 
     def register_device(self, name: str, ip_address: str):
         """
@@ -32,45 +66,86 @@ class ACManager:
         Raises:
             DeviceConnectionError: When there is a connection issue
         """
-        result = ACDevice.discover(
-            name=name, ip_address=ip_address, account_config=self._config.get_account()
-        )
-        if result:
-            self._config.register_device(result)
-            self._config.save()
+        event_loop.run(self._async_manager.register_device(name, ip_address))
+
+    def get_device(self, name: str) -> ACDevice:
+        """
+        Returns a loaded ACDevice
+
+        Raises:
+            DeviceNotRegisteredError: If the device is not registered
+            DeviceConnectionError: If the device is degraded (a reconnect
+                                   will be attempted in the background) or
+                                   its circuit breaker is open
+        """
+        return ACDevice(self._async_manager.get_device(name))
 
-            self._load_device(name)
+    def start_polling(self):
+        """
+        Starts refreshing the states of the devices in the background (if
+        enabled in the config)
+        """
+        self._async_manager.start_polling()
 
-    def _load_device(self, name: str) -> ACDevice:
+    def stop_polling(self):
         """
-        Loads a device from the config
+        Stops refreshing the states of the devices in the background
+        """
+        self._async_manager.stop_polling()
 
-        Raises
+    def get_state_snapshot(
+        self, name: str, max_age: Optional[float] = None
+    ) -> ACStateSnapshot:
+        """
+        Returns the last known state of a device, refreshing it first if it
+        is older than max_age
+
+        Args:
+            name (str): Name of the device
+            max_age (Optional[float]): Maximum age of the state (seconds).
+                            When None the max_age from the polling config is
+                            used while polling, otherwise the device is
+                            always refreshed.
+
+        Raises:
             DeviceNotRegisteredError: If the device has not been registered
+            DeviceConnectionError: When there is a connection issue
         """
-        if not self._config.has_device(name):
-            raise DeviceNotRegisteredError(
-                f"Aircon device with name '{name}' has not been registered"
-            )
-        connection_info = self._config.get_device(name=name)
-        device = ACDevice(connection_info)
-        self._loaded_devices.update({name: device})
+        return event_loop.run(self._async_manager.get_state_snapshot(name, max_age))
 
-    def _load_devices(self):
+    def get_states(
+        self, names: Optional[List[str]] = None, max_age: Optional[float] = None
+    ) -> Dict[str, ACStateResult]:
         """
-        Loads all registered devices from config
+        Returns the states of several devices at once, refreshing any older
+        than max_age at the same time
+
+        Devices whose state can't be obtained are given an error instead
+        rather than failing the rest
+
+        Args:
+            names (Optional[List[str]]): Names of the devices. When None
+                            every loaded device is used.
+            max_age (Optional[float]): Maximum age of the states (seconds),
+                            see get_state_snapshot()
         """
-        if self._config.has_devices():
-            devices = self._config.get_devices()
+        return event_loop.run(self._async_manager.get_states(names, max_age))
 
-            # Load the devices
-            for name in devices.keys():
-                self._load_device(name)
+    def refresh_all(self) -> Dict[str, ACStateSnapshot]:
+        """
+        Refreshes every available device at the same time and returns their
+        new states (any that fail to refresh are left out)
+        """
+        return event_loop.run(self._async_manager.refresh_all())
 
-    def get_device(self, name: str) -> ACDevice:
+    def get_queue_stats(self) -> Dict[str, ACCommandQueueStats]:
         """
-        Returns a loaded ACDevice
+        Returns statistics about the command queue of each loaded device
+        """
+        return self._async_manager.get_queue_stats()
+
+    def get_circuit_breaker_stats(self) -> Dict[str, CircuitBreakerStats]:
+        """
+        Returns the state of the circuit breaker of each loaded device
         """
-        if name in self._loaded_devices:
-            return self._loaded_devices[name]
-        raise DeviceNotRegisteredError(f"Aircon device '{name}' is not registered")
+        return self._async_manager.get_circuit_breaker_stats()
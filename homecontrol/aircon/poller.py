@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Optional
+
+from homecontrol import event_loop
+
+logger = logging.getLogger(__name__)
+
+
+class ACStatePoller:
+    """
+    Periodically refreshes the state of a set of aircon devices on the
+    shared event loop so that reads can be served from their snapshots
+    """
+
+    # Time between refreshing every device (seconds)
+    _interval: float
+
+    # Refreshes every device once
+    _refresh: Callable[[], Awaitable]
+
+    _future: Optional[Future]
+
+    def __init__(self, interval: float, refresh: Callable[[], Awaitable]) -> None:
+        self._interval = interval
+        self._refresh = refresh
+        self._future = None
+
+    @property
+    def running(self) -> bool:
+        """
+        Returns whether the poller is currently running
+        """
+        return self._future is not None
+
+    def start(self):
+        """
+        Starts polling in the background
+        """
+        if self._future is None:
+            self._future = event_loop.submit(self._run())
+
+    def stop(self):
+        """
+        Stops polling (any refresh in progress is cancelled)
+        """
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+
+    async def _run(self):
+        """
+        Refreshes every device each interval until cancelled
+        """
+        while True:
+            try:
+                await self._refresh()
+            except Exception:
+                logger.exception("Unexpected error refreshing AC unit states")
+            await asyncio.sleep(self._interval)
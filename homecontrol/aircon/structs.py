@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from enum import IntEnum
+from typing import Optional
 
 from msmart.device import air_conditioning
 
@@ -81,3 +82,98 @@ class ACState:
     fahrenheit: bool
     indoor: float
     outdoor: float
+
+
+@dataclass
+class ACStateSnapshot:
+    """
+    For storing the last known state of a device along with when it was
+    obtained
+    """
+
+    state: ACState
+
+    # Time the state was obtained (seconds since the epoch)
+    timestamp: float
+
+
+@dataclass
+class ACStateResult:
+    """
+    For storing the result of obtaining the state of one of several devices
+    at once
+    """
+
+    state: Optional[ACState] = None
+
+    # Reason the state couldn't be obtained (if it wasn't)
+    error: Optional[str] = None
+
+
+@dataclass
+class ACPollingConfig:
+    """
+    For storing the settings of the background polling of device states
+    """
+
+    enabled: bool = False
+
+    # Time between refreshing the state of every device (seconds)
+    interval: float = 30
+
+    # Maximum age of a state returned when no max_age is given (seconds)
+    max_age: float = 60
+
+
+@dataclass
+class ACConnectConfig:
+    """
+    For storing the settings used when connecting to devices
+    """
+
+    # Time to wait for each device to connect while loading (seconds)
+    timeout: float = 10
+
+    # Minimum time between attempts to reconnect to a device that failed to
+    # connect (seconds)
+    retry_interval: float = 60
+
+
+@dataclass
+class ACUpdateConfig:
+    """
+    For storing the settings used when partially updating device states
+    """
+
+    # Time to wait for further changes before applying them, so that bursts
+    # of changes are sent to a device at once (seconds)
+    debounce: float = 0.3
+
+    # Maximum age of the last known state that changes are applied to, as
+    # the unit may have been changed by other means (e.g. its remote) since
+    # (seconds)
+    max_age: float = 5
+
+
+@dataclass
+class ACCommandQueueStats:
+    """
+    For storing statistics about the queue of commands sent to a device
+    """
+
+    # Number of commands currently waiting to be sent
+    depth: int
+    max_depth: int
+
+    # Number of commands sent to the device
+    executed: int
+
+    # Number of sets combined with one already queued
+    merged_sets: int
+
+    # Number of reads answered by a refresh already queued or in progress
+    shared_reads: int
+
+    # Time commands spent waiting in the queue before being sent (seconds)
+    total_wait_time: float
+    max_wait_time: float
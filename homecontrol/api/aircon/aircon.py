@@ -1,3 +1,5 @@
+from typing import Optional
+
 from flask import Blueprint, request
 
 from homecontrol.aircon.aircon import ACDevice
@@ -13,7 +15,8 @@ from homecontrol.helpers import ResponseStatus, dataclass_from_dict
 aircon_api = Blueprint("aircon_api", __name__)
 
 # ACManager
-device_manager = ACManager()
+device_manager = ACManager().start()
+device_manager.start_polling()
 
 
 def find_device(name: str) -> ACDevice:
@@ -24,6 +27,27 @@ def find_device(name: str) -> ACDevice:
         return device_manager.get_device(name)
     except DeviceNotRegisteredError as err:
         raise APIError(str(err), ResponseStatus.NOT_FOUND)
+    except DeviceConnectionError as err:
+        raise APIError(str(err), ResponseStatus.BAD_REQUEST)
+
+
+def get_max_age() -> Optional[float]:
+    """
+    Returns the max_age request argument (the maximum age in seconds of any
+    device state returned), or None if not given
+    """
+    max_age = request.args.get("max_age")
+    if max_age is None:
+        return None
+    try:
+        max_age = float(max_age)
+    except ValueError:
+        max_age = -1
+    if max_age < 0:
+        raise APIError(
+            "max_age must be a non-negative number", ResponseStatus.BAD_REQUEST
+        )
+    return max_age
 
 
 @aircon_api.route("/ac/devices", methods=["GET"])
@@ -35,6 +59,32 @@ def list_devices():
     return response(device_manager.list_devices(), ResponseStatus.OK)
 
 
+@aircon_api.route("/ac/devices/queues", methods=["GET"])
+@authenticated
+def get_queue_stats():
+    """
+    Returns statistics about the queue of commands sent to each device
+    """
+    return response(device_manager.get_queue_stats(), ResponseStatus.OK)
+
+
+@aircon_api.route("/ac/devices/states", methods=["GET"])
+@authenticated
+def get_device_states():
+    """
+    Returns the current status of several devices at once (by default all of
+    them, otherwise those given as a comma separated list of names in
+    'devices'), each of which may have been obtained up to max_age seconds
+    ago
+
+    Any device whose state can't be obtained is given an error instead
+    """
+    names = request.args.get("devices")
+    if names is not None:
+        names = [name for name in names.split(",") if name]
+    return response(device_manager.get_states(names, get_max_age()), ResponseStatus.OK)
+
+
 @aircon_api.route("/ac/devices/register", methods=["PUT"])
 @authenticated
 def register_device():
@@ -57,11 +107,13 @@ def register_device():
 @authenticated
 def get_device(name):
     """
-    Returns the current status of a device given its name
+    Returns the current status of a device given its name (this may have
+    been obtained up to max_age seconds ago)
     """
-    device = find_device(name)
+    find_device(name)
     try:
-        return response(device.get_state().__dict__, ResponseStatus.OK)
+        snapshot = device_manager.get_state_snapshot(name, get_max_age())
+        return response(snapshot.state, ResponseStatus.OK)
     except DeviceConnectionError as err:
         raise APIError(str(err), ResponseStatus.BAD_REQUEST)
 
@@ -78,7 +130,27 @@ def set_device(name):
     new_state = dataclass_from_dict(ACState, request.get_json())
 
     try:
-        device.set_state(new_state)
-        return response(device.get_state().__dict__, ResponseStatus.OK)
+        return response(device.set_state(new_state), ResponseStatus.OK)
+    except (DeviceConnectionError, ACInvalidStateError) as err:
+        raise APIError(str(err), ResponseStatus.BAD_REQUEST)
+
+
+@aircon_api.route("/ac/devices/<name>", methods=["PATCH"])
+@authenticated
+def update_device(name):
+    """
+    Assigns only the given fields of the state of a device and returns the
+    new state
+    """
+    device = find_device(name)
+
+    changes = request.get_json()
+    if not isinstance(changes, dict) or not changes:
+        raise APIError(
+            "Must give at least one field to change", ResponseStatus.BAD_REQUEST
+        )
+
+    try:
+        return response(device.update_state(**changes), ResponseStatus.OK)
     except (DeviceConnectionError, ACInvalidStateError) as err:
         raise APIError(str(err), ResponseStatus.BAD_REQUEST)
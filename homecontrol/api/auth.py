@@ -5,7 +5,7 @@ from homecontrol.api.authentication.structs import User
 from homecontrol.api.exceptions import APIError
 from homecontrol.api.helpers import get_user_manager, response
 from homecontrol.exceptions import ResourceNotFoundError
-from homecontrol.helpers import ResponseStatus, object_to_dict
+from homecontrol.helpers import ResponseStatus
 
 auth_api = Blueprint("auth_api", __name__)
 
@@ -37,7 +37,7 @@ def login():
 @authenticated_user
 def login_check(user: User):
     """Returns information about the current user"""
-    return response(object_to_dict(user), ResponseStatus.OK)
+    return response(user, ResponseStatus.OK)
 
 
 @auth_api.route("/auth/users", methods=["GET"])
@@ -45,7 +45,7 @@ def login_check(user: User):
 def get_users(user: User):
     user_manager = get_user_manager()
     users = user_manager.get_users()
-    return response(object_to_dict(users), ResponseStatus.OK)
+    return response(users, ResponseStatus.OK)
 
 
 @auth_api.route("/auth/user/<user_id>", methods=["GET"])
@@ -58,4 +58,4 @@ def get_user(user: User, user_id):
         raise APIError(
             f"User with the id '{user_id}' was not found", ResponseStatus.NOT_FOUND
         )
-    return response(object_to_dict(user), ResponseStatus.OK)
+    return response(user, ResponseStatus.OK)
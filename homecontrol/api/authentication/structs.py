@@ -37,3 +37,14 @@ class TokenPayload:
 
     client_id: str
     exp: datetime
+
+
+@dataclass
+class TokenCacheStats:
+    """Stores statistics about the cache of verified access tokens"""
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
@@ -0,0 +1,93 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+
+from homecontrol.api.authentication.structs import TokenCacheStats, User
+
+
+class TokenCache:
+    """
+    Least recently used cache of access tokens that have already been
+    verified along with the user they belong to
+
+    Entries expire after a time to live, or when the token itself expires if
+    that is sooner
+    """
+
+    _max_size: int
+    _ttl: float
+
+    # Keys are access tokens and values the user and time (seconds since the
+    # epoch) the entry expires, least recently used first
+    _entries: "OrderedDict[str, Tuple[User, float]]"
+
+    _lock: Lock
+    _hits: int
+    _misses: int
+    _evictions: int
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """
+        Args:
+            max_size (int): Maximum number of tokens to store (0 disables
+                            the cache)
+            ttl (float): Maximum time to store each token for (seconds)
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, access_token: str) -> Optional[User]:
+        """
+        Returns the user an access token belongs to, or None if it isn't
+        cached (or has expired)
+        """
+        with self._lock:
+            entry = self._entries.get(access_token)
+            if entry is not None:
+                user, expires = entry
+                if time.time() < expires:
+                    self._entries.move_to_end(access_token)
+                    self._hits += 1
+                    return user
+                del self._entries[access_token]
+            self._misses += 1
+            return None
+
+    def put(self, access_token: str, user: User, token_expiry: float):
+        """
+        Stores the user a verified access token belongs to
+
+        Args:
+            access_token (str): Access token
+            user (User): User the token belongs to
+            token_expiry (float): Time the token expires (seconds since the
+                                  epoch)
+        """
+        if self._max_size <= 0:
+            return
+        expires = min(time.time() + self._ttl, token_expiry)
+        with self._lock:
+            self._entries[access_token] = (user, expires)
+            self._entries.move_to_end(access_token)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_stats(self) -> TokenCacheStats:
+        """
+        Returns the current statistics of the cache
+        """
+        with self._lock:
+            return TokenCacheStats(
+                size=len(self._entries),
+                max_size=self._max_size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
@@ -10,10 +10,12 @@ from homecontrol.api.authentication.encryption import (
 )
 from homecontrol.api.authentication.structs import (
     InternalUser,
+    TokenCacheStats,
     TokenPayload,
     User,
     UserGroup,
 )
+from homecontrol.api.authentication.token_cache import TokenCache
 from homecontrol.api.config import APIConfig
 from homecontrol.api.database.client import APIDatabaseClient
 from homecontrol.api.structs import APIAuthConfig
@@ -26,11 +28,19 @@ class UserManager:
     _auth_config: APIAuthConfig
     _database_client: APIDatabaseClient
 
+    # Access tokens that have already been verified (avoids looking up the
+    # user in the database for every request)
+    _token_cache: TokenCache
+
     def __init__(
         self, api_config: APIConfig, database_client: APIDatabaseClient
     ) -> None:
         self._auth_config = api_config.get_auth()
         self._database_client = database_client
+        self._token_cache = TokenCache(
+            max_size=self._auth_config.token_cache_size,
+            ttl=self._auth_config.token_cache_ttl,
+        )
 
     def add_user(self, username: str, password: str, group: UserGroup):
         """
@@ -85,14 +95,26 @@ class UserManager:
         """
         Verifies an access token is valid and returns the user info
         """
+        user = self._token_cache.get(access_token)
+        if user is not None:
+            return user
+
         token_payload = decode_jwt(access_token, self._auth_config.token_key)
         token_payload = TokenPayload(**token_payload)
 
         # Obtain the user
         with self._database_client.connect() as conn:
             user = conn.users.find_user_by_id(token_payload.client_id).to_user()
+        # Expiry is decoded as a timestamp
+        self._token_cache.put(access_token, user, token_payload.exp)
         return user
 
+    def get_token_cache_stats(self) -> TokenCacheStats:
+        """
+        Returns statistics about the cache of verified access tokens
+        """
+        return self._token_cache.get_stats()
+
     def get_users(self) -> List[User]:
         """
         Returns the list of users
@@ -1,14 +1,21 @@
-from flask import Blueprint
+from flask import Blueprint, request
 
 from homecontrol.api.authentication.helpers import authenticated
-from homecontrol.api.helpers import response
+from homecontrol.api.exceptions import APIError
+from homecontrol.api.helpers import check_required_params, response
+from homecontrol.broadlink.exceptions import IRLearningInProgressError, IRMacroError
 from homecontrol.broadlink.manager import BroadlinkManager
+from homecontrol.exceptions import (
+    DeviceConnectionError,
+    DeviceNotRegisteredError,
+    ResourceNotFoundError,
+)
 from homecontrol.helpers import ResponseStatus
 
 broadlink_api = Blueprint("broadlink_api", __name__)
 
 # Broadlink manager
-broadlink_device_manager = BroadlinkManager()
+broadlink_device_manager = BroadlinkManager().start()
 
 
 @broadlink_api.route("/broadlink/<device_name>/ir/<command_name>", methods=["PUT"])
@@ -17,5 +24,81 @@ def run_command(device_name, command_name):
     """
     Returns a list of device names
     """
-    broadlink_device_manager.playback_ir_command(device_name, command_name)
+    try:
+        broadlink_device_manager.playback_ir_command(device_name, command_name)
+    except (DeviceNotRegisteredError, ResourceNotFoundError) as err:
+        raise APIError(str(err), ResponseStatus.NOT_FOUND)
+    except DeviceConnectionError as err:
+        raise APIError(str(err), ResponseStatus.BAD_REQUEST)
     return response(broadlink_device_manager.list_devices(), ResponseStatus.OK)
+
+
+@broadlink_api.route(
+    "/broadlink/<device_name>/ir/<command_name>/learn", methods=["POST"]
+)
+@authenticated
+def learn_command(device_name, command_name):
+    """
+    Starts learning an IR command in the background and returns the learning
+    job (which can be checked on using its job_id)
+    """
+    try:
+        job = broadlink_device_manager.start_learning_ir_command(
+            device_name, command_name
+        )
+    except DeviceNotRegisteredError as err:
+        raise APIError(str(err), ResponseStatus.NOT_FOUND)
+    except IRLearningInProgressError as err:
+        raise APIError(str(err), ResponseStatus.CONFLICT)
+    return response(job, ResponseStatus.ACCEPTED)
+
+
+@broadlink_api.route("/broadlink/learning/<job_id>", methods=["GET"])
+@authenticated
+def get_learning_job(job_id):
+    """
+    Returns the status of an IR learning job
+    """
+    try:
+        return response(
+            broadlink_device_manager.get_learning_job(job_id), ResponseStatus.OK
+        )
+    except ResourceNotFoundError as err:
+        raise APIError(str(err), ResponseStatus.NOT_FOUND)
+
+
+@broadlink_api.route("/broadlink/learning/<job_id>", methods=["DELETE"])
+@authenticated
+def cancel_learning_job(job_id):
+    """
+    Cancels an IR learning job and returns its status
+    """
+    try:
+        return response(
+            broadlink_device_manager.cancel_learning_job(job_id), ResponseStatus.OK
+        )
+    except ResourceNotFoundError as err:
+        raise APIError(str(err), ResponseStatus.NOT_FOUND)
+
+
+@broadlink_api.route("/broadlink/<device_name>/macro", methods=["PUT"])
+@authenticated
+def run_macro(device_name):
+    """
+    Plays back a sequence of IR actions with the right timing between them
+    and returns the result of each send (see IRMacro for the format of the
+    actions)
+    """
+    data = request.get_json()
+    if not check_required_params(data, ["actions"]) or not isinstance(
+        data["actions"], list
+    ):
+        raise APIError("Must give a list of actions", ResponseStatus.BAD_REQUEST)
+
+    try:
+        results = broadlink_device_manager.run_ir_macro(device_name, data["actions"])
+    except (DeviceNotRegisteredError, ResourceNotFoundError) as err:
+        raise APIError(str(err), ResponseStatus.NOT_FOUND)
+    except (DeviceConnectionError, IRMacroError) as err:
+        raise APIError(str(err), ResponseStatus.BAD_REQUEST)
+    return response(results, ResponseStatus.OK)
@@ -11,4 +11,4 @@ class APIDatabaseClient(DatabaseClient):
         super().__init__()
 
     def connect(self) -> APIDatabaseConnection:
-        return APIDatabaseConnection(self.config.get_connection_info("homecontrol"))
+        return APIDatabaseConnection(self.get_pool("homecontrol"))
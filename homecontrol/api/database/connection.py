@@ -1,8 +1,12 @@
+from typing import List
+
 from homecontrol.api.database.aircon import Aircon
+from homecontrol.api.database.migrations import MIGRATIONS
 from homecontrol.api.database.rooms import Rooms
 from homecontrol.api.database.users import Users
 from homecontrol.database.mysql.connection import DatabaseConnection
-from homecontrol.database.mysql.structs import DatabaseConnectionInfo
+from homecontrol.database.mysql.migrations import DatabaseMigrator, Migration
+from homecontrol.database.mysql.pool import DatabaseConnectionPool
 
 
 class APIDatabaseConnection(DatabaseConnection):
@@ -14,8 +18,8 @@ class APIDatabaseConnection(DatabaseConnection):
     aircon: Aircon
     rooms: Rooms
 
-    def __init__(self, connection_info: DatabaseConnectionInfo) -> None:
-        super().__init__(connection_info)
+    def __init__(self, pool: DatabaseConnectionPool) -> None:
+        super().__init__(pool)
 
     def __enter__(self):
         super().__enter__()
@@ -25,10 +29,9 @@ class APIDatabaseConnection(DatabaseConnection):
         self.rooms = Rooms(self)
         return self
 
-    def init_db(self):
+    def init_db(self) -> List[Migration]:
         """
-        Creates any necessary tables, for now just for Users
+        Creates any necessary tables or updates existing ones to the latest
+        schema, returning the migrations that were applied
         """
-        self.users.create_table()
-        self.aircon.create_table()
-        self.rooms.create_table()
+        return DatabaseMigrator(MIGRATIONS).migrate(self)
@@ -0,0 +1,76 @@
+from typing import Dict, List
+
+from homecontrol.api.database.aircon import Aircon
+from homecontrol.api.database.rooms import Rooms
+from homecontrol.api.database.users import Users
+from homecontrol.database.mysql.migrations import Migration
+
+
+def _create_tables(connection):
+    """
+    Creates the tables as they were before migrations were introduced (they
+    may already exist)
+    """
+    connection.users.create_table()
+    connection.aircon.create_table()
+    connection.rooms.create_table()
+
+
+def _add_indexes(connection, table: str, indexes: Dict[str, str]):
+    """
+    Adds any of the given indexes that a table doesn't already have in a
+    single statement
+
+    Args:
+        table (str): Name of the table
+        indexes (Dict[str, str]): Keys are the names of the indexes ('PRIMARY'
+                                  for the primary key) and values the clauses
+                                  adding them
+    """
+    missing = [
+        clause
+        for name, clause in indexes.items()
+        if not connection.has_index(table, name)
+    ]
+    if missing:
+        connection.execute(f"ALTER TABLE {table} {', '.join(missing)}")
+
+
+def _add_keys_and_indexes(connection):
+    """
+    Adds primary keys on the UUIDs and indexes for the columns states and
+    users are looked up by
+    """
+    _add_indexes(
+        connection,
+        Users.TABLE_USERS,
+        {
+            "PRIMARY": "ADD PRIMARY KEY (uuid)",
+            "users_username": "ADD UNIQUE INDEX users_username (username)",
+        },
+    )
+    _add_indexes(
+        connection,
+        Aircon.TABLE_AIRCON_STATES,
+        {"PRIMARY": "ADD PRIMARY KEY (uuid)"},
+    )
+    _add_indexes(
+        connection,
+        Rooms.TABLE_ROOM_STATES,
+        {
+            "PRIMARY": "ADD PRIMARY KEY (uuid)",
+            "room_states_room_name": "ADD INDEX room_states_room_name (room_name)",
+        },
+    )
+
+
+# Migrations of the homecontrol database (never modify ones that have already
+# been released, add a new one instead)
+MIGRATIONS: List[Migration] = [
+    Migration(version=1, description="Create tables", apply=_create_tables),
+    Migration(
+        version=2,
+        description="Add primary keys and indexes",
+        apply=_add_keys_and_indexes,
+    ),
+]
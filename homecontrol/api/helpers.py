@@ -1,17 +1,35 @@
 from typing import Any, Dict, List, Optional
 
 from flask import current_app, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 
 from homecontrol.api.authentication.user_manager import UserManager
 from homecontrol.api.database.client import APIDatabaseClient
 from homecontrol.api.filters import Filters
 from homecontrol.api.structs import APIAuthConfig
-from homecontrol.helpers import SubscriptableClass
+from homecontrol.helpers import SubscriptableClass, get_attributes
 
 
-def response(data: Dict, code: int):
+class APIJSONProvider(DefaultJSONProvider):
     """
-    Helper function that returns a response
+    JSON provider that serialises dataclasses, enums and HueAPIObject's
+    directly while encoding a response (rather than them needing to be
+    converted to dictionaries first)
+    """
+
+    @staticmethod
+    def default(o: Any):
+        # Enums are already handled as their values are primitive types
+        attributes = get_attributes(o)
+        if attributes is None:
+            return DefaultJSONProvider.default(o)
+        return attributes
+
+
+def response(data: Any, code: int):
+    """
+    Helper function that returns a response (data may contain any objects
+    supported by APIJSONProvider)
     """
     return jsonify(data), code
 
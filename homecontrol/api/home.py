@@ -1,17 +1,38 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, List, Tuple
+
 from flask import Blueprint, request
 
+from homecontrol.aircon.exceptions import ACInvalidStateError
+from homecontrol.aircon.structs import ACState
 from homecontrol.api.aircon.aircon import device_manager as ac_device_manager
-from homecontrol.api.broadlink import broadlink_device_manager
-from homecontrol.api.aircon.aircon import find_device
+from homecontrol.api.aircon.aircon import get_max_age
 from homecontrol.api.authentication.helpers import authenticated
+from homecontrol.api.broadlink import broadlink_device_manager
 from homecontrol.api.exceptions import APIError
 from homecontrol.api.helpers import get_database_client, response
 from homecontrol.api.hue import device_manager as hue_device_manager
-from homecontrol.api.structs import Room
-from homecontrol.helpers import ResponseStatus, object_to_dict
+from homecontrol.api.structs import Room, RoomStateActionResult
+from homecontrol.broadlink.exceptions import IRMacroError
+from homecontrol.exceptions import (
+    DeviceConnectionError,
+    DeviceNotRegisteredError,
+    ResourceNotFoundError,
+)
+from homecontrol.helpers import ResponseStatus, get_attributes
+from homecontrol.hue.api.exceptions import HueAPIError
+
+logger = logging.getLogger(__name__)
 
 home_api = Blueprint("home_api", __name__)
 
+# For performing the actions of room states on different devices at the same
+# time
+action_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="room-state")
+
 
 @home_api.route("/home/rooms", methods=["GET"])
 @authenticated
@@ -58,7 +79,7 @@ def get_rooms():
 
     rooms = list(rooms_dict.values())
 
-    return response(object_to_dict(rooms), ResponseStatus.OK)
+    return response(rooms, ResponseStatus.OK)
 
 
 @home_api.route("/home/outdoor_temp", methods=["GET"])
@@ -66,15 +87,21 @@ def get_rooms():
 def get_outdoor_temp():
     """
     Returns the current outdoor temp as measured by AC units (for now
-    just selecting the result of the first unit)
+    just selecting the result of the first available unit)
     """
 
     ac_devices = ac_device_manager.list_devices()
 
     outdoor_temp = "N/A"
 
-    if len(ac_devices) > 0:
-        outdoor_temp = ac_device_manager.get_device(ac_devices[0]).get_state().outdoor
+    for ac_device in ac_devices:
+        try:
+            outdoor_temp = ac_device_manager.get_state_snapshot(
+                ac_device, get_max_age()
+            ).state.outdoor
+            break
+        except DeviceConnectionError:
+            continue
 
     return response(outdoor_temp, ResponseStatus.OK)
 
@@ -91,7 +118,111 @@ def get_room_states(name: str):
     with database_client.connect() as conn:
         room_states = conn.rooms.find_states_in_room(name)
 
-    return response(object_to_dict(room_states), ResponseStatus.OK)
+    return response(room_states, ResponseStatus.OK)
+
+
+def run_device_actions(
+    device: str, actions: List[Tuple[str, Callable]], start: float
+) -> List[RoomStateActionResult]:
+    """
+    Performs a sequence of actions on a single device in order, returning
+    the result of each (the rest are still performed if one fails)
+
+    Args:
+        device (str): Name of the device the actions are performed on
+        actions (List[Tuple[str, Callable]]): Names and functions of the
+                                              actions
+        start (float): Time the recall began (time.monotonic())
+    """
+    results = []
+    for action, func in actions:
+        action_start = time.monotonic()
+        error = None
+        try:
+            func()
+        except (
+            DeviceConnectionError,
+            DeviceNotRegisteredError,
+            ACInvalidStateError,
+            HueAPIError,
+            ResourceNotFoundError,
+        ) as err:
+            error = str(err)
+        except Exception:
+            logger.exception(
+                "Unexpected error performing the action '%s' on '%s'", action, device
+            )
+            error = "An unexpected error occurred"
+        results.append(
+            RoomStateActionResult(
+                device=device,
+                action=action,
+                error=error,
+                start=action_start - start,
+                duration=time.monotonic() - action_start,
+            )
+        )
+    return results
+
+
+def run_broadlink_macro(
+    device: str, actions: List[str], start: float
+) -> List[RoomStateActionResult]:
+    """
+    Plays back IR actions as a macro on a broadlink device, returning the
+    result of each send
+
+    Args:
+        device (str): Name of the broadlink device
+        actions (List[str]): Actions of the macro (see IRMacro)
+        start (float): Time the recall began (time.monotonic())
+    """
+    macro_start = time.monotonic()
+    try:
+        step_results = broadlink_device_manager.run_ir_macro(device, actions)
+    except (
+        DeviceConnectionError,
+        DeviceNotRegisteredError,
+        IRMacroError,
+        ResourceNotFoundError,
+    ) as err:
+        return [
+            RoomStateActionResult(
+                device=device,
+                action=", ".join(actions),
+                error=str(err),
+                start=macro_start - start,
+                duration=time.monotonic() - macro_start,
+            )
+        ]
+
+    offset = macro_start - start
+    return [
+        RoomStateActionResult(
+            device=device,
+            action=step_result.command,
+            error=step_result.error,
+            start=offset + step_result.start,
+            duration=step_result.duration,
+        )
+        for step_result in step_results
+    ]
+
+
+def set_ac_state(name: str, state: ACState):
+    """
+    Assigns the state of an AC unit
+    """
+    ac_device_manager.get_device(name).set_state(state)
+
+
+def recall_hue_scene(scene_id: str):
+    """
+    Recalls a scene on the Home hue bridge
+    """
+    hue_bridge = hue_device_manager.get_bridge("Home")
+    with hue_bridge.start_session() as conn:
+        conn.scene.recall_scene(scene_id)
 
 
 @home_api.route("/home/rooms/state/<state_id>", methods=["PUT"])
@@ -99,6 +230,11 @@ def get_room_states(name: str):
 def recall_room_state(state_id: str):
     """
     Recalls a room state with a given ID
+
+    The actions on each device are performed at the same time (those on the
+    same device are still performed in order), and the room state is
+    returned along with the result and timing of each action (with a bad
+    gateway status if every action failed)
     """
 
     # Obtain the room and AC state
@@ -109,22 +245,57 @@ def recall_room_state(state_id: str):
         if room_state.ac_device_name and room_state.ac_state_id:
             ac_state = conn.aircon.find_state_by_id(room_state.ac_state_id)
 
+    # Actions to perform on each device
+    device_actions = []
+
     # Apply the AC state if required
     if ac_state:
-        ac_device = find_device(room_state.ac_device_name)
-        ac_device.set_state(ac_state)
+        device_actions.append(
+            (
+                room_state.ac_device_name,
+                [
+                    (
+                        "set_state",
+                        partial(set_ac_state, room_state.ac_device_name, ac_state),
+                    )
+                ],
+            )
+        )
 
     # Apply the Hue scene if required
     if room_state.hue_scene_id:
-        hue_bridge = hue_device_manager.get_bridge("Home")
-        with hue_bridge.start_session() as conn:
-            conn.scene.recall_scene(room_state.hue_scene_id)
+        device_actions.append(
+            (
+                "Home",
+                [("recall_scene", partial(recall_hue_scene, room_state.hue_scene_id))],
+            )
+        )
 
-    # Apply the broadlink actions if required
+    start = time.monotonic()
+    futures = [
+        action_executor.submit(run_device_actions, device, actions, start)
+        for device, actions in device_actions
+    ]
+
+    # Apply the broadlink actions if required (as a macro so they are sent
+    # with the right timing)
     if room_state.broadlink_device_name and room_state.broadlink_actions:
-        for action in room_state.broadlink_actions:
-            broadlink_device_manager.playback_ir_command(
-                room_state.broadlink_device_name, action
+        futures.append(
+            action_executor.submit(
+                run_broadlink_macro,
+                room_state.broadlink_device_name,
+                room_state.broadlink_actions,
+                start,
             )
+        )
+    results = [result for future in futures for result in future.result()]
 
-    return response(object_to_dict(room_state), ResponseStatus.OK)
+    body = {
+        **get_attributes(room_state),
+        "results": results,
+        "duration": time.monotonic() - start,
+    }
+    if results and all(result.error is not None for result in results):
+        body["message"] = f"Every action of the room state '{state_id}' failed"
+        return response(body, ResponseStatus.BAD_GATEWAY)
+    return response(body, ResponseStatus.OK)
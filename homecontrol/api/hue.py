@@ -11,8 +11,9 @@ from homecontrol.hue.manager import HueManager
 
 hue_api = Blueprint("hue_api", __name__)
 
-# ACManager
-device_manager = HueManager()
+# HueManager
+device_manager = HueManager().start()
+device_manager.start_event_streams()
 
 
 @hue_api.errorhandler(HueAPIError)
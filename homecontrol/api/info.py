@@ -1,8 +1,12 @@
 from flask import Blueprint
 
-from homecontrol.api.helpers import response
+from homecontrol.api.aircon.aircon import device_manager as ac_device_manager
+from homecontrol.api.authentication.helpers import authenticated_user
+from homecontrol.api.authentication.structs import User
+from homecontrol.api.broadlink import broadlink_device_manager
+from homecontrol.api.helpers import get_database_client, get_user_manager, response
 from homecontrol.api.structs import APIInfo
-from homecontrol.helpers import ResponseStatus, object_to_dict
+from homecontrol.helpers import ResponseStatus
 from homecontrol.version import __version__
 
 info_api = Blueprint("info_api", __name__)
@@ -16,4 +20,46 @@ def get_info():
 
     info = APIInfo(version=__version__)
 
-    return response(object_to_dict(info), ResponseStatus.OK)
+    return response(info, ResponseStatus.OK)
+
+
+@info_api.route("/info/database", methods=["GET"])
+@authenticated_user(require_admin=True)
+def get_database_info(user: User):
+    """
+    Returns statistics about the pooled connections to each database
+    """
+    return response(get_database_client().get_pool_stats(), ResponseStatus.OK)
+
+
+@info_api.route("/info/auth", methods=["GET"])
+@authenticated_user(require_admin=True)
+def get_auth_info(user: User):
+    """
+    Returns statistics about the cache of verified access tokens
+    """
+    return response(get_user_manager().get_token_cache_stats(), ResponseStatus.OK)
+
+
+@info_api.route("/info/devices", methods=["GET"])
+@authenticated_user(require_admin=True)
+def get_devices_info(user: User):
+    """
+    Returns the state of the circuit breaker of each device
+    """
+    return response(
+        {
+            "aircon": ac_device_manager.get_circuit_breaker_stats(),
+            "broadlink": broadlink_device_manager.get_circuit_breaker_stats(),
+        },
+        ResponseStatus.OK,
+    )
+
+
+@info_api.route("/info/devices/broadlink", methods=["GET"])
+@authenticated_user(require_admin=True)
+def get_broadlink_devices_info(user: User):
+    """
+    Returns the state of the connection to each broadlink device
+    """
+    return response(broadlink_device_manager.get_connection_stats(), ResponseStatus.OK)
@@ -9,13 +9,14 @@ from homecontrol.api.broadlink import broadlink_api
 from homecontrol.api.config import APIConfig
 from homecontrol.api.database.client import APIDatabaseClient
 from homecontrol.api.exceptions import APIError
-from homecontrol.api.helpers import response_message
+from homecontrol.api.helpers import APIJSONProvider, response_message
 from homecontrol.api.home import home_api
 from homecontrol.api.hue import hue_api
 from homecontrol.api.info import info_api
 from homecontrol.api.monitoring import construct_monitor_api_blueprint
 
 app = Flask(__name__)
+app.json = APIJSONProvider(app)
 cors = CORS(app)
 app.config["CORS_HEADERS"] = "Content-Type"
 
@@ -13,6 +13,11 @@ class APIAuthConfig:
     token_key: str
     token_expiry: int
 
+    # Maximum number of verified access tokens to cache and how long to cache
+    # them for (seconds)
+    token_cache_size: int = 1024
+    token_cache_ttl: int = 60
+
 
 @dataclass
 class Room:
@@ -51,3 +56,23 @@ class RoomState:
     hue_scene_id: Optional[str]
     broadlink_device_name: Optional[str]
     broadlink_actions: Optional[List[str]]
+
+
+@dataclass
+class RoomStateActionResult:
+    """
+    Stores the result of one of the actions performed when recalling a room
+    state
+    """
+
+    # Name of the device the action was performed on
+    device: str
+    action: str
+
+    # Reason the action failed (if it did)
+    error: Optional[str]
+
+    # Time the action started after the recall began, and how long it took
+    # (seconds)
+    start: float
+    duration: float
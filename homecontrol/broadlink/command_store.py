@@ -0,0 +1,138 @@
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from homecontrol.exceptions import ResourceNotFoundError
+
+# Namespace of commands that aren't specific to a device (any device can use
+# them)
+GLOBAL_NAMESPACE = ""
+
+
+class IRCommandStore:
+    """
+    Stores learnt IR packets in an sqlite3 database
+
+    Commands are namespaced by the name of the device that learnt them, and
+    every command is loaded into memory when the store is opened so that
+    looking one up doesn't need to touch the database
+    """
+
+    # Path of the database
+    path: str
+
+    _conn: Optional[sqlite3.Connection]
+
+    # Packets of every command by namespace and name
+    _index: Dict[Tuple[str, str], bytes]
+
+    # Guards the connection and index as they are used from multiple threads
+    _lock: Lock
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = None
+        self._index = {}
+        self._lock = Lock()
+
+    def open(self):
+        """
+        Connects to the database (creating it and its directory if needed)
+        and loads every command into memory
+        """
+        with self._lock:
+            if self._conn is not None:
+                return
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS ir_commands("
+                    "namespace TEXT NOT NULL, "
+                    "name TEXT NOT NULL, "
+                    "packet BLOB NOT NULL, "
+                    "PRIMARY KEY (namespace, name))"
+                )
+            self._index = {
+                (namespace, name): bytes(packet)
+                for namespace, name, packet in conn.execute(
+                    "SELECT namespace, name, packet FROM ir_commands"
+                )
+            }
+            self._conn = conn
+
+    def close(self):
+        """
+        Closes the connection to the database
+        """
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._index = {}
+
+    def __enter__(self) -> "IRCommandStore":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def put_many(self, commands: Dict[str, bytes], namespace: str = GLOBAL_NAMESPACE):
+        """
+        Saves several commands at once (either all are saved or none are),
+        replacing any existing ones with the same names
+        """
+        with self._lock:
+            # Commits if successful, otherwise rolls back
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO ir_commands(namespace, name, packet) "
+                    "VALUES(?, ?, ?)",
+                    [(namespace, name, packet) for name, packet in commands.items()],
+                )
+            for name, packet in commands.items():
+                self._index[(namespace, name)] = packet
+
+    def put(self, name: str, packet: bytes, namespace: str = GLOBAL_NAMESPACE):
+        """
+        Saves a command, replacing any existing one with the same name
+        """
+        self.put_many({name: packet}, namespace)
+
+    def get(self, name: str, namespace: str = GLOBAL_NAMESPACE) -> bytes:
+        """
+        Returns the packet of a command, falling back to the global namespace
+        if it isn't in the given one
+
+        Raises:
+            ResourceNotFoundError: If the command doesn't exist
+        """
+        packet = self._index.get((namespace, name))
+        if packet is None:
+            packet = self._index.get((GLOBAL_NAMESPACE, name))
+        if packet is None:
+            raise ResourceNotFoundError(f"IR command '{name}' not found")
+        return packet
+
+    def has(self, name: str, namespace: str = GLOBAL_NAMESPACE) -> bool:
+        """
+        Returns whether a command exists in a particular namespace (ignoring
+        the global one)
+        """
+        return (namespace, name) in self._index
+
+    def list_commands(self, namespace: str = GLOBAL_NAMESPACE) -> List[str]:
+        """
+        Returns the names of the commands available in a namespace (including
+        those in the global one)
+        """
+        return sorted(
+            {
+                name
+                for command_namespace, name in list(self._index)
+                if command_namespace in (namespace, GLOBAL_NAMESPACE)
+            }
+        )
@@ -1,6 +1,12 @@
+from pathlib import Path
 from typing import Dict
 
-from homecontrol.broadlink.structs import BroadlinkConnectionInfo
+from homecontrol.broadlink.structs import (
+    BroadlinkCommandStoreConfig,
+    BroadlinkConnectionInfo,
+    BroadlinkMacroConfig,
+)
+from homecontrol.circuit_breaker import CircuitBreakerConfig
 from homecontrol.config import Config
 
 
@@ -12,6 +18,13 @@ class BroadlinkConfig(Config):
     def __init__(self) -> None:
         super().__init__("broadlink.json")
 
+    def get_circuit_breaker(self) -> CircuitBreakerConfig:
+        """
+        Returns a CircuitBreakerConfig instance from loaded config (defaults
+        are used if not given)
+        """
+        return CircuitBreakerConfig(**self.data.get("circuit_breaker", {}))
+
     def has_devices(self):
         """
         Returns whether the loaded config has any devices stored in it
@@ -59,16 +72,50 @@ class BroadlinkConfig(Config):
         )
         self.data.update({"devices": devices})
 
-    def register_ir_command(self, name: str, packet: bytes):
+    def get_command_store(self) -> BroadlinkCommandStoreConfig:
+        """
+        Returns a BroadlinkCommandStoreConfig instance from loaded config
+        (defaults are used if not given)
+
+        A relative path is taken relative to the directory of this config
+        rather than the working directory, so that every process using the
+        config shares the same store (the working directory is used if the
+        config doesn't exist)
+        """
+        config = BroadlinkCommandStoreConfig(**self.data.get("command_store", {}))
+        directory = (
+            self.get_filepath().resolve().parent if self.does_exist() else Path.cwd()
+        )
+        config.path = str(directory / config.path)
+        return config
+
+    def get_macros(self) -> BroadlinkMacroConfig:
         """
-        Registers an IR command by updating the config
+        Returns a BroadlinkMacroConfig instance from loaded config (defaults
+        are used if not given)
+        """
+        return BroadlinkMacroConfig(**self.data.get("macros", {}))
+
+    def has_legacy_ir_commands(self) -> bool:
+        """
+        Returns whether the loaded config has any IR commands stored in it
+        (they are now kept in the command store instead)
+        """
+        return "commands" in self.data
+
+    def get_legacy_ir_commands(self) -> Dict[str, bytes]:
+        """
+        Returns the IR commands stored in the config
+
+        Does not check for existence first
         """
-        commands = self.data["commands"] if "commands" in self.data else {}
-        commands.update({name: packet.decode("latin1")})
-        self.data.update({"commands": commands})
+        return {
+            name: packet.encode("latin1")
+            for name, packet in self.data["commands"].items()
+        }
 
-    def get_ir_command(self, name: str):
+    def remove_legacy_ir_commands(self):
         """
-        Registers an IR command loaded from the config
+        Removes the IR commands stored in the config by updating it
         """
-        return self.data["commands"][name].encode("latin1")
+        self.data.pop("commands", None)
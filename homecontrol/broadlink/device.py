@@ -1,13 +1,31 @@
+import dataclasses
 import time
-from typing import Optional
+from operator import methodcaller
+from threading import Event, Lock
+from typing import Any, Callable, Optional, Tuple
 
 import broadlink
 
-from homecontrol.broadlink.structs import BroadlinkConnectionInfo
+from homecontrol.broadlink.structs import (
+    BroadlinkConnectionInfo,
+    BroadlinkConnectionStats,
+)
+
+# Errors returned by devices that no longer accept the current session (e.g.
+# after rebooting), which are resolved by authenticating again
+REAUTHENTICATE_ERRORS = (
+    broadlink.exceptions.AuthenticationError,
+    broadlink.exceptions.AuthorizationError,
+    broadlink.exceptions.ConnectionClosedError,
+)
 
 
 class BroadlinkDevice:
-    """Wrapper for broadlink devices"""
+    """Wrapper for broadlink devices
+
+    The device is only connected to when first used, and is authenticated
+    with again automatically if it stops accepting the session (requests that
+    time out cause it to be discovered again on the next use)"""
 
     # Max time we expect learning an IR packet to take (seconds)
     LEARNING_TIMEOUT = 10
@@ -16,53 +34,141 @@ class BroadlinkDevice:
     LEARNING_CHECK_TIME = 1
 
     _connection_info: BroadlinkConnectionInfo
-    _device: broadlink.Device
+
+    # None until connected to (or after the connection is lost)
+    _device: Optional[broadlink.Device]
+
+    # Incremented each time the device is authenticated with, so that
+    # requests failing on the same session only authenticate once
+    _session: int
+
+    # Guards the connection and stats
+    _lock: Lock
+    _stats: BroadlinkConnectionStats
 
     def __init__(self, connection_info: BroadlinkConnectionInfo) -> None:
-        """Creates and authenticates the broadlink device"""
+        """Stores the connection info (the device is connected to on first
+        use)"""
         self._connection_info = connection_info
-        self._device = broadlink.hello(self._connection_info.ip_address)
-        self._device.auth()
-
-    def get_ir_packet(self) -> Optional[bytes]:
+        self._device = None
+        self._session = 0
+        self._lock = Lock()
+        self._stats = BroadlinkConnectionStats(
+            connected=False,
+            connection_attempts=0,
+            failed_connection_attempts=0,
+            reauthentications=0,
+            last_connected=None,
+            last_error=None,
+        )
+
+    def _authenticate(self, session: int):
+        """Discovers the device (if needed) and authenticates with it, unless
+        the given session has already been replaced (lock should be held)"""
+        if session != self._session and self._device is not None:
+            return
+
+        reauthenticating = self._device is not None
+        self._stats.connection_attempts += 1
+        try:
+            device = self._device or broadlink.hello(self._connection_info.ip_address)
+            device.auth()
+        except Exception as err:
+            self._device = None
+            self._stats.failed_connection_attempts += 1
+            self._stats.last_error = str(err) or type(err).__name__
+            raise
+
+        if reauthenticating:
+            self._stats.reauthentications += 1
+        self._device = device
+        self._session += 1
+        self._stats.last_connected = time.time()
+        self._stats.last_error = None
+
+    def _get_device(self) -> Tuple[broadlink.Device, int]:
+        """Returns the device along with its current session, connecting to
+        it first if needed"""
+        with self._lock:
+            if self._device is None:
+                self._authenticate(self._session)
+            return self._device, self._session
+
+    def _disconnect(self, session: int):
+        """Forgets the device (unless the given session has already been
+        replaced) so that it is discovered again on the next use"""
+        with self._lock:
+            if session == self._session:
+                self._device = None
+
+    def _call(self, func: Callable[[broadlink.Device], Any]) -> Any:
+        """Calls a function with the device, connecting to it first if needed
+        and authenticating again (then retrying once) if the session is no
+        longer accepted"""
+        device, session = self._get_device()
+        try:
+            try:
+                return func(device)
+            except REAUTHENTICATE_ERRORS:
+                with self._lock:
+                    self._authenticate(session)
+                device, session = self._get_device()
+                return func(device)
+        except (broadlink.exceptions.NetworkTimeoutError, OSError):
+            self._disconnect(session)
+            raise
+
+    def connect(self):
+        """Connects to and authenticates with the device (if not already)"""
+        self._get_device()
+
+    def auth(self):
+        """Authenticates with the device again, connecting to it first if
+        needed (e.g. to check it is still reachable)"""
+        with self._lock:
+            self._authenticate(self._session)
+
+    def get_connection_stats(self) -> BroadlinkConnectionStats:
+        """Returns the state of the connection to the device"""
+        with self._lock:
+            return dataclasses.replace(self._stats, connected=self._device is not None)
+
+    def get_ir_packet(self, cancel: Optional[Event] = None) -> Optional[bytes]:
         """Puts the device in learning mode and waits until an IR packet is
         returned or we reach a timeout in which case this returns None
 
+        Args:
+            cancel (Optional[Event]): When set, stops waiting for a packet
+                                      (None is then returned)
+
         Returns:
             Optional[bytes]: The IR packet, or None if the timeout was reached
         """
+        if cancel is None:
+            cancel = Event()
 
         # Start learning mode
-        self._device.enter_learning()
-
-        # Current packet
-        packet = None
-
-        # Start, elapsed and elapsed time that we last did a check for any
-        # IR packet
-        start_time = time.time()
-        current_elapsed_time = 0
-        last_check_time = 0
-
-        # Keep checking for packets until we reach the timeout
-        while current_elapsed_time < self.LEARNING_TIMEOUT:
-            current_elapsed_time = time.time() - start_time
+        self._call(methodcaller("enter_learning"))
 
-            # Due a check?
-            if current_elapsed_time - last_check_time > self.LEARNING_CHECK_TIME:
-                last_check_time = current_elapsed_time
+        deadline = time.monotonic() + self.LEARNING_TIMEOUT
 
-                # Attempt to get a packet, but ignore errors if nothing found
-                try:
-                    packet = self._device.check_data()
-                    return packet
-                except broadlink.exceptions.ReadError:
-                    pass
+        # Keep checking for packets until we reach the timeout, sleeping in
+        # between each check
+        while True:
+            remaining_time = deadline - time.monotonic()
+            if remaining_time <= 0:
+                return None
+            if cancel.wait(min(self.LEARNING_CHECK_TIME, remaining_time)):
+                return None
 
-        return None
+            # Attempt to get a packet, but ignore errors if nothing found
+            try:
+                return self._call(methodcaller("check_data"))
+            except broadlink.exceptions.ReadError:
+                pass
 
     def send_ir_packet(self, packet: bytes):
         """
         Sends an IR packet to the device
         """
-        self._device.send_data(packet)
+        self._call(methodcaller("send_data", packet))
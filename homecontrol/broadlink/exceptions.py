@@ -0,0 +1,11 @@
+class IRLearningInProgressError(Exception):
+    """
+    Raised when attempting to learn an IR command on a device that is already
+    learning one
+    """
+
+
+class IRMacroError(Exception):
+    """
+    Raised when an IR macro is invalid
+    """
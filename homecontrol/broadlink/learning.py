@@ -0,0 +1,124 @@
+import dataclasses
+import logging
+import time
+from threading import Event, Lock, Thread
+from typing import Callable, Optional
+from uuid import uuid4
+
+from homecontrol.broadlink.structs import IRLearningJobInfo, IRLearningStatus
+from homecontrol.exceptions import DeviceConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+class IRLearningJob:
+    """
+    Learns an IR command in a background thread so that the caller can check
+    on it (or cancel it) later rather than waiting for it
+    """
+
+    _info: IRLearningJobInfo
+    _info_lock: Lock
+
+    # Waits for an IR packet, returning None if the timeout is reached or the
+    # given event is set first
+    _learn: Callable[[Event], Optional[bytes]]
+
+    # Saves a learnt IR packet
+    _save: Callable[[bytes], None]
+
+    _cancel: Event
+
+    def __init__(
+        self,
+        device_name: str,
+        command_name: str,
+        learn: Callable[[Event], Optional[bytes]],
+        save: Callable[[bytes], None],
+    ) -> None:
+        self._info = IRLearningJobInfo(
+            job_id=str(uuid4()),
+            device_name=device_name,
+            command_name=command_name,
+            status=IRLearningStatus.LEARNING,
+            started=time.time(),
+        )
+        self._info_lock = Lock()
+        self._learn = learn
+        self._save = save
+        self._cancel = Event()
+
+    @property
+    def job_id(self) -> str:
+        """
+        Returns the ID of the job
+        """
+        return self._info.job_id
+
+    @property
+    def device_name(self) -> str:
+        """
+        Returns the name of the device learning the command
+        """
+        return self._info.device_name
+
+    @property
+    def finished(self) -> bool:
+        """
+        Returns whether the job has finished (whatever the outcome)
+        """
+        return self._info.status != IRLearningStatus.LEARNING
+
+    def get_info(self) -> IRLearningJobInfo:
+        """
+        Returns the current state of the job
+        """
+        with self._info_lock:
+            return dataclasses.replace(self._info)
+
+    def start(self):
+        """
+        Starts learning in the background
+        """
+        Thread(target=self._run, name=f"ir-learning-{self.job_id}", daemon=True).start()
+
+    def cancel(self):
+        """
+        Stops waiting for the IR packet (the job finishes shortly after)
+        """
+        self._cancel.set()
+
+    def _finish(self, status: IRLearningStatus, error: Optional[str] = None):
+        """
+        Records the outcome of the job
+        """
+        with self._info_lock:
+            self._info.status = status
+            self._info.finished = time.time()
+            self._info.error = error
+
+    def _run(self):
+        """
+        Waits for an IR packet and saves it
+        """
+        try:
+            packet = self._learn(self._cancel)
+            if packet is None:
+                self._finish(
+                    IRLearningStatus.CANCELLED
+                    if self._cancel.is_set()
+                    else IRLearningStatus.TIMED_OUT
+                )
+                return
+            self._save(packet)
+        except DeviceConnectionError as err:
+            self._finish(IRLearningStatus.FAILED, str(err))
+        except Exception:
+            logger.exception(
+                "Unexpected error learning the IR command '%s' on '%s'",
+                self._info.command_name,
+                self.device_name,
+            )
+            self._finish(IRLearningStatus.FAILED, "An unexpected error occurred")
+        else:
+            self._finish(IRLearningStatus.COMPLETED)
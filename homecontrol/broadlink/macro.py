@@ -0,0 +1,233 @@
+import logging
+import math
+import time
+from threading import Event
+from typing import Callable, List, Optional
+
+from homecontrol.broadlink.exceptions import IRMacroError
+from homecontrol.broadlink.packets import (
+    MAX_GAP,
+    can_combine_ir_packet,
+    combine_ir_packets,
+    get_combined_size,
+)
+from homecontrol.broadlink.structs import IRMacroStep, IRMacroStepResult
+from homecontrol.exceptions import DeviceConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Prefix of actions that pause the macro for some number of seconds
+WAIT_PREFIX = "wait:"
+
+# Separates a command from the number of times to send it
+REPEAT_SEPARATOR = "*"
+
+# Joins the names of commands combined into one send
+COMBINED_SEPARATOR = "+"
+
+
+class IRMacro:
+    """
+    A sequence of IR commands to send with precise timing between them
+
+    Macros are compiled from a list of actions, each of which is one of
+        - 'command' to send a command once
+        - 'command*N' to send a command N times
+        - 'wait:S' to wait S seconds before sending the next command
+    with at least the command gap left between consecutive sends
+
+    Where possible consecutive IR commands are combined into a single packet
+    (with the delays between them encoded as gaps in it) so the device
+    receives them at once
+    """
+
+    steps: List[IRMacroStep]
+
+    # Total time the macro is planned to wait between sends (seconds)
+    duration: float
+
+    def __init__(self, steps: List[IRMacroStep], duration: float) -> None:
+        self.steps = steps
+        self.duration = duration
+
+    @staticmethod
+    def compile(
+        actions: List[str],
+        get_packet: Callable[[str], bytes],
+        command_gap: float,
+        max_frame_size: int = 0,
+        max_repeat: Optional[int] = None,
+        max_duration: Optional[float] = None,
+    ) -> "IRMacro":
+        """
+        Compiles a list of actions into a macro, looking up the packet of
+        every command first so that nothing is sent if any are missing
+
+        Args:
+            actions (List[str]): Actions of the macro (see IRMacro)
+            get_packet (Callable[[str], bytes]): Returns the packet of a
+                                                 command given its name
+            command_gap (float): Minimum time between consecutive sends
+                                 (seconds)
+            max_frame_size (int): Largest packet commands may be combined
+                                  into (bytes), 0 to never combine them
+            max_repeat (Optional[int]): Most times a single action may send
+                                        a command (None for no limit)
+            max_duration (Optional[float]): Longest the macro may wait
+                                            between sends in total (seconds,
+                                            None for no limit)
+
+        Raises:
+            IRMacroError: If any of the actions are invalid
+            ResourceNotFoundError: If any of the commands don't exist
+        """
+        steps = []
+        # Time to wait before the next send
+        delay = 0.0
+        # Time waited before every step so far
+        duration = 0.0
+        for action in actions:
+            if action.startswith(WAIT_PREFIX):
+                try:
+                    wait = float(action[len(WAIT_PREFIX) :])
+                except ValueError:
+                    wait = -1
+                if not math.isfinite(wait) or wait < 0:
+                    raise IRMacroError(f"Invalid wait in IR macro action '{action}'")
+                delay += wait
+                IRMacro._check_duration(duration + delay, max_duration)
+                continue
+
+            command, _, repeat = action.partition(REPEAT_SEPARATOR)
+            try:
+                repeat = int(repeat) if repeat else 1
+            except ValueError:
+                repeat = 0
+            if not command or repeat < 1:
+                raise IRMacroError(f"Invalid IR macro action '{action}'")
+            if max_repeat is not None and repeat > max_repeat:
+                raise IRMacroError(
+                    f"IR macro action '{action}' repeats a command more than the "
+                    f"maximum of {max_repeat} times"
+                )
+
+            packet = get_packet(command)
+            for _ in range(repeat):
+                step = IRMacroStep(
+                    command=command,
+                    packet=packet,
+                    delay=max(delay, command_gap) if steps else delay,
+                )
+                steps.append(step)
+                duration += step.delay
+                delay = 0.0
+            IRMacro._check_duration(duration, max_duration)
+
+        if max_frame_size > 0:
+            steps = IRMacro._combine_steps(steps, max_frame_size)
+        return IRMacro(steps, duration)
+
+    @staticmethod
+    def _check_duration(duration: float, max_duration: Optional[float]):
+        """
+        Raises an IRMacroError if a macro would wait longer than the maximum
+        duration
+        """
+        if max_duration is not None and duration > max_duration:
+            raise IRMacroError(
+                f"IR macro waits longer than the maximum of {max_duration} seconds"
+            )
+
+    @staticmethod
+    def _combine_steps(
+        steps: List[IRMacroStep], max_frame_size: int
+    ) -> List[IRMacroStep]:
+        """
+        Combines runs of consecutive steps into single steps where their
+        packets can be combined into one no larger than max_frame_size
+        """
+        combined_steps = []
+        group: List[IRMacroStep] = []
+
+        def add_group():
+            if len(group) == 1:
+                combined_steps.append(group[0])
+            elif group:
+                combined_steps.append(
+                    IRMacroStep(
+                        command=COMBINED_SEPARATOR.join(step.command for step in group),
+                        packet=combine_ir_packets(
+                            [step.packet for step in group],
+                            [step.delay for step in group[1:]],
+                        ),
+                        delay=group[0].delay,
+                    )
+                )
+
+        for step in steps:
+            if not can_combine_ir_packet(step.packet):
+                add_group()
+                group = []
+                combined_steps.append(step)
+            elif (
+                group
+                and step.delay <= MAX_GAP
+                and get_combined_size(
+                    [grouped.packet for grouped in group] + [step.packet]
+                )
+                <= max_frame_size
+            ):
+                group.append(step)
+            else:
+                add_group()
+                group = [step]
+        add_group()
+        return combined_steps
+
+    def run(
+        self, send: Callable[[bytes], None], cancel: Optional[Event] = None
+    ) -> List[IRMacroStepResult]:
+        """
+        Sends each step in order, waiting the delay of each after the
+        previous send finished (the remaining steps are still sent if one
+        fails)
+
+        Args:
+            send (Callable[[bytes], None]): Sends a packet to the device
+            cancel (Optional[Event]): When set, any remaining steps are
+                                      skipped
+        """
+        if cancel is None:
+            cancel = Event()
+
+        results = []
+        start = time.monotonic()
+        previous_end = start
+        for step in self.steps:
+            due = previous_end + step.delay
+            if cancel.wait(max(0.0, due - time.monotonic())):
+                break
+
+            step_start = time.monotonic()
+            error = None
+            try:
+                send(step.packet)
+            except DeviceConnectionError as err:
+                error = str(err)
+            except Exception:
+                logger.exception(
+                    "Unexpected error sending the IR command '%s'", step.command
+                )
+                error = "An unexpected error occurred"
+            previous_end = time.monotonic()
+
+            results.append(
+                IRMacroStepResult(
+                    command=step.command,
+                    scheduled=due - start,
+                    start=step_start - start,
+                    duration=previous_end - step_start,
+                    error=error,
+                )
+            )
+        return results
@@ -1,11 +1,37 @@
-from typing import Dict, List
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from functools import partial
+from threading import Event, Lock
+from typing import Any, Callable, Dict, List, Optional
 
 import broadlink
 
+from homecontrol.broadlink.command_store import IRCommandStore
 from homecontrol.broadlink.config import BroadlinkConfig
 from homecontrol.broadlink.device import BroadlinkDevice
-from homecontrol.broadlink.structs import BroadlinkConnectionInfo
-from homecontrol.exceptions import DeviceConnectionError, DeviceNotRegisteredError
+from homecontrol.broadlink.exceptions import IRLearningInProgressError
+from homecontrol.broadlink.learning import IRLearningJob
+from homecontrol.broadlink.macro import IRMacro
+from homecontrol.broadlink.structs import (
+    BroadlinkConnectionInfo,
+    BroadlinkConnectionStats,
+    BroadlinkMacroConfig,
+    IRLearningJobInfo,
+    IRMacroStepResult,
+)
+from homecontrol.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerStats,
+)
+from homecontrol.exceptions import (
+    DeviceConnectionError,
+    DeviceNotRegisteredError,
+    ResourceNotFoundError,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class BroadlinkManager:
@@ -13,14 +39,120 @@ class BroadlinkManager:
     Handles a set of broadlink devices
     """
 
+    # Time finished IR learning jobs are kept for so their results can be
+    # obtained (seconds)
+    LEARNING_JOB_RETENTION = 600
+
     _config: BroadlinkConfig
-    _loaded_devices: Dict[str, BroadlinkDevice] = {}
+    _loaded_devices: Dict[str, BroadlinkDevice]
+
+    # Learnt IR commands (namespaced by device name)
+    _command_store: IRCommandStore
+
+    # Requests to devices that are repeatedly failing fail immediately
+    # rather than waiting for them to time out
+    _circuit_breaker_config: CircuitBreakerConfig
+    _circuit_breakers: Dict[str, CircuitBreaker]
+
+    # IR commands are learnt in the background
+    _learning_jobs: Dict[str, IRLearningJob]
+    _learning_jobs_lock: Lock
+
+    # IR macros are played back in the background, one at a time on each
+    # device so their timing isn't disrupted
+    _macro_config: BroadlinkMacroConfig
+    _macro_executor: ThreadPoolExecutor
+    _macro_locks: Dict[str, Lock]
 
     def __init__(self) -> None:
+        """
+        Loads the config (start() should be called before using any devices)
+        """
         self._config = BroadlinkConfig()
+        self._loaded_devices = {}
+        self._command_store = IRCommandStore(self._config.get_command_store().path)
+        self._circuit_breaker_config = self._config.get_circuit_breaker()
+        self._circuit_breakers = {}
+        self._learning_jobs = {}
+        self._learning_jobs_lock = Lock()
+        self._macro_config = self._config.get_macros()
+        self._macro_executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="ir-macro"
+        )
+        self._macro_locks = {}
+
+    def start(self) -> "BroadlinkManager":
+        """
+        Opens the command store and loads all registered devices (if not
+        already loaded)
+        """
+        self._command_store.open()
+        if self._config.has_legacy_ir_commands():
+            logger.warning(
+                "IR commands are still stored in the config and can't be used "
+                "until they are moved with 'homecontrol-management "
+                "migrate-ir-commands'"
+            )
+        if not self._loaded_devices:
+            self._load_devices()
+        return self
 
-        # Load all registered devices immediately
-        self._load_devices()
+    def close(self):
+        """
+        Cancels any IR learning jobs and unloads all devices
+        """
+        with self._learning_jobs_lock:
+            for job in self._learning_jobs.values():
+                job.cancel()
+            self._learning_jobs.clear()
+        self._loaded_devices.clear()
+        self._circuit_breakers.clear()
+        self._command_store.close()
+
+    def migrate_legacy_ir_commands(self) -> int:
+        """
+        Moves any IR commands stored in the config into the global namespace
+        of the command store (without replacing any already there), returning
+        how many were added to the store
+
+        The config is only updated once every command is in the store (this
+        opens the command store if start() hasn't been called)
+        """
+        if not self._config.has_legacy_ir_commands():
+            return 0
+        self._command_store.open()
+        legacy_commands = self._config.get_legacy_ir_commands()
+        commands = {
+            name: packet
+            for name, packet in legacy_commands.items()
+            if not self._command_store.has(name)
+        }
+        if commands:
+            self._command_store.put_many(commands)
+
+        # Only remove them from the config once they are definitely stored
+        missing = [
+            name for name in legacy_commands if not self._command_store.has(name)
+        ]
+        if missing:
+            logger.error(
+                "Failed to move the IR commands %s to the command store, leaving "
+                "them in the config",
+                ", ".join(missing),
+            )
+            return len(commands)
+        self._config.remove_legacy_ir_commands()
+        self._config.save()
+        logger.info(
+            "Moved %d IR commands from the config to the command store", len(commands)
+        )
+        return len(commands)
+
+    def __enter__(self) -> "BroadlinkManager":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def list_devices(self) -> List[str]:
         """
@@ -36,11 +168,12 @@ class BroadlinkManager:
             DeviceConnectionError: When there is a connection issue
         """
         # Check connection works
+        device = BroadlinkDevice(
+            connection_info=BroadlinkConnectionInfo(name, ip_address)
+        )
         try:
-            device = BroadlinkDevice(
-                connection_info=BroadlinkConnectionInfo(name, ip_address)
-            )
-        except broadlink.exceptions.NetworkTimeoutError as err:
+            device.connect()
+        except (broadlink.exceptions.BroadlinkException, OSError) as err:
             raise DeviceConnectionError(
                 f"Failed to connect to the broadlink device with ip '{ip_address}'"
             ) from err
@@ -50,11 +183,25 @@ class BroadlinkManager:
         )
         self._config.save()
 
+        self._add_device(name, device)
+
+    def _add_device(self, name: str, device: BroadlinkDevice):
+        """
+        Adds a loaded device along with its circuit breaker
+        """
+        self._circuit_breakers.update(
+            {
+                name: CircuitBreaker(
+                    name, self._circuit_breaker_config, probe=device.auth
+                )
+            }
+        )
+        self._macro_locks.setdefault(name, Lock())
         self._loaded_devices.update({name: device})
 
     def _load_device(self, name: str) -> broadlink.Device:
         """
-        Loads a device from the config
+        Loads a device from the config (it is connected to on first use)
 
         Raises:
             DeviceNotRegisteredError: If the device has not been registered
@@ -65,7 +212,7 @@ class BroadlinkManager:
             )
         connection_info = self._config.get_device(name=name)
         device = BroadlinkDevice(connection_info=connection_info)
-        self._loaded_devices.update({name: device})
+        self._add_device(name, device)
 
     def _load_devices(self):
         """
@@ -86,19 +233,219 @@ class BroadlinkManager:
             return self._loaded_devices[name]
         raise DeviceNotRegisteredError(f"Device '{name}' is not registered")
 
-    def record_ir_command(self, device_name: str, command_name: str):
+    def _call(self, device_name: str, func: Callable, *args) -> Any:
+        """
+        Calls a function that communicates with a device through its circuit
+        breaker
+
+        Raises:
+            DeviceConnectionError: When there is a connection issue or the
+                                   device's circuit breaker is open
+        """
+        try:
+            return self._circuit_breakers[device_name].call(func, *args)
+        except (broadlink.exceptions.BroadlinkException, OSError) as err:
+            raise DeviceConnectionError(
+                f"An error occurred communicating with the broadlink device "
+                f"'{device_name}'"
+            ) from err
+
+    def _save_ir_command(self, device_name: str, command_name: str, packet: bytes):
+        """
+        Saves an IR command for a particular device
+        """
+        self._command_store.put(command_name, packet, namespace=device_name)
+
+    def _remove_old_learning_jobs(self):
         """
-        Records and saves an IR command for a particular device
+        Removes finished IR learning jobs that have been kept for longer than
+        LEARNING_JOB_RETENTION (lock should be held)
+        """
+        now = time.time()
+        for job_id, job in list(self._learning_jobs.items()):
+            info = job.get_info()
+            if (
+                info.finished is not None
+                and now - info.finished > self.LEARNING_JOB_RETENTION
+            ):
+                del self._learning_jobs[job_id]
+
+    def start_learning_ir_command(
+        self, device_name: str, command_name: str
+    ) -> IRLearningJobInfo:
+        """
+        Starts learning an IR command for a particular device in the
+        background (it is saved once learnt)
+
+        Raises:
+            DeviceNotRegisteredError: If the device is not registered
+            IRLearningInProgressError: If the device is already learning a
+                                       command
         """
         device = self.get_device(device_name)
-        packet = device.get_ir_packet()
-        self._config.register_ir_command(command_name, packet)
-        self._config.save()
+        with self._learning_jobs_lock:
+            self._remove_old_learning_jobs()
+            for job in self._learning_jobs.values():
+                if job.device_name == device_name and not job.finished:
+                    raise IRLearningInProgressError(
+                        f"The broadlink device '{device_name}' is already "
+                        "learning an IR command"
+                    )
+            job = IRLearningJob(
+                device_name=device_name,
+                command_name=command_name,
+                learn=partial(self._call, device_name, device.get_ir_packet),
+                save=partial(self._save_ir_command, device_name, command_name),
+            )
+            self._learning_jobs[job.job_id] = job
+        job.start()
+        return job.get_info()
+
+    def _get_learning_job(self, job_id: str) -> IRLearningJob:
+        """
+        Returns an IR learning job
+
+        Raises:
+            ResourceNotFoundError: If the job doesn't exist (or was removed)
+        """
+        with self._learning_jobs_lock:
+            if job_id in self._learning_jobs:
+                return self._learning_jobs[job_id]
+        raise ResourceNotFoundError(f"IR learning job '{job_id}' not found")
+
+    def get_learning_job(self, job_id: str) -> IRLearningJobInfo:
+        """
+        Returns the current state of an IR learning job
+
+        Raises:
+            ResourceNotFoundError: If the job doesn't exist (or was removed)
+        """
+        return self._get_learning_job(job_id).get_info()
+
+    def cancel_learning_job(self, job_id: str) -> IRLearningJobInfo:
+        """
+        Cancels an IR learning job (it finishes shortly after) and returns its
+        current state
+
+        Raises:
+            ResourceNotFoundError: If the job doesn't exist (or was removed)
+        """
+        job = self._get_learning_job(job_id)
+        job.cancel()
+        return job.get_info()
 
     def playback_ir_command(self, device_name: str, command_name: str):
         """
-        Play's back a saved IR command for a particular device
+        Play's back a saved IR command for a particular device (commands
+        learnt by it are preferred over global ones with the same name)
+
+        Raises:
+            DeviceNotRegisteredError: If the device is not registered
+            ResourceNotFoundError: If the command doesn't exist
+            DeviceConnectionError: When there is a connection issue
         """
         device = self.get_device(device_name)
-        packet = self._config.get_ir_command(command_name)
-        device.send_ir_packet(packet)
+        packet = self._command_store.get(command_name, namespace=device_name)
+        self._call(device_name, device.send_ir_packet, packet)
+
+    def compile_ir_macro(self, device_name: str, actions: List[str]) -> IRMacro:
+        """
+        Compiles a list of actions into an IR macro for a particular device
+        (see IRMacro for the format of the actions)
+
+        Raises:
+            IRMacroError: If any of the actions are invalid
+            ResourceNotFoundError: If any of the commands don't exist
+        """
+        return IRMacro.compile(
+            actions,
+            get_packet=partial(self._command_store.get, namespace=device_name),
+            command_gap=self._macro_config.command_gap,
+            max_frame_size=self._macro_config.max_frame_size,
+            max_repeat=self._macro_config.max_repeat,
+            max_duration=self._macro_config.max_duration,
+        )
+
+    def _run_ir_macro(
+        self,
+        device_name: str,
+        device: BroadlinkDevice,
+        macro: IRMacro,
+        cancel: Optional[Event] = None,
+    ) -> List[IRMacroStepResult]:
+        """
+        Plays back an IR macro on a device (blocking)
+        """
+        with self._macro_locks[device_name]:
+            return macro.run(
+                partial(self._call, device_name, device.send_ir_packet), cancel
+            )
+
+    def start_ir_macro(
+        self, device_name: str, actions: List[str]
+    ) -> "Future[List[IRMacroStepResult]]":
+        """
+        Compiles and starts playing back an IR macro on a particular device in
+        the background, returning a future for the result of each send
+
+        Raises:
+            DeviceNotRegisteredError: If the device is not registered
+            IRMacroError: If any of the actions are invalid
+            ResourceNotFoundError: If any of the commands don't exist
+        """
+        device = self.get_device(device_name)
+        macro = self.compile_ir_macro(device_name, actions)
+        return self._macro_executor.submit(
+            self._run_ir_macro, device_name, device, macro
+        )
+
+    def run_ir_macro(
+        self, device_name: str, actions: List[str]
+    ) -> List[IRMacroStepResult]:
+        """
+        Compiles and plays back an IR macro on a particular device, returning
+        the result of each send
+
+        The macro is given as long as it plans to wait plus the send timeout
+        for each send to finish, after which any remaining steps are skipped
+
+        Raises:
+            DeviceNotRegisteredError: If the device is not registered
+            IRMacroError: If any of the actions are invalid
+            ResourceNotFoundError: If any of the commands don't exist
+            DeviceConnectionError: If the macro doesn't finish in time
+        """
+        device = self.get_device(device_name)
+        macro = self.compile_ir_macro(device_name, actions)
+        timeout = macro.duration + len(macro.steps) * self._macro_config.send_timeout
+
+        cancel = Event()
+        future = self._macro_executor.submit(
+            self._run_ir_macro, device_name, device, macro, cancel
+        )
+        try:
+            return future.result(timeout)
+        except TimeoutError as err:
+            cancel.set()
+            raise DeviceConnectionError(
+                f"The IR macro on the broadlink device '{device_name}' didn't "
+                f"finish within {timeout:.1f} seconds"
+            ) from err
+
+    def get_connection_stats(self) -> Dict[str, BroadlinkConnectionStats]:
+        """
+        Returns the state of the connection to each loaded device
+        """
+        return {
+            name: device.get_connection_stats()
+            for name, device in list(self._loaded_devices.items())
+        }
+
+    def get_circuit_breaker_stats(self) -> Dict[str, CircuitBreakerStats]:
+        """
+        Returns the state of the circuit breaker of each loaded device
+        """
+        return {
+            name: circuit_breaker.get_stats()
+            for name, circuit_breaker in list(self._circuit_breakers.items())
+        }
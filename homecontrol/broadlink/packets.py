@@ -0,0 +1,112 @@
+import struct
+from typing import List, Optional, Tuple
+
+# First byte of broadlink packets containing IR (rather than RF) pulses
+IR_PACKET_TYPE = 0x26
+
+# Type, repeat count and length of the pulse data (little endian)
+HEADER_FORMAT = "<BBH"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Duration of one unit of a pulse or gap (seconds)
+TICK = 269 / 8192 / 1000
+
+# Largest pulse or gap that can be encoded (in ticks), values over 255 are
+# encoded as a 0 followed by the value as 2 big endian bytes
+MAX_TICKS = 0xFFFF
+
+# Longest gap that can be left between combined packets (seconds)
+MAX_GAP = MAX_TICKS * TICK
+
+# Packets are padded to a multiple of this size
+PADDING = 16
+
+
+def _parse_ir_packet(packet: bytes) -> Optional[Tuple[bytes, int, int]]:
+    """
+    Returns the pulse data of an IR packet along with the index and length
+    (in ticks) of the gap at the end of it if it can be combined with others,
+    or None if it can't (e.g. it is an RF packet or repeats)
+    """
+    if len(packet) < HEADER_SIZE:
+        return None
+    packet_type, repeat, length = struct.unpack_from(HEADER_FORMAT, packet)
+    if packet_type != IR_PACKET_TYPE or repeat != 0:
+        return None
+    data = packet[HEADER_SIZE : HEADER_SIZE + length]
+    if len(data) != length:
+        return None
+
+    # Find the last value to check it's a gap that can be extended (values
+    # alternate between pulses and gaps starting with a pulse)
+    index = 0
+    count = 0
+    last_index = 0
+    last_value = 0
+    while index < length:
+        last_index = index
+        if data[index] == 0:
+            if index + 3 > length:
+                return None
+            last_value = (data[index + 1] << 8) | data[index + 2]
+            index += 3
+        else:
+            last_value = data[index]
+            index += 1
+        count += 1
+    if count == 0 or count % 2 != 0:
+        return None
+    return data, last_index, last_value
+
+
+def can_combine_ir_packet(packet: bytes) -> bool:
+    """
+    Returns whether an IR packet can be combined with others
+    """
+    return _parse_ir_packet(packet) is not None
+
+
+def get_combined_size(packets: List[bytes]) -> int:
+    """
+    Returns the size of the packet that would be produced by combining
+    several IR packets (assuming they can be combined)
+    """
+    # Each gap may need extending to the 3 byte encoding
+    size = HEADER_SIZE + sum(len(packet) - HEADER_SIZE + 2 for packet in packets)
+    return size + (-size % PADDING)
+
+
+def combine_ir_packets(packets: List[bytes], gaps: List[float]) -> bytes:
+    """
+    Combines several IR packets into one, so they can be sent to a device at
+    once, with at least the given gap between the end of each and the start
+    of the next
+
+    Args:
+        packets (List[bytes]): Packets to combine (can_combine_ir_packet()
+                               should be True for each)
+        gaps (List[float]): Minimum time between each packet and the next
+                            (seconds), one fewer than the number of packets
+
+    Raises:
+        ValueError: If the packets can't be combined or a gap is too long
+    """
+    parts = []
+    for index, packet in enumerate(packets):
+        parsed = _parse_ir_packet(packet)
+        if parsed is None:
+            raise ValueError("IR packet cannot be combined with others")
+        data, last_index, last_gap = parsed
+
+        if index < len(gaps):
+            gap = max(last_gap, round(gaps[index] / TICK))
+            if gap > MAX_TICKS:
+                raise ValueError("Gap between IR packets is too long to encode")
+            if gap != last_gap:
+                # Replace the final gap with the longer one
+                data = data[:last_index] + bytes([0]) + gap.to_bytes(2, "big")
+        parts.append(data)
+
+    data = b"".join(parts)
+    packet = struct.pack(HEADER_FORMAT, IR_PACKET_TYPE, 0, len(data)) + data
+    return packet + bytes(-len(packet) % PADDING)
@@ -1,4 +1,16 @@
 from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+@dataclass
+class BroadlinkCommandStoreConfig:
+    """
+    For storing the settings of the store of learnt IR commands
+    """
+
+    # Path of the sqlite3 database the commands are stored in
+    path: str = "broadlink_commands.db"
 
 
 @dataclass
@@ -9,3 +21,115 @@ class BroadlinkConnectionInfo:
 
     name: str  # Added for UI purposes
     ip_address: str
+
+
+@dataclass
+class BroadlinkConnectionStats:
+    """
+    For storing the state of the connection to a device
+    """
+
+    # Whether the device is currently authenticated with
+    connected: bool
+
+    # Totals since the device was loaded (re-authentications are those made
+    # because the device stopped accepting the previous session)
+    connection_attempts: int
+    failed_connection_attempts: int
+    reauthentications: int
+
+    # Time the device was last authenticated with (seconds since the epoch)
+    last_connected: Optional[float]
+
+    # Reason the last connection attempt failed (if it did)
+    last_error: Optional[str]
+
+
+class IRLearningStatus(str, Enum):
+    """
+    States of a job learning an IR command
+    """
+
+    LEARNING = "learning"
+    COMPLETED = "completed"
+    TIMED_OUT = "timed_out"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+@dataclass
+class IRLearningJobInfo:
+    """
+    For storing the current state of a job learning an IR command
+    """
+
+    job_id: str
+    device_name: str
+    command_name: str
+    status: IRLearningStatus
+
+    # Times the job started and finished (seconds since the epoch)
+    started: float
+    finished: Optional[float] = None
+
+    # Reason the job failed (if it did)
+    error: Optional[str] = None
+
+
+@dataclass
+class BroadlinkMacroConfig:
+    """
+    For storing the settings used when playing back IR macros
+    """
+
+    # Minimum time between sending consecutive commands, as some devices drop
+    # commands sent back to back (seconds)
+    command_gap: float = 0.1
+
+    # Largest packet consecutive IR commands may be combined into so they
+    # are sent to the device at once (bytes), 0 to send each separately
+    max_frame_size: int = 1024
+
+    # Most times a single action may send a command (e.g. 'command*N')
+    max_repeat: int = 20
+
+    # Longest a macro may wait between sends in total (seconds)
+    max_duration: float = 120
+
+    # Time allowed for each send when waiting for a macro to finish, on top
+    # of the time it plans to wait (seconds)
+    send_timeout: float = 10
+
+
+@dataclass
+class IRMacroStep:
+    """
+    For storing a single send within a compiled macro (of one command, or
+    several combined into one packet)
+    """
+
+    # Name of the command (joined with '+' when several are combined)
+    command: str
+    packet: bytes
+
+    # Time to wait after the previous send finished before sending this one
+    # (seconds)
+    delay: float
+
+
+@dataclass
+class IRMacroStepResult:
+    """
+    For storing the outcome of a single send of an IR macro
+    """
+
+    command: str
+
+    # Times relative to the start of the macro that the send was due and
+    # actually started, and how long it took (seconds)
+    scheduled: float
+    start: float
+    duration: float
+
+    # Reason the send failed (if it did)
+    error: Optional[str] = None
@@ -0,0 +1,243 @@
+import logging
+import time
+from dataclasses import dataclass
+from enum import Enum
+from threading import Lock, Thread
+from typing import Any, Callable, Optional
+
+from homecontrol.exceptions import DeviceConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """
+    States of a circuit breaker
+    """
+
+    # Device is being used normally
+    CLOSED = "closed"
+
+    # Device has failed too many times in a row so requests fail immediately
+    OPEN = "open"
+
+    # Device is being probed in the background to see if it has recovered
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """
+    For storing the settings of the circuit breakers used for devices
+    """
+
+    # Number of consecutive failures before requests fail immediately
+    failure_threshold: int = 3
+
+    # Time to wait after opening before probing the device (seconds)
+    reset_timeout: float = 30
+
+
+@dataclass
+class CircuitBreakerStats:
+    """
+    For storing the current state of a circuit breaker
+    """
+
+    state: CircuitState
+    consecutive_failures: int
+
+    # Time the breaker last opened (seconds since the epoch) if open
+    opened_at: Optional[float]
+
+    # Totals since the breaker was created
+    failures: int
+    rejections: int
+    probes: int
+
+
+class CircuitBreaker:
+    """
+    Stops requests from waiting on a device that is unreachable
+
+    After a number of consecutive failures the breaker opens and requests
+    fail immediately with a DeviceConnectionError. Once the reset timeout has
+    passed the device is probed in the background (half open), and the
+    breaker closes again as soon as the probe, or any other request, succeeds.
+    """
+
+    _name: str
+    _config: CircuitBreakerConfig
+
+    # Checks whether the device is reachable, raising an exception if not
+    # (run in a background thread while half open)
+    _probe: Optional[Callable[[], Any]]
+
+    _lock: Lock
+    _state: CircuitState
+    _consecutive_failures: int
+    _opened_at: Optional[float]
+    _opened_at_monotonic: float
+
+    _failures: int
+    _rejections: int
+    _probes: int
+
+    def __init__(
+        self,
+        name: str,
+        config: CircuitBreakerConfig,
+        probe: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """
+        Args:
+            name (str): Name of the device (for errors and logging)
+            config (CircuitBreakerConfig): Settings of the breaker
+            probe (Optional[Callable[[], Any]]): Checks whether the device is
+                            reachable. When None the first request after the
+                            reset timeout is let through instead.
+        """
+        self._name = name
+        self._config = config
+        self._probe = probe
+
+        self._lock = Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._opened_at_monotonic = 0.0
+
+        self._failures = 0
+        self._rejections = 0
+        self._probes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        Returns the current state of the breaker
+        """
+        return self._state
+
+    def _open(self):
+        """
+        Opens the breaker (lock should be held)
+        """
+        if self._state != CircuitState.OPEN:
+            logger.warning(
+                "Circuit breaker for '%s' opened after %d consecutive failures",
+                self._name,
+                self._consecutive_failures,
+            )
+        self._state = CircuitState.OPEN
+        self._opened_at = time.time()
+        self._opened_at_monotonic = time.monotonic()
+
+    def _run_probe(self):
+        """
+        Probes the device and records the result (run in the background)
+        """
+        try:
+            self._probe()
+            succeeded = True
+        except Exception:
+            succeeded = False
+
+        # The probe may have already recorded its own result
+        with self._lock:
+            if self._state != CircuitState.HALF_OPEN:
+                return
+        if succeeded:
+            self.record_success()
+        else:
+            self.record_failure()
+
+    def check(self):
+        """
+        Checks whether a request may be made to the device
+
+        Raises:
+            DeviceConnectionError: If the breaker is open (or half open while
+                                   being probed)
+        """
+        start_probe = False
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return
+            if (
+                self._state == CircuitState.OPEN
+                and time.monotonic() - self._opened_at_monotonic
+                >= self._config.reset_timeout
+            ):
+                self._state = CircuitState.HALF_OPEN
+                self._probes += 1
+                if self._probe is None:
+                    # Let this request through as the probe
+                    return
+                start_probe = True
+            self._rejections += 1
+
+        if start_probe:
+            Thread(
+                target=self._run_probe,
+                name=f"circuit-breaker-probe-{self._name}",
+                daemon=True,
+            ).start()
+        raise DeviceConnectionError(
+            f"The device '{self._name}' is currently unreachable"
+        )
+
+    def record_success(self):
+        """
+        Records a successful request, closing the breaker
+        """
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                logger.info("Circuit breaker for '%s' closed", self._name)
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        """
+        Records a failed request, opening the breaker if there have been too
+        many in a row (or if it was being probed)
+        """
+        with self._lock:
+            self._failures += 1
+            self._consecutive_failures += 1
+            if (
+                self._state == CircuitState.HALF_OPEN
+                or self._consecutive_failures >= self._config.failure_threshold
+            ):
+                self._open()
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Calls a function that communicates with the device, recording
+        whether it raised an exception
+
+        Raises:
+            DeviceConnectionError: If the breaker is open
+        """
+        self.check()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def get_stats(self) -> CircuitBreakerStats:
+        """
+        Returns the current state of the breaker
+        """
+        with self._lock:
+            return CircuitBreakerStats(
+                state=self._state,
+                consecutive_failures=self._consecutive_failures,
+                opened_at=self._opened_at,
+                failures=self._failures,
+                rejections=self._rejections,
+                probes=self._probes,
+            )
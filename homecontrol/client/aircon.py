@@ -1,6 +1,6 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from homecontrol.aircon.structs import ACState
+from homecontrol.aircon.structs import ACState, ACStateResult
 from homecontrol.client.helpers import check_response
 from homecontrol.client.session import APISession
 from homecontrol.helpers import ResponseStatus, dataclass_from_dict
@@ -49,14 +49,52 @@ class Aircon:
             current_attempt += 1
         return False
 
-    def get_device(self, name: str) -> ACState:
+    def get_device(self, name: str, max_age: Optional[float] = None) -> ACState:
         """
         Returns the state of a device
+
+        Args:
+            name (str): Name of the device
+            max_age (Optional[float]): Maximum age of the state (seconds), by
+                            default the API decides
         """
-        response = self._session.get(f"/ac/devices/{name}")
+        params = None if max_age is None else {"max_age": max_age}
+        response = self._session.get(f"/ac/devices/{name}", params=params)
         check_response(response, f"An error occurred getting the state of {name}")
         return dataclass_from_dict(ACState, response.json())
 
+    def get_devices_states(
+        self, names: Optional[List[str]] = None, max_age: Optional[float] = None
+    ) -> Dict[str, ACStateResult]:
+        """
+        Returns the states of several devices at once (any that couldn't be
+        obtained have an error instead)
+
+        Args:
+            names (Optional[List[str]]): Names of the devices, by default all
+                            of them
+            max_age (Optional[float]): Maximum age of the states (seconds), by
+                            default the API decides
+        """
+        params = {}
+        if names is not None:
+            params["devices"] = ",".join(names)
+        if max_age is not None:
+            params["max_age"] = max_age
+        response = self._session.get("/ac/devices/states", params=params)
+        check_response(response, "An error occurred getting the states of devices")
+        return {
+            name: ACStateResult(
+                state=(
+                    None
+                    if result["state"] is None
+                    else dataclass_from_dict(ACState, result["state"])
+                ),
+                error=result["error"],
+            )
+            for name, result in response.json().items()
+        }
+
     def set_device(self, name: str, state: ACState) -> ACState:
         """
         Sets the state of a device
@@ -66,3 +104,14 @@ class Aircon:
             response, f"An error occurred while attempting to set the state of {name}"
         )
         return dataclass_from_dict(ACState, response.json())
+
+    def update_device(self, name: str, **changes) -> ACState:
+        """
+        Sets only the given fields of the state of a device
+        """
+        response = self._session.patch(f"/ac/devices/{name}", json=changes)
+        check_response(
+            response,
+            f"An error occurred while attempting to update the state of {name}",
+        )
+        return dataclass_from_dict(ACState, response.json())
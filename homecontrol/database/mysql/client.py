@@ -1,17 +1,65 @@
+from threading import Lock
+from typing import Dict
+
 from homecontrol.database.mysql.config import DatabaseConfig
 from homecontrol.database.mysql.connection import DatabaseConnection
+from homecontrol.database.mysql.pool import DatabaseConnectionPool
+from homecontrol.database.mysql.structs import DatabasePoolStats
 
 
 class DatabaseClient:
     """
     Handles the creation of connections to databases using the database config
+
+    Connections are taken from a pool kept for each database, so call close()
+    when the client is no longer needed
     """
 
     config: DatabaseConfig
 
+    # Pools of connections, keys are the database names
+    _pools: Dict[str, DatabaseConnectionPool]
+    _pools_lock: Lock
+
     def __init__(self) -> None:
         self.config = DatabaseConfig()
+        self._pools = {}
+        self._pools_lock = Lock()
+
+    def get_pool(self, database: str) -> DatabaseConnectionPool:
+        """
+        Returns the pool of connections for a database (creating it if it
+        doesn't exist yet)
+        """
+        with self._pools_lock:
+            pool = self._pools.get(database)
+            if pool is None:
+                pool = DatabaseConnectionPool(
+                    self.config.get_connection_info(database),
+                    self.config.get_pool_config(database),
+                )
+                self._pools[database] = pool
+            return pool
 
     def connect(self, database: str) -> DatabaseConnection:
         # Start a connection with the database
-        return DatabaseConnection(self.config.get_connection_info(database))
+        return DatabaseConnection(self.get_pool(database))
+
+    def get_pool_stats(self) -> Dict[str, DatabasePoolStats]:
+        """
+        Returns statistics about the pool of each database that has been
+        connected to
+        """
+        with self._pools_lock:
+            pools = dict(self._pools)
+        return {database: pool.get_stats() for database, pool in pools.items()}
+
+    def close(self):
+        """
+        Closes all pooled connections
+        """
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.close()
@@ -1,5 +1,8 @@
 from homecontrol.config import Config
-from homecontrol.database.mysql.structs import DatabaseConnectionInfo
+from homecontrol.database.mysql.structs import (
+    DatabaseConnectionInfo,
+    DatabasePoolConfig,
+)
 
 
 class DatabaseConfig(Config):
@@ -21,3 +24,10 @@ class DatabaseConfig(Config):
             username=database_connection_data["username"],
             password=database_connection_data["password"],
         )
+
+    def get_pool_config(self, database: str) -> DatabasePoolConfig:
+        """
+        Returns the connection pool settings for a particular database (any
+        not given use their defaults)
+        """
+        return DatabasePoolConfig(**self.data[database].get("pool", {}))
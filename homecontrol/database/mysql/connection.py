@@ -1,35 +1,41 @@
 from typing import Any, List, Optional, Tuple
-from mysql import connector
 from mysql.connector.connection import MySQLConnection
 from mysql.connector.cursor import MySQLCursor
 
-from homecontrol.database.mysql.structs import DatabaseConnectionInfo
+from homecontrol.database.mysql.pool import DatabaseConnectionPool
 
 
 class DatabaseConnection:
     """
     Handles a database connection to a mysql database
+
+    The connection is checked out of a pool on entering and returned to it
+    (with any uncommitted changes rolled back) on exiting
     """
 
-    _connection_info: DatabaseConnectionInfo
+    _pool: DatabaseConnectionPool
     _connection: MySQLConnection
     _cursor: MySQLCursor
 
-    def __init__(self, connection_info: DatabaseConnectionInfo) -> None:
-        self._connection_info = connection_info
+    def __init__(self, pool: DatabaseConnectionPool) -> None:
+        self._pool = pool
 
     def __enter__(self):
-        self._connection = connector.connect(
-            database=self._connection_info.database,
-            username=self._connection_info.username,
-            password=self._connection_info.password,
-        )
-        self._cursor = self._connection.cursor()
+        self._connection = self._pool.acquire()
+        try:
+            self._cursor = self._connection.cursor()
+        except Exception:
+            self._pool.release(self._connection)
+            raise
 
         return self
 
     def __exit__(self, exception_type, exception_value, traceback):
-        self._connection.close()
+        try:
+            self._cursor.close()
+        except Exception:
+            pass
+        self._pool.release(self._connection)
 
     def create_table(self, table: str, values: List[str]):
         """
@@ -81,6 +87,31 @@ class DatabaseConnection:
         self._cursor.execute(sql, params or None)
         return self._cursor.fetchall()
 
+    def execute(self, sql: str, params: Optional[Tuple[Any]] = None) -> List[Tuple]:
+        """
+        Executes an arbitrary SQL statement (e.g. for schema changes) and
+        returns any rows it produced
+
+        Any values should be given in params and replaced by %s's in the
+        statement to avoid SQL injection
+        """
+        self._cursor.execute(sql, params)
+        if self._cursor.with_rows:
+            return self._cursor.fetchall()
+        return []
+
+    def has_index(self, table: str, index: str) -> bool:
+        """
+        Returns whether a table in the current database has an index with the
+        given name (the primary key is named 'PRIMARY')
+        """
+        rows = self.execute(
+            "SELECT COUNT(*) FROM information_schema.STATISTICS "
+            "WHERE table_schema=DATABASE() AND table_name=%s AND index_name=%s",
+            (table, index),
+        )
+        return rows[0][0] > 0
+
     def commit(self):
         """
         Commits changes
@@ -0,0 +1,10 @@
+class DatabasePoolTimeoutError(Exception):
+    """
+    Raised when no connection to a database becomes available in time
+    """
+
+
+class MigrationError(Exception):
+    """
+    Raised when the migrations of a database can't be applied
+    """
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from typing import Callable, List
+
+from homecontrol.database.mysql.connection import DatabaseConnection
+from homecontrol.database.mysql.exceptions import MigrationError
+
+
+@dataclass
+class Migration:
+    """
+    For storing a change to the schema of a database
+    """
+
+    # Versions should start at 1 and increase by 1 for each migration
+    version: int
+    description: str
+
+    # Applies the change given a connection to the database (MySQL commits
+    # each schema change immediately, so migrations making several should
+    # skip any already made in case a previous attempt failed part way)
+    apply: Callable[[DatabaseConnection], None]
+
+
+class DatabaseMigrator:
+    """
+    Brings the schema of a mysql database up to date by applying any
+    migrations that haven't been applied yet
+
+    The version of the schema is recorded in a table in the database itself.
+    Note that MySQL commits schema changes immediately, so the version is
+    recorded after each migration to allow resuming from a failed one
+    """
+
+    # Table storing the migrations that have been applied
+    TABLE_SCHEMA_VERSION = "schema_version"
+
+    # Time to wait for another process applying migrations to finish (seconds)
+    LOCK_TIMEOUT = 60
+
+    _migrations: List[Migration]
+
+    def __init__(self, migrations: List[Migration]) -> None:
+        """
+        Args:
+            migrations (List[Migration]): Every migration of the database
+
+        Raises:
+            MigrationError: If the migrations aren't numbered 1, 2, 3...
+        """
+        self._migrations = sorted(migrations, key=lambda migration: migration.version)
+        for index, migration in enumerate(self._migrations):
+            if migration.version != index + 1:
+                raise MigrationError(
+                    f"Expected migration version {index + 1} but found "
+                    f"{migration.version} ('{migration.description}')"
+                )
+
+    @property
+    def latest_version(self) -> int:
+        """
+        Returns the version of the schema once all migrations are applied
+        """
+        return len(self._migrations)
+
+    def get_version(self, connection: DatabaseConnection) -> int:
+        """
+        Returns the current version of the schema of a database (0 if no
+        migrations have been applied)
+        """
+        connection.create_table(
+            self.TABLE_SCHEMA_VERSION,
+            [
+                "version INT NOT NULL PRIMARY KEY",
+                "description VARCHAR(255)",
+                "applied_at DATETIME DEFAULT CURRENT_TIMESTAMP",
+            ],
+        )
+        rows = connection.select_values(self.TABLE_SCHEMA_VERSION, ["MAX(version)"])
+        return rows[0][0] or 0
+
+    def migrate(self, connection: DatabaseConnection) -> List[Migration]:
+        """
+        Applies any migrations the database is missing and returns them
+
+        Raises:
+            MigrationError: If another process holds the migration lock for
+                            too long, or the database has a newer schema
+                            than is known about
+        """
+        # Prevent multiple processes applying the same migrations at once
+        lock_name = f"{self.TABLE_SCHEMA_VERSION}_migrate"
+        locked = connection.execute(
+            "SELECT GET_LOCK(%s, %s)", (lock_name, self.LOCK_TIMEOUT)
+        )[0][0]
+        if locked != 1:
+            raise MigrationError("Timed out waiting for the migration lock")
+
+        try:
+            version = self.get_version(connection)
+            if version > self.latest_version:
+                raise MigrationError(
+                    f"The database schema is at version {version} which is newer "
+                    f"than the latest known version {self.latest_version}"
+                )
+
+            applied = []
+            for migration in self._migrations[version:]:
+                migration.apply(connection)
+                connection.execute(
+                    f"INSERT INTO {self.TABLE_SCHEMA_VERSION} (version, description) "
+                    "VALUES (%s, %s)",
+                    (migration.version, migration.description),
+                )
+                connection.commit()
+                applied.append(migration)
+            return applied
+        finally:
+            connection.execute("SELECT RELEASE_LOCK(%s)", (lock_name,))
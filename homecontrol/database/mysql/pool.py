@@ -0,0 +1,228 @@
+import time
+from collections import deque
+from threading import Condition
+from typing import Callable, Deque, Tuple
+
+from mysql import connector
+from mysql.connector.connection import MySQLConnection
+
+from homecontrol.database.mysql.exceptions import DatabasePoolTimeoutError
+from homecontrol.database.mysql.structs import (
+    DatabaseConnectionInfo,
+    DatabasePoolConfig,
+    DatabasePoolStats,
+)
+
+
+class DatabaseConnectionPool:
+    """
+    Keeps a bounded pool of open connections to a mysql database so they can
+    be reused rather than connecting for every query
+    """
+
+    _connection_info: DatabaseConnectionInfo
+    _config: DatabasePoolConfig
+
+    # Function used to make new connections (usually connector.connect)
+    _connect: Callable[..., MySQLConnection]
+
+    # Connections not currently in use along with the time they were
+    # returned to the pool (most recently returned last)
+    _idle: Deque[Tuple[MySQLConnection, float]]
+
+    # Number of connections currently open (including those being made)
+    _open: int
+
+    _closed: bool
+    _condition: Condition
+    _stats: DatabasePoolStats
+
+    def __init__(
+        self,
+        connection_info: DatabaseConnectionInfo,
+        config: DatabasePoolConfig,
+        connect: Callable[..., MySQLConnection] = connector.connect,
+    ) -> None:
+        """
+        Args:
+            connection_info (DatabaseConnectionInfo): Database to connect to
+            config (DatabasePoolConfig): Size and timeouts of the pool
+            connect (Callable[..., MySQLConnection]): Function used to make
+                            new connections (may be replaced for testing)
+        """
+        self._connection_info = connection_info
+        self._config = config
+        self._connect = connect
+        self._idle = deque()
+        self._open = 0
+        self._closed = False
+        self._condition = Condition()
+        self._stats = DatabasePoolStats(
+            open_connections=0,
+            idle_connections=0,
+            checkouts=0,
+            reuses=0,
+            connects=0,
+            connect_failures=0,
+            total_connect_time=0,
+            max_connect_time=0,
+            health_check_failures=0,
+            idle_evictions=0,
+            checkout_timeouts=0,
+        )
+
+    def _new_connection(self) -> MySQLConnection:
+        """
+        Makes a new connection to the database (the caller should already
+        have counted it as open)
+        """
+        start = time.monotonic()
+        try:
+            connection = self._connect(
+                host=self._connection_info.host,
+                database=self._connection_info.database,
+                username=self._connection_info.username,
+                password=self._connection_info.password,
+            )
+        except Exception:
+            with self._condition:
+                self._open -= 1
+                self._stats.connect_failures += 1
+                self._condition.notify()
+            raise
+        connect_time = time.monotonic() - start
+
+        with self._condition:
+            self._stats.connects += 1
+            self._stats.total_connect_time += connect_time
+            self._stats.max_connect_time = max(
+                self._stats.max_connect_time, connect_time
+            )
+        return connection
+
+    def _discard(self, connection: MySQLConnection):
+        """
+        Closes a connection that is no longer counted as open, ignoring any
+        errors
+        """
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _evict_idle(self, now: float):
+        """
+        Closes any connections that have been idle for longer than the idle
+        timeout (assumes the lock is held)
+        """
+        # Oldest connections are at the front
+        while self._idle and now - self._idle[0][1] > self._config.idle_timeout:
+            connection, _ = self._idle.popleft()
+            self._open -= 1
+            self._stats.idle_evictions += 1
+            self._discard(connection)
+
+    def _is_healthy(self, connection: MySQLConnection) -> bool:
+        """
+        Returns whether a connection to the database is still usable
+        """
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def acquire(self) -> MySQLConnection:
+        """
+        Returns a connection from the pool, making a new one if none are idle
+        and the pool isn't full
+
+        Raises:
+            DatabasePoolTimeoutError: If no connection becomes available
+                                      before the checkout timeout
+        """
+        deadline = time.monotonic() + self._config.checkout_timeout
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("The database connection pool is closed")
+
+                now = time.monotonic()
+                self._evict_idle(now)
+
+                if self._idle:
+                    connection, returned = self._idle.pop()
+                    self._stats.checkouts += 1
+                    self._stats.reuses += 1
+                    needs_check = now - returned > self._config.health_check_interval
+                elif self._open < self._config.pool_size:
+                    self._open += 1
+                    self._stats.checkouts += 1
+                    connection = None
+                else:
+                    remaining = deadline - now
+                    if remaining <= 0 or not self._condition.wait(remaining):
+                        if not self._idle and self._open >= self._config.pool_size:
+                            self._stats.checkout_timeouts += 1
+                            raise DatabasePoolTimeoutError(
+                                "Timed out waiting for a connection to the "
+                                f"'{self._connection_info.database}' database"
+                            )
+                    continue
+
+            # Connect and check health without holding the lock
+            if connection is None:
+                return self._new_connection()
+            if not needs_check or self._is_healthy(connection):
+                return connection
+
+            with self._condition:
+                self._open -= 1
+                self._stats.health_check_failures += 1
+                self._condition.notify()
+            self._discard(connection)
+
+    def release(self, connection: MySQLConnection):
+        """
+        Returns a connection to the pool
+
+        Any uncommitted changes are rolled back so the next user of the
+        connection starts a fresh transaction
+        """
+        try:
+            connection.rollback()
+            reusable = True
+        except Exception:
+            reusable = False
+
+        with self._condition:
+            keep = reusable and not self._closed
+            if keep:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._open -= 1
+            self._condition.notify()
+        if not keep:
+            self._discard(connection)
+
+    def close(self):
+        """
+        Closes all idle connections and any others as they are released
+        """
+        with self._condition:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for connection in idle:
+            self._discard(connection)
+
+    def get_stats(self) -> DatabasePoolStats:
+        """
+        Returns a copy of the current statistics of the pool
+        """
+        with self._condition:
+            self._stats.open_connections = self._open
+            self._stats.idle_connections = len(self._idle)
+            return DatabasePoolStats(**self._stats.__dict__)
@@ -11,3 +11,53 @@ class DatabaseConnectionInfo:
     host: str
     username: str
     password: str
+
+
+@dataclass
+class DatabasePoolConfig:
+    """
+    For storing the settings of a pool of connections to a mysql database
+    """
+
+    # Maximum number of connections that may be open at once
+    pool_size: int = 5
+
+    # Time to wait for a connection when all of them are in use (seconds)
+    checkout_timeout: float = 10
+
+    # Time after which unused connections are closed (seconds)
+    idle_timeout: float = 300
+
+    # Connections that haven't been used for longer than this are checked
+    # before being reused (seconds)
+    health_check_interval: float = 30
+
+
+@dataclass
+class DatabasePoolStats:
+    """
+    For storing statistics about a pool of connections to a mysql database
+    """
+
+    # Connections currently open and those of them not in use
+    open_connections: int
+    idle_connections: int
+
+    # Number of times a connection was obtained from the pool, and how many
+    # of those reused an existing connection
+    checkouts: int
+    reuses: int
+
+    # Number of new connections made, failed attempts and the total and
+    # maximum time spent making them (seconds)
+    connects: int
+    connect_failures: int
+    total_connect_time: float
+    max_connect_time: float
+
+    # Number of connections closed for failing a health check or being idle
+    health_check_failures: int
+    idle_evictions: int
+
+    # Number of times no connection became available before the timeout
+    checkout_timeouts: int
@@ -0,0 +1,49 @@
+import asyncio
+from concurrent.futures import Future, TimeoutError
+from threading import Lock, Thread
+from typing import Any, Coroutine, Optional
+
+# Shared event loop and the thread running it
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the event loop shared by all asynchronous device handling,
+    starting it in a background thread the first time it's needed
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            Thread(
+                target=loop.run_forever, name="homecontrol-event-loop", daemon=True
+            ).start()
+            _loop = loop
+        return _loop
+
+
+def submit(coroutine: Coroutine) -> Future:
+    """
+    Schedules a coroutine on the shared event loop and returns a future for
+    its result (may be called from any thread)
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, get_event_loop())
+
+
+def run(coroutine: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Runs a coroutine on the shared event loop and waits for its result (must
+    not be called from the event loop itself)
+
+    Raises:
+        TimeoutError: If the timeout is reached first (the coroutine is then
+                      cancelled)
+    """
+    future = submit(coroutine)
+    try:
+        return future.result(timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
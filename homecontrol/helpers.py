@@ -1,25 +1,45 @@
-import json
-from dataclasses import dataclass, fields
-from typing import Dict, List, Type
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple, Type
+
+
+@lru_cache(maxsize=None)
+def _get_init_field_names(class_type: Type) -> FrozenSet[str]:
+    """
+    Returns the names of the fields of a dataclass that can be passed to its
+    __init__
+    """
+    return frozenset(field.name for field in fields(class_type) if field.init)
+
+
+def _filter_init_args(field_set: FrozenSet[str], dictionary: Dict) -> Dict:
+    """
+    Returns the values in a dictionary that can be passed to a dataclass's
+    __init__ given the names of its init fields
+    """
+    if field_set.issuperset(dictionary):
+        return dictionary
+    return {k: v for k, v in dictionary.items() if k in field_set}
 
 
 def dataclass_from_dict(class_type: dataclass, dictionary: Dict):
     """
     Converts a dictionary of values into a particular dataclass type
     """
-    field_set = {f.name for f in fields(class_type) if f.init}
-    filtered_arg_dict = {k: v for k, v in dictionary.items() if k in field_set}
-    return class_type(**filtered_arg_dict)
+    return class_type(
+        **_filter_init_args(_get_init_field_names(class_type), dictionary)
+    )
 
 
 def dataclass_list_from_dict(class_type: dataclass, lst: List[Dict]):
     """
     Converts a list of dictionary of values into a list of a particular dataclass type
     """
-    classes = []
-    for dictionary in lst:
-        classes.append(dataclass_from_dict(class_type, dictionary))
-    return classes
+    field_set = _get_init_field_names(class_type)
+    return [
+        class_type(**_filter_init_args(field_set, dictionary)) for dictionary in lst
+    ]
 
 
 def dicts_to_list(class_type: Type, list_of_dicts: List[Dict]):
@@ -32,11 +52,74 @@ def dicts_to_list(class_type: Type, list_of_dicts: List[Dict]):
     return result
 
 
+# Types that can be serialised to JSON as they are
+_JSON_TYPES = (str, int, float, bool, type(None))
+
+
+@lru_cache(maxsize=None)
+def _get_field_names(class_type: Type) -> Optional[Tuple[str, ...]]:
+    """
+    Returns the names of the attributes to serialise for a type, or None if
+    they should just be taken from an object's __dict__
+    """
+    if is_dataclass(class_type):
+        return tuple(field.name for field in fields(class_type))
+
+    # Includes inherited __slots__ e.g. for HueAPIObject's
+    slots = tuple(
+        slot
+        for cls in reversed(class_type.__mro__)
+        for slot in getattr(cls, "__slots__", ())
+        if slot not in ("__dict__", "__weakref__")
+    )
+    return slots if slots else None
+
+
+# Returned by getattr when an attribute in __slots__ hasn't been assigned
+_UNASSIGNED = object()
+
+
+def get_attributes(obj) -> Optional[Dict]:
+    """
+    Returns the assigned attributes of an object (whether they are dataclass
+    fields or stored in a __dict__ or __slots__), or None if it has none
+    """
+    field_names = _get_field_names(type(obj))
+    if field_names is None:
+        return getattr(obj, "__dict__", None)
+    attributes = {}
+    for name in field_names:
+        value = getattr(obj, name, _UNASSIGNED)
+        if value is not _UNASSIGNED:
+            attributes[name] = value
+    return attributes
+
+
 def object_to_dict(obj):
     """
-    Converts an object to a dictionary
+    Converts an object to a dictionary (or any dataclasses, enums and other
+    objects within lists and dictionaries) so that it only contains values
+    that can be serialised to JSON
     """
-    return json.loads(json.dumps(obj, default=lambda o: o.__dict__))
+    obj_type = type(obj)
+    if obj_type in _JSON_TYPES:
+        return obj
+    if obj_type is list or obj_type is tuple:
+        return [object_to_dict(value) for value in obj]
+    if obj_type is dict:
+        return {key: object_to_dict(value) for key, value in obj.items()}
+    if isinstance(obj, Enum):
+        return object_to_dict(obj.value)
+    if isinstance(obj, _JSON_TYPES):
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return [object_to_dict(value) for value in obj]
+
+    attributes = get_attributes(obj)
+    if attributes is None:
+        # Leave anything else (e.g. datetimes) to the JSON encoder
+        return obj
+    return {key: object_to_dict(value) for key, value in attributes.items()}
 
 
 class ResponseStatus:
@@ -46,9 +129,12 @@ class ResponseStatus:
 
     OK = 200
     CREATED = 201
+    ACCEPTED = 202
     BAD_REQUEST = 400
     UNAUTHORIZED = 401
     NOT_FOUND = 404
+    CONFLICT = 409
+    BAD_GATEWAY = 502
 
 
 class SubscriptableClass:
@@ -0,0 +1,174 @@
+from threading import RLock
+from typing import Dict, List, Optional, Tuple, Type
+
+from homecontrol.hue.api.structs import (
+    DeviceGet,
+    GroupedLightGet,
+    LightGet,
+    RoomGet,
+    SceneGet,
+)
+
+
+class HueResourceCache:
+    """
+    Stores a local copy of resources on a hue bridge so that reads can be
+    served without contacting it
+
+    Resources are stored as the raw dictionaries returned by the Hue API and
+    are only decoded when read (decoded objects are then kept until the
+    resource changes)
+    """
+
+    # Prefix of the endpoints resources are obtained from
+    RESOURCE_ENDPOINT = "/clip/v2/resource/"
+
+    # Resource types that are cached and the types they are decoded into
+    RESOURCE_TYPES: Dict[str, Type] = {
+        "light": LightGet,
+        "grouped_light": GroupedLightGet,
+        "room": RoomGet,
+        "scene": SceneGet,
+        "device": DeviceGet,
+    }
+
+    # Whether the cache currently reflects the state of the bridge (reads
+    # should not be served from it otherwise)
+    _synced: bool
+
+    # Raw resources, keys are the resource type and then the resource id
+    _resources: Dict[str, Dict[str, Dict]]
+
+    # Decoded resources, keys are the resource type and the resource id
+    _decoded: Dict[Tuple[str, str], object]
+
+    _lock: RLock
+
+    def __init__(self) -> None:
+        self._synced = False
+        self._resources = {rtype: {} for rtype in self.RESOURCE_TYPES}
+        self._decoded = {}
+        self._lock = RLock()
+
+    @property
+    def synced(self) -> bool:
+        """
+        Returns whether the cache is currently in sync with the bridge
+        """
+        return self._synced
+
+    def invalidate(self):
+        """
+        Marks the cache as out of sync (e.g. after losing the event stream) so
+        reads are no longer served from it until the next resync
+        """
+        with self._lock:
+            self._synced = False
+
+    def resync(self, resources: Dict[str, List[Dict]]):
+        """
+        Replaces the entire contents of the cache and marks it as in sync
+
+        Args:
+            resources (Dict[str, List[Dict]]): Keys are resource types and the
+                            values the full list of resources of that type as
+                            returned by the bridge
+        """
+        with self._lock:
+            for rtype in self.RESOURCE_TYPES:
+                self._resources[rtype] = {
+                    resource["id"]: resource for resource in resources.get(rtype, [])
+                }
+            self._decoded.clear()
+            self._synced = True
+
+    @staticmethod
+    def _merge(target: Dict, changes: Dict):
+        """
+        Recursively merges a dictionary of changes into a target dictionary
+        """
+        for key, value in changes.items():
+            if isinstance(value, dict) and isinstance(target.get(key), dict):
+                HueResourceCache._merge(target[key], value)
+            else:
+                target[key] = value
+
+    def apply_event(self, event: Dict):
+        """
+        Applies an event from the bridge's event stream to the cache
+
+        Args:
+            event (Dict): Event with a 'type' of either 'add', 'update' or
+                          'delete' and 'data' containing the resources it
+                          applies to
+        """
+        event_type = event.get("type")
+        with self._lock:
+            for resource in event.get("data", []):
+                rtype = resource.get("type")
+                if rtype not in self._resources or "id" not in resource:
+                    continue
+                resources = self._resources[rtype]
+                identifier = resource["id"]
+
+                if event_type == "add":
+                    resources[identifier] = resource
+                elif event_type == "update":
+                    if identifier in resources:
+                        self._merge(resources[identifier], resource)
+                    else:
+                        # Don't have a full copy of this resource, so can't
+                        # safely serve it until the next resync
+                        continue
+                elif event_type == "delete":
+                    resources.pop(identifier, None)
+                else:
+                    continue
+                self._decoded.pop((rtype, identifier), None)
+
+    def _get_decoded(self, rtype: str, identifier: str):
+        """
+        Returns a decoded resource (assumes the lock is held and that the
+        resource exists)
+        """
+        key = (rtype, identifier)
+        decoded = self._decoded.get(key)
+        if decoded is None:
+            decoded = self.RESOURCE_TYPES[rtype](self._resources[rtype][identifier])
+            self._decoded[key] = decoded
+        return decoded
+
+    def get_resources(self, endpoint: str, class_type: Type) -> Optional[List]:
+        """
+        Returns the decoded resources that would be returned from a GET
+        request to an endpoint, or None if they can't be served from the
+        cache
+
+        Args:
+            endpoint (str): Endpoint e.g. /clip/v2/resource/light/<id>
+            class_type (Type): Type the resources should be decoded into
+        """
+        if not self._synced or not endpoint.startswith(self.RESOURCE_ENDPOINT):
+            return None
+
+        path = endpoint[len(self.RESOURCE_ENDPOINT) :].strip("/").split("/")
+        rtype = path[0]
+        if (
+            len(path) > 2
+            or rtype not in self.RESOURCE_TYPES
+            or self.RESOURCE_TYPES[rtype] is not class_type
+        ):
+            return None
+
+        with self._lock:
+            if not self._synced:
+                return None
+            if len(path) == 1:
+                return [
+                    self._get_decoded(rtype, identifier)
+                    for identifier in self._resources[rtype]
+                ]
+            if path[1] in self._resources[rtype]:
+                return [self._get_decoded(rtype, path[1])]
+            # Let the bridge decide what to return for unknown resources
+            return None
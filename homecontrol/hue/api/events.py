@@ -0,0 +1,180 @@
+import json
+import logging
+from threading import Event, Thread
+from typing import Dict, Iterator, List, Optional
+
+import requests
+
+from homecontrol.helpers import ResponseStatus
+from homecontrol.hue.api.cache import HueResourceCache
+from homecontrol.hue.api.exceptions import HueAPIError
+from homecontrol.hue.api.session import HueBridgeSession
+from homecontrol.hue.structs import HueBridgeAuthConfig, HueBridgeConnectionInfo
+
+logger = logging.getLogger(__name__)
+
+
+class HueEventStream:
+    """
+    Subscribes to the event stream of a hue bridge in a background thread
+    and applies the events to a HueResourceCache
+
+    The cache is fully resynced from the bridge every time the stream is
+    (re)connected as any events sent while disconnected are lost
+    """
+
+    # Endpoint for the server-sent events
+    EVENT_STREAM_ENDPOINT = "/eventstream/clip/v2"
+
+    # Time to wait before attempting to reconnect (seconds)
+    RECONNECT_DELAY = 5
+
+    # Timeouts for connecting and for waiting for data on the stream (seconds)
+    CONNECT_TIMEOUT = 10
+    READ_TIMEOUT = 300
+
+    _session: HueBridgeSession
+    _cache: HueResourceCache
+    _thread: Optional[Thread]
+    _response: Optional[requests.Response]
+    _stop_event: Event
+
+    def __init__(
+        self,
+        connection_info: HueBridgeConnectionInfo,
+        ca_cert: str,
+        auth_config: HueBridgeAuthConfig,
+        cache: HueResourceCache,
+    ) -> None:
+        """
+        Args:
+            connection_info (HueBridgeConnectionInfo):
+                           HueBridgeConnectionInfo instance for the bridge
+            ca_cert (str): Path to the CA certificate for authenticating with
+                           the bridge
+            auth_config (HueBridgeAuthConfig): Authentication info for the
+                           bridge
+            cache (HueResourceCache): Cache to keep up to date
+        """
+        # Stream is long lived, so use a dedicated session rather than
+        # holding a connection from the bridge's pool (needs one connection for
+        # the stream itself and another for resyncing)
+        self._session = HueBridgeSession(
+            connection_info=connection_info,
+            ca_cert=ca_cert,
+            auth_config=auth_config,
+            pool_size=2,
+        )
+        self._cache = cache
+        self._thread = None
+        self._response = None
+        self._stop_event = Event()
+
+    def start(self):
+        """
+        Starts listening to the event stream in a background thread
+        """
+        if self._thread is None:
+            self._stop_event.clear()
+            self._session.start()
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stops listening to the event stream
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            # Closing the stream should interrupt any blocking read, but the
+            # thread is a daemon so don't wait on it indefinitely
+            response = self._response
+            if response is not None:
+                response.close()
+            self._thread.join(timeout=self.CONNECT_TIMEOUT)
+            self._thread = None
+            self._session.close()
+        self._cache.invalidate()
+
+    def _resync(self):
+        """
+        Fetches every cached resource type from the bridge and replaces the
+        contents of the cache
+        """
+        resources = {}
+        for rtype in HueResourceCache.RESOURCE_TYPES:
+            response = self._session.get(f"{HueResourceCache.RESOURCE_ENDPOINT}{rtype}")
+            if response.status_code != ResponseStatus.OK:
+                raise HueAPIError(
+                    f"An error occurred trying to get resources of type '{rtype}'. "
+                    f"Status code: {response.status_code}. Content {response.content}."
+                )
+            resources[rtype] = response.json()["data"]
+        self._cache.resync(resources)
+
+    @staticmethod
+    def parse_events(lines: Iterator[str]) -> Iterator[List[Dict]]:
+        """
+        Parses lines of server-sent events, yielding the decoded data of each
+        message (a list of events from the bridge)
+        """
+        data_lines = []
+        for line in lines:
+            if not line:
+                # Blank line marks the end of a message
+                if data_lines:
+                    yield json.loads("\n".join(data_lines))
+                    data_lines = []
+            elif line.startswith("data:"):
+                data_lines.append(line[len("data:") :].lstrip())
+            # Ignore comments and other fields e.g. 'id:'
+
+    def _listen(self):
+        """
+        Connects to the event stream and applies events until it disconnects
+        """
+        with self._session.get(
+            self.EVENT_STREAM_ENDPOINT,
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUT),
+        ) as response:
+            self._response = response
+            if response.status_code != ResponseStatus.OK:
+                raise HueAPIError(
+                    "An error occurred trying to connect to the event stream. "
+                    f"Status code: {response.status_code}."
+                )
+
+            # Events are only missed while not connected, so safe to resync
+            # now (any sent in the meantime will be applied afterwards)
+            self._resync()
+
+            # Event streams don't specify a charset, so requests would
+            # otherwise decode them as ISO-8859-1 (the bridge sends UTF-8)
+            response.encoding = "utf-8"
+            for events in self.parse_events(
+                response.iter_lines(chunk_size=None, decode_unicode=True)
+            ):
+                for event in events:
+                    self._cache.apply_event(event)
+
+    def _run(self):
+        """
+        Keeps the cache up to date until stopped, reconnecting and resyncing
+        whenever the stream is lost
+        """
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+            except Exception:
+                if not self._stop_event.is_set():
+                    logger.exception("Lost connection to the hue event stream")
+            self._response = None
+            self._cache.invalidate()
+
+            if self._stop_event.wait(self.RECONNECT_DELAY):
+                break
+            # May have been closed while stopping, or left in a bad state
+            self._session.close()
+            self._session.start()
@@ -1,9 +1,12 @@
+from threading import Lock
 from typing import Any, List, Optional, Type
 
 import requests
 from requests_toolbelt.adapters import host_header_ssl
+from urllib3.util.retry import Retry
 
 from homecontrol.helpers import ResponseStatus, dicts_to_list, object_to_dict
+from homecontrol.hue.api.cache import HueResourceCache
 from homecontrol.hue.api.exceptions import HueAPIError
 from homecontrol.hue.structs import HueBridgeAuthConfig, HueBridgeConnectionInfo
 from homecontrol.session import SessionWrapper
@@ -12,31 +15,62 @@ from homecontrol.session import SessionWrapper
 class HueBridgeSession(SessionWrapper):
     """
     For handling a session for communicating with a hue bridge
+
+    The underlying connections are kept alive and pooled so that a single
+    instance can be shared between threads for the lifetime of a bridge
     """
 
+    # Default maximum number of connections kept alive to the bridge
+    DEFAULT_POOL_SIZE = 4
+
+    # Number of times to retry establishing a connection before failing
+    CONNECT_RETRIES = 2
+
     _connection_info: HueBridgeConnectionInfo
     _ca_cert: str
     _auth_config: Optional[HueBridgeAuthConfig]
+    _pool_size: int
     _session: requests.Session
+    _restart_lock: Lock
+
+    # Cache to serve resources from when available
+    _cache: Optional[HueResourceCache]
 
     def __init__(
         self,
         connection_info: HueBridgeConnectionInfo,
         ca_cert: str,
         auth_config: Optional[HueBridgeAuthConfig] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
     ) -> None:
         super().__init__(f"https://{connection_info.ip_address}:{connection_info.port}")
 
         self._connection_info = connection_info
         self._ca_cert = ca_cert
         self._auth_config = auth_config
+        self._pool_size = pool_size
+        self._restart_lock = Lock()
+        self._cache = None
 
     def _handle_start(self):
         """
         Sets up a session
         """
         # Solve SSLCertVerificationError due to difference in hostname
-        self._session.mount("https://", host_header_ssl.HostHeaderSSLAdapter())
+        self._session.mount(
+            "https://",
+            host_header_ssl.HostHeaderSSLAdapter(
+                pool_connections=1,
+                pool_maxsize=self._pool_size,
+                max_retries=Retry(
+                    total=self.CONNECT_RETRIES,
+                    connect=self.CONNECT_RETRIES,
+                    read=0,
+                    status=0,
+                    backoff_factor=0.1,
+                ),
+            ),
+        )
         self._session.headers.update({"Host": f"{self._connection_info.identifier}"})
         # Add actual auth key if have it
         if self._auth_config is not None:
@@ -47,10 +81,44 @@ class HueBridgeSession(SessionWrapper):
 
         return self
 
+    def restart(self, old_session: requests.Session):
+        """
+        Replaces the underlying session (dropping any pooled connections) unless
+        another thread has already done so since old_session was in use
+        """
+        with self._restart_lock:
+            if self._session is old_session:
+                old_session.close()
+                self.start()
+
+    def request(self, method: str, endpoint: str, **kwargs):
+        """
+        Returns the result of a request, reconnecting and trying once more if
+        the pooled connection to the bridge has failed
+        """
+        session = self._session
+        try:
+            return super().request(method, endpoint, **kwargs)
+        except requests.exceptions.ConnectionError:
+            self.restart(session)
+            return super().request(method, endpoint, **kwargs)
+
+    def set_cache(self, cache: Optional[HueResourceCache]):
+        """
+        Assigns a cache that resources will be returned from (when it is in
+        sync with the bridge) instead of requesting them
+        """
+        self._cache = cache
+
     def get_resource(self, endpoint: str, class_type: Type, error_message: str) -> List:
         """
         Returns data from an endpoint
         """
+        if self._cache is not None:
+            resources = self._cache.get_resources(endpoint, class_type)
+            if resources is not None:
+                return resources
+
         response = self.get(endpoint)
 
         if response.status_code != ResponseStatus.OK:
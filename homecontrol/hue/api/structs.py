@@ -1,29 +1,82 @@
-from typing import Dict, List, get_args, get_origin, get_type_hints
+from typing import Any, Callable, Dict, List, Type, get_args, get_origin, get_type_hints
 
-from homecontrol.helpers import dicts_to_list
+# Decoders for the fields of each HueAPIObject type, resolved from their type
+# hints when the first instance of a type is created
+_FIELD_PLANS: Dict[Type, Dict[str, Callable[[Any], Any]]] = {}
 
 
-class HueAPIObject:
+def _get_value_decoder(value_type: Type) -> Callable[[Any], Any]:
+    """
+    Returns a function that decodes a value from the Hue API into the given
+    type
+    """
+    if get_origin(value_type) == list:
+        item_decoder = _get_value_decoder(get_args(value_type)[0])
+        return lambda values: [item_decoder(value) for value in values]
+    if isinstance(value_type, type) and issubclass(value_type, HueAPIObject):
+        # Nested objects look up their own plan
+        return value_type
+
+    # Avoid conversion when the value is already the right type
+    return lambda value: value if type(value) is value_type else value_type(value)
+
+
+def _get_field_plan(class_type: Type) -> Dict[str, Callable[[Any], Any]]:
+    """
+    Returns the decoders for each field of a HueAPIObject type (computing
+    them if this is the first time they have been needed)
+    """
+    plan = _FIELD_PLANS.get(class_type)
+    if plan is None:
+        plan = {
+            key: _get_value_decoder(value_type)
+            for key, value_type in get_type_hints(class_type).items()
+        }
+        _FIELD_PLANS[class_type] = plan
+    return plan
+
+
+class HueAPIObjectMeta(type):
+    """
+    Metaclass giving each HueAPIObject type __slots__ for its annotated fields
+    so that instances don't each require a __dict__
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        if "__slots__" not in namespace:
+            inherited = {
+                slot
+                for base in bases
+                for cls in base.__mro__
+                for slot in getattr(cls, "__slots__", ())
+            }
+            namespace["__slots__"] = tuple(
+                key
+                for key in namespace.get("__annotations__", {})
+                if key not in inherited
+            )
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class HueAPIObject(metaclass=HueAPIObjectMeta):
     """
     Useful for creating class structures for the responses from
     the Hue API
+
+    Only the fields present in the dictionary an object was created from
+    are assigned
     """
 
     def __init__(self, dictionary: Dict):
-        types = get_type_hints(self)
+        plan = _get_field_plan(type(self))
         for key, value in dictionary.items():
             # Sometimes values are returned when with empty values and are not specified
             # in the API, so ignore them here
             # Note: This may cause things to go missing if structure is not correct
-            if key in types:
-                current_type = types[key]
-                if get_origin(current_type) == list:
-                    list_type = get_args(current_type)[0]
-                    setattr(self, key, dicts_to_list(list_type, dictionary[key]))
-                else:
-                    # Don't bother if value non-existent
-                    if value is not None:
-                        setattr(self, key, current_type(value))
+            decoder = plan.get(key)
+            # Don't bother if value non-existent
+            if decoder is not None and value is not None:
+                setattr(self, key, decoder(value))
 
 
 class ResourceIdentifierGet(HueAPIObject):
@@ -1,4 +1,5 @@
 from homecontrol.config import Config
+from homecontrol.hue.api.session import HueBridgeSession
 from homecontrol.hue.structs import HueBridgeAuthConfig, HueBridgeConnectionInfo
 
 
@@ -114,3 +115,17 @@ class HueConfig(Config):
         Returns the ca_cert parameter from the config
         """
         return self.data["ca_cert"]
+
+    def get_pool_size(self) -> int:
+        """
+        Returns the pool_size parameter from the config (the maximum number of
+        connections to keep alive to each bridge)
+        """
+        return self.data.get("pool_size", HueBridgeSession.DEFAULT_POOL_SIZE)
+
+    def is_event_stream_enabled(self) -> bool:
+        """
+        Returns the event_stream parameter from the config (whether to keep a
+        local cache of each bridge's resources using its event stream)
+        """
+        return self.data.get("event_stream", False)
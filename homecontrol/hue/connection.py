@@ -1,12 +1,9 @@
-from typing import Optional
-
 from homecontrol.hue.api.api import HueBridgeAPI
 from homecontrol.hue.api.session import HueBridgeSession
 from homecontrol.hue.grouped_light import GroupedLight
 from homecontrol.hue.light import Light
 from homecontrol.hue.room import Room
 from homecontrol.hue.scene import Scene
-from homecontrol.hue.structs import HueBridgeAuthConfig, HueBridgeConnectionInfo
 
 
 class HueBridgeConnection:
@@ -22,29 +19,15 @@ class HueBridgeConnection:
     grouped_light: GroupedLight
     scene: Scene
 
-    def __init__(
-        self,
-        connection_info: HueBridgeConnectionInfo,
-        ca_cert: str,
-        auth_config: Optional[HueBridgeAuthConfig] = None,
-    ) -> None:
+    def __init__(self, session: HueBridgeSession) -> None:
         """
         Args:
-            connection_info (HueBridgeConnectionInfo):
-                           HueBridgeConnectionInfo instance for the bridge
-            ca_cert (str): Path to the CA certificate for authenticating with
-                           the bridge
-            auth_config (Optional[HueBridgeAuthConfig]): Authentication info
-                           for the bridge (may be None if not registered yet)
+            session (HueBridgeSession): Started session for the bridge, this is
+                           owned by the bridge and so is left open on exit
         """
-        self._session = HueBridgeSession(
-            connection_info=connection_info,
-            ca_cert=ca_cert,
-            auth_config=auth_config,
-        )
+        self._session = session
 
     def __enter__(self):
-        self._session.start()
         self.api = HueBridgeAPI(self._session)
         self.room = Room(self.api)
         self.light = Light(self.api)
@@ -54,4 +37,4 @@ class HueBridgeConnection:
         return self
 
     def __exit__(self, exception_type, exception_value, traceback):
-        self._session.close()
+        pass
@@ -1,8 +1,12 @@
+from threading import Lock
 from typing import List, Optional
 
 import requests
 
 from homecontrol.exceptions import DeviceConnectionError
+from homecontrol.hue.api.cache import HueResourceCache
+from homecontrol.hue.api.events import HueEventStream
+from homecontrol.hue.api.session import HueBridgeSession
 from homecontrol.hue.connection import HueBridgeConnection
 from homecontrol.hue.structs import HueBridgeAuthConfig, HueBridgeConnectionInfo
 
@@ -18,30 +22,105 @@ class HueBridge:
     _ca_cert: str
     _connection_info: HueBridgeConnectionInfo
     _connection_auth: Optional[HueBridgeAuthConfig]
+    _pool_size: int
+
+    # Long lived session shared by all connections to this bridge (created
+    # when first needed)
+    _session: Optional[HueBridgeSession]
+    _session_lock: Lock
+
+    # Subscriber keeping a local cache of the bridge's resources up to date
+    # (only when started)
+    _event_stream: Optional[HueEventStream]
 
     def __init__(
         self,
         ca_cert: str,
         connection_info: HueBridgeConnectionInfo,
         connection_auth: Optional[HueBridgeAuthConfig] = None,
+        pool_size: int = HueBridgeSession.DEFAULT_POOL_SIZE,
     ) -> None:
         """
-        Creates the msmart device instance and authenticates it
+        Args:
+            ca_cert (str): Path to the CA certificate for authenticating with
+                           the bridge
+            connection_info (HueBridgeConnectionInfo):
+                           HueBridgeConnectionInfo instance for the bridge
+            connection_auth (Optional[HueBridgeAuthConfig]): Authentication info
+                           for the bridge (may be None if not registered yet)
+            pool_size (int): Maximum number of connections to keep alive to
+                           the bridge
         """
         self._ca_cert = ca_cert
         self._connection_info = connection_info
         self._connection_auth = connection_auth
+        self._pool_size = pool_size
+        self._session = None
+        self._session_lock = Lock()
+        self._event_stream = None
+
+    def _get_session(self) -> HueBridgeSession:
+        """
+        Returns the session for this bridge, starting it if necessary
+        """
+        with self._session_lock:
+            if self._session is None:
+                session = HueBridgeSession(
+                    connection_info=self._connection_info,
+                    ca_cert=self._ca_cert,
+                    auth_config=self._connection_auth,
+                    pool_size=self._pool_size,
+                )
+                session.start()
+                self._session = session
+            return self._session
 
     def start_session(self) -> HueBridgeConnection:
         """
         Returns a HueBridgeConnection instance for contacting the bridge
         e.g. 'with bridge.start_session() as session'
+
+        All connections share the same pooled session so repeated calls do not
+        require a new handshake with the bridge
         """
-        return HueBridgeConnection(
-            connection_info=self._connection_info,
-            ca_cert=self._ca_cert,
-            auth_config=self._connection_auth,
-        )
+        return HueBridgeConnection(session=self._get_session())
+
+    def start_event_stream(self):
+        """
+        Starts listening to the bridge's event stream in the background so
+        that resources can be read from a local cache instead of requesting
+        them from the bridge each time
+        """
+        if self._event_stream is None:
+            cache = HueResourceCache()
+            self._event_stream = HueEventStream(
+                connection_info=self._connection_info,
+                ca_cert=self._ca_cert,
+                auth_config=self._connection_auth,
+                cache=cache,
+            )
+            self._get_session().set_cache(cache)
+            self._event_stream.start()
+
+    def stop_event_stream(self):
+        """
+        Stops listening to the bridge's event stream (if it was started) so
+        all resources are requested from the bridge again
+        """
+        if self._event_stream is not None:
+            self._get_session().set_cache(None)
+            self._event_stream.stop()
+            self._event_stream = None
+
+    def close(self):
+        """
+        Closes the session to this bridge (if one was started)
+        """
+        self.stop_event_stream()
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
 
     @staticmethod
     def discover() -> List[HueBridgeConnectionInfo]:
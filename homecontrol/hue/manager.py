@@ -13,13 +13,37 @@ class HueManager:
     """
 
     _config: HueConfig
-    _loaded_bridges: Dict[str, HueBridge] = {}
+    _loaded_bridges: Dict[str, HueBridge]
 
     def __init__(self) -> None:
+        """
+        Loads the config (start() should be called before using any bridges)
+        """
         self._config = HueConfig()
+        self._loaded_bridges = {}
+
+    def start(self) -> "HueManager":
+        """
+        Loads all registered bridges (if not already loaded)
+        """
+        if not self._loaded_bridges:
+            self.load_bridges()
+        return self
+
+    def close(self):
+        """
+        Closes the sessions and event streams of all loaded bridges and
+        unloads them
+        """
+        for bridge in self._loaded_bridges.values():
+            bridge.close()
+        self._loaded_bridges.clear()
+
+    def __enter__(self) -> "HueManager":
+        return self.start()
 
-        # Load all registered bridges immediately
-        self.load_bridges()
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def register_bridge(self, name: str, connection_info: HueBridgeConnectionInfo):
         """
@@ -89,6 +113,7 @@ class HueManager:
                 ca_cert=self._config.get_ca_cert(),
                 connection_info=connection_info,
                 connection_auth=auth_config,
+                pool_size=self._config.get_pool_size(),
             )
             self._loaded_bridges.update({name: bridge})
 
@@ -103,6 +128,15 @@ class HueManager:
             for name in bridges.keys():
                 self._load_bridge(name)
 
+    def start_event_streams(self):
+        """
+        Starts listening to the event streams of all loaded bridges if enabled
+        in the config
+        """
+        if self._config.is_event_stream_enabled():
+            for bridge in self._loaded_bridges.values():
+                bridge.start_event_stream()
+
     def get_bridge(self, name: str) -> HueBridge:
         """
         Returns a loaded ACDevice
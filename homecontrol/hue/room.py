@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 
 from homecontrol.hue.api.api import HueBridgeAPI
 from homecontrol.hue.structs import HueRoom
@@ -14,12 +14,26 @@ class Room:
     def __init__(self, api: HueBridgeAPI) -> None:
         self._api = api
 
+    def _get_device_lights(self) -> Dict[str, List[str]]:
+        """
+        Returns a dictionary where keys represent device ids and the values
+        the ids of the light services they provide (obtained in a single
+        request rather than one per device)
+        """
+        device_lights = {}
+        for device in self._api.device.get_devices():
+            device_lights[device.id] = [
+                service.rid for service in device.services if service.rtype == "light"
+            ]
+        return device_lights
+
     def get_rooms(self) -> List[HueRoom]:
         """
         Returns a dictionary of rooms where keys represent the room name
         and the values their id
         """
         rooms = self._api.room.get_rooms()
+        device_lights = self._get_device_lights()
         # Convert to the room structure we actually want to return
         room_list = []
         # Data should be a list of rooms
@@ -32,11 +46,7 @@ class Room:
             lights = []
             for child in room.children:
                 if child.rtype == "device":
-                    # Query the device
-                    device_info = self._api.device.get_device(child.rid)
-                    for service in device_info.services:
-                        if service.rtype == "light":
-                            lights.append(service.rid)
+                    lights.extend(device_lights.get(child.rid, []))
 
             room_list.append(
                 HueRoom(
@@ -12,6 +12,7 @@ from homecontrol.api.config import APIConfig
 from homecontrol.api.consts import ICON_NAMES
 from homecontrol.api.database.client import APIDatabaseClient
 from homecontrol.api.structs import RoomState
+from homecontrol.broadlink.manager import BroadlinkManager
 from homecontrol.hue.hue import HueBridge
 from homecontrol.hue.manager import HueManager
 
@@ -46,7 +47,30 @@ class Command_InitDB(Command):
         print("Initialising the homecontrol database...")
         database_client = APIDatabaseClient()
         with database_client.connect() as conn:
-            conn.init_db()
+            migrations = conn.init_db()
+        for migration in migrations:
+            print(f"Applied migration {migration.version}: {migration.description}")
+        print("Done!")
+
+
+class Command_MigrateIRCommands(Command):
+    def __init__(self) -> None:
+        super().__init__(
+            name="migrate-ir-commands",
+            help_str="Moves IR commands from broadlink.json into the command store",
+        )
+
+    def add_arguments(self, parser):
+        pass
+
+    def run(self, args: argparse.Namespace):
+        print("Moving IR commands into the command store...")
+        broadlink_manager = BroadlinkManager()
+        try:
+            count = broadlink_manager.migrate_legacy_ir_commands()
+        finally:
+            broadlink_manager.close()
+        print(f"Moved {count} IR commands")
         print("Done!")
 
 
@@ -124,25 +148,25 @@ class Command_Add_RoomState(Command):
 
     def run(self, args: argparse.Namespace):
         database_client = APIDatabaseClient()
-        aircon_manager = ACManager()
 
         # Save AC state if requested
         ac_state_id = None
         if args.ac_device_name:
-            ac_state_id = save_state(
-                database_client,
-                args.name,
-                aircon_manager.get_device(args.ac_device_name),
-            )
+            with ACManager() as aircon_manager:
+                ac_state_id = save_state(
+                    database_client,
+                    args.name,
+                    aircon_manager.get_device(args.ac_device_name),
+                )
 
         # Find the scene ID if requested
         hue_scene_id = None
         if args.hue_scene_name:
-            hue_manager = HueManager()
-            hue_bridge: HueBridge = hue_manager.get_bridge("Home")
-            with hue_bridge.start_session() as conn:
-                rooms = conn.room.get_rooms()
-                scenes = conn.scene.get_scenes()
+            with HueManager() as hue_manager:
+                hue_bridge: HueBridge = hue_manager.get_bridge("Home")
+                with hue_bridge.start_session() as conn:
+                    rooms = conn.room.get_rooms()
+                    scenes = conn.scene.get_scenes()
             # Select room with the right name
             selected_room = None
             for room in rooms:
@@ -198,7 +222,9 @@ def main():
     """Entrypoint"""
 
     parser = argparse.ArgumentParser(prog="homecontrol-management")
-    add_subcommands(parser, [Command_InitDB(), Command_Add()])
+    add_subcommands(
+        parser, [Command_InitDB(), Command_MigrateIRCommands(), Command_Add()]
+    )
 
     # Run
     args = parser.parse_args()
@@ -63,7 +63,8 @@ class Monitor:
         """
 
         with self.client.start_session() as hc_conn:
-            loaded_devices = hc_conn.aircon.list_devices()
+            # Obtain the states of every device at once
+            results = hc_conn.aircon.get_devices_states()
 
             # Obtain current date and time
             timestamp = datetime.now().strftime(Database.DATETIME_FORMAT)
@@ -73,8 +74,11 @@ class Monitor:
                 # Outdoor temp (for now will only take first one)
                 outdoor_temp = None
 
-                for loaded_device in loaded_devices:
-                    state = hc_conn.aircon.get_device(loaded_device)
+                for loaded_device, result in results.items():
+                    # Skip any devices that are currently unavailable
+                    if result.state is None:
+                        continue
+                    state = result.state
 
                     db_conn.insert_values(
                         f"{Database.clean_string(loaded_device)}_temps",
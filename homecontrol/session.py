@@ -35,20 +35,32 @@ class SessionWrapper(ABC):
         """
         self._session.close()
 
+    def request(self, method: str, endpoint: str, **kwargs):
+        """
+        Returns the result of a request
+        """
+        return self._session.request(method, f"{self._base_url}{endpoint}", **kwargs)
+
     def get(self, endpoint: str, **kwargs):
         """
         Returns the result of a get request
         """
-        return self._session.get(f"{self._base_url}{endpoint}", **kwargs)
+        return self.request("GET", endpoint, **kwargs)
 
     def put(self, endpoint: str, **kwargs):
         """
         Returns the result of a put request
         """
-        return self._session.put(f"{self._base_url}{endpoint}", **kwargs)
+        return self.request("PUT", endpoint, **kwargs)
+
+    def patch(self, endpoint: str, **kwargs):
+        """
+        Returns the result of a patch request
+        """
+        return self.request("PATCH", endpoint, **kwargs)
 
     def post(self, endpoint: str, **kwargs):
         """
         Returns the result of a post request
         """
-        return self._session.post(f"{self._base_url}{endpoint}", **kwargs)
+        return self.request("POST", endpoint, **kwargs)
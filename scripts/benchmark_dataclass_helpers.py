@@ -0,0 +1,115 @@
+"""
+Compares the time taken to decode lists of API responses into dataclasses
+using dataclass_list_from_dict against the previous implementation (which
+looked up the fields of the dataclass for every dictionary)
+
+Usage:
+    python scripts/benchmark_dataclass_helpers.py
+"""
+
+import timeit
+from dataclasses import dataclass, fields
+from typing import Dict, List
+
+from homecontrol.aircon.structs import ACState
+from homecontrol.api.monitoring import TempDataPoint
+from homecontrol.api.structs import RoomState
+from homecontrol.helpers import dataclass_list_from_dict
+
+REPEATS = 5
+
+
+def legacy_dataclass_from_dict(class_type: dataclass, dictionary: Dict):
+    """
+    Converts a dictionary in the same way dataclass_from_dict used to
+    """
+    field_set = {f.name for f in fields(class_type) if f.init}
+    filtered_arg_dict = {k: v for k, v in dictionary.items() if k in field_set}
+    return class_type(**filtered_arg_dict)
+
+
+def legacy_dataclass_list_from_dict(class_type: dataclass, lst: List[Dict]):
+    """
+    Converts a list of dictionaries in the same way dataclass_list_from_dict
+    used to
+    """
+    classes = []
+    for dictionary in lst:
+        classes.append(legacy_dataclass_from_dict(class_type, dictionary))
+    return classes
+
+
+def example_lists() -> Dict[str, tuple]:
+    """
+    Returns examples of lists of dictionaries returned by the API along with
+    the dataclass they are decoded into
+    """
+    temps = [
+        {"timestamp": f"2023-01-01 00:{i // 60 % 60:02}:{i % 60:02}", "temp": 20.5}
+        for i in range(10000)
+    ]
+    room_states = [
+        {
+            "state_id": f"state-{i}",
+            "name": f"State {i}",
+            "room_name": "Room",
+            "icon": "bed",
+            "ac_device_name": "Room",
+            "ac_state_id": f"ac-state-{i}",
+            "hue_scene_id": f"scene-{i}",
+            "broadlink_device_name": "Blaster",
+            "broadlink_actions": ["tv_power"],
+        }
+        for i in range(100)
+    ]
+    ac_states = [
+        {
+            "power": True,
+            "prompt_tone": False,
+            "target": 21,
+            "mode": 2,
+            "fan": 102,
+            "swing": 0,
+            "eco": False,
+            "turbo": False,
+            "fahrenheit": False,
+            "indoor": 22.5,
+            "outdoor": 14.0,
+            # Extra keys (e.g. from the database) that need filtering
+            "uuid": f"{i}",
+        }
+        for i in range(100)
+    ]
+    return {
+        "TempDataPoint": (TempDataPoint, temps),
+        "RoomState": (RoomState, room_states),
+        "ACState": (ACState, ac_states),
+    }
+
+
+def main():
+    print(f"{'type':<15}{'count':>8}{'legacy (ms)':>14}{'cached (ms)':>14}")
+    for name, (class_type, lst) in example_lists().items():
+        number = max(1, 20000 // len(lst))
+        legacy = min(
+            timeit.repeat(
+                lambda: legacy_dataclass_list_from_dict(class_type, lst),
+                number=number,
+                repeat=REPEATS,
+            )
+        )
+        cached = min(
+            timeit.repeat(
+                lambda: dataclass_list_from_dict(class_type, lst),
+                number=number,
+                repeat=REPEATS,
+            )
+        )
+        print(
+            f"{name:<15}{len(lst):>8}"
+            f"{legacy / number * 1000:>14.3f}{cached / number * 1000:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Compares the time taken to decode Hue API responses using the cached field
+plans of HueAPIObject against the previous implementation (which resolved
+type hints for every object created and stored attributes in a per-instance
+__dict__), along with the memory used by the decoded objects
+
+Usage:
+    python scripts/benchmark_hue_decoding.py [RESPONSE_JSON ...]
+
+Each RESPONSE_JSON should be a response recorded from a bridge e.g.
+'curl -k -H "hue-application-key: <key>" https://<ip>/clip/v2/resource/scene'.
+When none are given a synthetic payload resembling a large bridge is used.
+"""
+
+import gc
+import json
+import resource
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from typing import Dict, List, Type, get_args, get_origin, get_type_hints
+
+from homecontrol.hue.api.structs import (
+    DeviceGet,
+    GroupedLightGet,
+    HueAPIObject,
+    LightGet,
+    RoomGet,
+    SceneGet,
+)
+
+RESOURCE_TYPES: Dict[str, Type] = {
+    "light": LightGet,
+    "grouped_light": GroupedLightGet,
+    "room": RoomGet,
+    "scene": SceneGet,
+    "device": DeviceGet,
+}
+
+REPEATS = 5
+
+# Number of copies of the payload to decode when measuring memory (so the
+# result isn't dominated by the interpreter itself)
+MEMORY_COPIES = 20
+
+
+class LegacyObject:
+    """
+    Stands in for HueAPIObject instances before they used __slots__
+    """
+
+
+def legacy_decode(class_type: Type, dictionary: Dict):
+    """
+    Decodes a dictionary in the same way HueAPIObject.__init__ used to
+    """
+    obj = LegacyObject()
+    types = get_type_hints(class_type)
+    for key, value in dictionary.items():
+        if key in types:
+            current_type = types[key]
+            if get_origin(current_type) == list:
+                list_type = get_args(current_type)[0]
+                setattr(obj, key, [legacy_convert(list_type, item) for item in value])
+            elif value is not None:
+                setattr(obj, key, legacy_convert(current_type, value))
+    return obj
+
+
+def legacy_convert(value_type: Type, value):
+    if issubclass(value_type, HueAPIObject):
+        return legacy_decode(value_type, value)
+    return value_type(value)
+
+
+def resource_identifier(rid: str, rtype: str) -> Dict:
+    return {"rid": rid, "rtype": rtype}
+
+
+def synthetic_payload(lights: int = 40, scenes: int = 60) -> Dict[str, List[Dict]]:
+    """
+    Returns resources similar to those returned by a bridge with the given
+    number of lights and scenes
+    """
+    light_resources = []
+    device_resources = []
+    for i in range(lights):
+        light_resources.append(
+            {
+                "id": f"light-{i}",
+                "id_v1": f"/lights/{i}",
+                "type": "light",
+                "owner": resource_identifier(f"device-{i}", "device"),
+                "metadata": {"archetype": "sultan_bulb", "name": f"Light {i}"},
+                "on": {"on": i % 2 == 0},
+                "dimming": {"brightness": 50.0, "min_dim_level": 0.2},
+                "color_temperature": {
+                    "mirek": 366,
+                    "mirek_valid": True,
+                    "mirek_schema": {"mirek_minimum": 153, "mirek_maximum": 500},
+                },
+                "color": {
+                    "xy": {"x": 0.4573, "y": 0.41},
+                    "gamut": {
+                        "red": {"x": 0.6915, "y": 0.3083},
+                        "green": {"x": 0.17, "y": 0.7},
+                        "blue": {"x": 0.1532, "y": 0.0475},
+                    },
+                    "gamut_type": "C",
+                },
+                "dynamics": {
+                    "status": "none",
+                    "status_values": ["none", "dynamic_palette"],
+                    "speed": 0.0,
+                    "speed_valid": False,
+                },
+                "alert": {"action_values": ["breathe"]},
+                "mode": "normal",
+                "effects": {
+                    "effect": "no_effect",
+                    "status_values": ["no_effect", "candle", "fire"],
+                    "status": "no_effect",
+                    "effect_values": ["no_effect", "candle", "fire"],
+                },
+            }
+        )
+        device_resources.append(
+            {
+                "id": f"device-{i}",
+                "id_v1": f"/lights/{i}",
+                "type": "device",
+                "product_data": {
+                    "model_id": "LCA001",
+                    "manufacturer_name": "Signify Netherlands B.V.",
+                    "product_name": "Hue color lamp",
+                    "product_archetype": "sultan_bulb",
+                    "certified": True,
+                    "software_version": "1.104.2",
+                    "hardware_platform_type": "100b-112",
+                },
+                "metadata": {"archetype": "sultan_bulb", "name": f"Light {i}"},
+                "services": [
+                    resource_identifier(f"light-{i}", "light"),
+                    resource_identifier(f"zigbee-{i}", "zigbee_connectivity"),
+                    resource_identifier(f"entertainment-{i}", "entertainment"),
+                ],
+            }
+        )
+
+    scene_resources = []
+    for i in range(scenes):
+        scene_resources.append(
+            {
+                "id": f"scene-{i}",
+                "id_v1": f"/scenes/{i}",
+                "type": "scene",
+                "metadata": {
+                    "name": f"Scene {i}",
+                    "image": resource_identifier(f"image-{i}", "public_image"),
+                },
+                "group": resource_identifier(f"room-{i % 8}", "room"),
+                "actions": [
+                    {
+                        "target": resource_identifier(f"light-{j}", "light"),
+                        "action": {
+                            "on": {"on": True},
+                            "dimming": {"brightness": 80.0},
+                            "color": {"xy": {"x": 0.3, "y": 0.3}},
+                        },
+                    }
+                    for j in range(10)
+                ],
+                "palette": {
+                    "color": [
+                        {
+                            "color": {"xy": {"x": 0.5, "y": 0.4}},
+                            "dimming": {"brightness": 70.0},
+                        }
+                        for _ in range(5)
+                    ],
+                    "dimming": [],
+                    "color_temperature": [
+                        {
+                            "color_temperature": {"mirek": 300},
+                            "dimming": {"brightness": 70.0},
+                        }
+                    ],
+                },
+                "speed": 0.6,
+                "auto_dynamic": False,
+            }
+        )
+
+    room_resources = [
+        {
+            "id": f"room-{i}",
+            "id_v1": f"/groups/{i}",
+            "type": "room",
+            "metadata": {"archetype": "living_room", "name": f"Room {i}"},
+            "services": [resource_identifier(f"grouped-light-{i}", "grouped_light")],
+            "children": [
+                resource_identifier(f"device-{j}", "device")
+                for j in range(i, lights, 8)
+            ],
+        }
+        for i in range(8)
+    ]
+
+    return {
+        "light": light_resources,
+        "device": device_resources,
+        "scene": scene_resources,
+        "room": room_resources,
+    }
+
+
+def load_payloads(paths: List[str]) -> Dict[str, List[Dict]]:
+    """
+    Loads recorded responses grouping their resources by type
+    """
+    payloads = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as response_file:
+            for resource in json.load(response_file)["data"]:
+                payloads.setdefault(resource["type"], []).append(resource)
+    return payloads
+
+
+def decode_all(payloads: Dict[str, List[Dict]], legacy: bool) -> List:
+    """
+    Decodes every known resource in the payloads
+    """
+    decoded = []
+    for rtype, resources in payloads.items():
+        class_type = RESOURCE_TYPES.get(rtype)
+        if class_type is not None:
+            for res in resources:
+                if legacy:
+                    decoded.append(legacy_decode(class_type, res))
+                else:
+                    decoded.append(class_type(res))
+    return decoded
+
+
+def peak_rss() -> int:
+    """
+    Returns the peak resident set size of this process (KiB)
+    """
+    # ru_maxrss is inherited from the parent process on Linux, so prefer
+    # VmHWM where available
+    try:
+        with open("/proc/self/status", encoding="utf-8") as status_file:
+            for line in status_file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure_rss(payloads: Dict[str, List[Dict]], legacy: bool):
+    """
+    Prints the increase in peak RSS (KiB) from decoding the payloads
+    MEMORY_COPIES times (should be run in a fresh process)
+    """
+    gc.collect()
+    before = peak_rss()
+    decoded = [decode_all(payloads, legacy) for _ in range(MEMORY_COPIES)]
+    after = peak_rss()
+    print(after - before)
+    del decoded
+
+
+def measure_allocations(payloads: Dict[str, List[Dict]], legacy: bool):
+    """
+    Returns the peak traced memory (bytes) and number of allocated blocks
+    still alive after decoding the payloads MEMORY_COPIES times
+    """
+    gc.collect()
+    tracemalloc.start()
+    decoded = [decode_all(payloads, legacy) for _ in range(MEMORY_COPIES)]
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = sum(
+        stat.count for stat in tracemalloc.take_snapshot().statistics("filename")
+    )
+    tracemalloc.stop()
+    del decoded
+    return peak, blocks
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--rss":
+        measure_rss(synthetic_payload(), legacy=sys.argv[2] == "legacy")
+        return
+
+    payloads = load_payloads(sys.argv[1:]) if len(sys.argv) > 1 else synthetic_payload()
+
+    print(f"{'resource':<15}{'count':>8}{'legacy (ms)':>14}{'cached (ms)':>14}")
+    for rtype, resources in payloads.items():
+        class_type = RESOURCE_TYPES.get(rtype)
+        if class_type is None:
+            continue
+        number = max(1, 2000 // len(resources))
+
+        legacy = min(
+            timeit.repeat(
+                lambda: [legacy_decode(class_type, res) for res in resources],
+                number=number,
+                repeat=REPEATS,
+            )
+        )
+        cached = min(
+            timeit.repeat(
+                lambda: [class_type(res) for res in resources],
+                number=number,
+                repeat=REPEATS,
+            )
+        )
+        print(
+            f"{rtype:<15}{len(resources):>8}"
+            f"{legacy / number * 1000:>14.3f}{cached / number * 1000:>14.3f}"
+        )
+
+    print()
+    print(f"Memory used decoding {MEMORY_COPIES} copies of every resource")
+    print(f"{'':<15}{'peak (KiB)':>14}{'blocks':>14}{'peak RSS (KiB)':>16}")
+    for name, legacy in (("legacy", True), ("slots", False)):
+        peak, blocks = measure_allocations(payloads, legacy)
+        # Peak RSS only ever increases, so measure in separate processes
+        # (always with the synthetic payload)
+        rss = subprocess.run(
+            [sys.executable, __file__, "--rss", "legacy" if legacy else "slots"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+        print(f"{name:<15}{peak / 1024:>14.0f}{blocks:>14}{rss:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Compares the CPU time taken to serialise typical API responses and Hue PUT
+bodies using the previous object_to_dict (which round tripped through a JSON
+string before jsonify encoded it again) against the direct serialiser and
+APIJSONProvider
+
+Usage:
+    python scripts/benchmark_serialization.py
+"""
+
+import json
+import timeit
+
+from flask import Flask, jsonify
+
+from homecontrol.aircon.structs import ACFanSpeed, ACMode, ACState, ACSwingMode
+from homecontrol.api.authentication.structs import User, UserGroup
+from homecontrol.api.helpers import APIJSONProvider
+from homecontrol.api.structs import Room, RoomState
+from homecontrol.helpers import get_attributes, object_to_dict
+from homecontrol.hue.api.structs import LightPut
+
+REPEATS = 5
+NUMBER = 2000
+
+
+def legacy_object_to_dict(obj):
+    """
+    Converts an object to a dictionary in the same way object_to_dict used to
+    """
+    return json.loads(json.dumps(obj, default=get_attributes))
+
+
+def example_responses():
+    """
+    Returns examples of data returned by API endpoints
+    """
+    ac_state = ACState(
+        power=True,
+        prompt_tone=False,
+        target=21,
+        mode=ACMode.COOL,
+        fan=ACFanSpeed.AUTO,
+        swing=ACSwingMode.OFF,
+        eco=False,
+        turbo=False,
+        fahrenheit=False,
+        indoor=22.5,
+        outdoor=14.0,
+    )
+    rooms = [
+        Room(
+            name=f"Room {i}",
+            ac_device_name=f"Room {i}",
+            hue_room_id=f"room-{i}",
+            hue_light_group=f"grouped-light-{i}",
+            hue_lights=[f"light-{i}-{j}" for j in range(5)],
+        )
+        for i in range(8)
+    ]
+    room_states = [
+        RoomState(
+            state_id=f"state-{i}",
+            name=f"State {i}",
+            room_name="Room",
+            icon="bed",
+            ac_device_name="Room",
+            ac_state_id=f"ac-state-{i}",
+            hue_scene_id=f"scene-{i}",
+            broadlink_device_name="Blaster",
+            broadlink_actions=["tv_power", "soundbar_power"],
+        )
+        for i in range(10)
+    ]
+    users = [
+        User(username=f"user{i}", uuid=f"{i}", group=UserGroup.default)
+        for i in range(5)
+    ]
+    return {
+        "ac state": ac_state,
+        "rooms": rooms,
+        "room states": room_states,
+        "users": users,
+    }
+
+
+def main():
+    legacy_app = Flask("legacy")
+    app = Flask("direct")
+    app.json = APIJSONProvider(app)
+
+    print(f"{'response':<15}{'legacy (us)':>14}{'direct (us)':>14}")
+    for name, data in example_responses().items():
+        with legacy_app.app_context():
+            legacy = min(
+                timeit.repeat(
+                    lambda: jsonify(legacy_object_to_dict(data)),
+                    number=NUMBER,
+                    repeat=REPEATS,
+                )
+            )
+        with app.app_context():
+            direct = min(
+                timeit.repeat(lambda: jsonify(data), number=NUMBER, repeat=REPEATS)
+            )
+        print(f"{name:<15}{legacy / NUMBER * 1e6:>14.1f}{direct / NUMBER * 1e6:>14.1f}")
+
+    # Hue PUT bodies are converted before being given to requests
+    light_put = LightPut(
+        {
+            "on": {"on": True},
+            "dimming": {"brightness": 80},
+            "color": {"xy": {"x": 0.3, "y": 0.3}},
+        }
+    )
+    legacy = min(
+        timeit.repeat(
+            lambda: json.dumps(legacy_object_to_dict(light_put)),
+            number=NUMBER,
+            repeat=REPEATS,
+        )
+    )
+    direct = min(
+        timeit.repeat(
+            lambda: json.dumps(object_to_dict(light_put)),
+            number=NUMBER,
+            repeat=REPEATS,
+        )
+    )
+    print(
+        f"{'hue put':<15}{legacy / NUMBER * 1e6:>14.1f}{direct / NUMBER * 1e6:>14.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import time
+from typing import List
+
+import pytest
+
+from homecontrol.aircon import async_aircon
+from homecontrol.aircon.async_aircon import UPDATABLE_FIELDS, AsyncACDevice
+from homecontrol.aircon.structs import (
+    ACConnectionInfo,
+    ACFanSpeed,
+    ACMode,
+    ACSwingMode,
+)
+
+
+class FakeAirConditioning:
+    """
+    Stands in for msmart's air_conditioning, backed by the state of a unit
+    that can be changed or made to stop responding
+
+    Like msmart, nothing is raised when the unit doesn't respond: the device
+    is marked as inactive and its attributes are left as they were
+    """
+
+    def __init__(self, ip_address: str, identifier: int, port: int) -> None:
+        self.responding = True
+        self.active = True
+        self.refreshes = 0
+        self.applies = 0
+
+        # State of the unit itself (by msmart attribute)
+        self.unit = {
+            "power_state": True,
+            "prompt_tone": False,
+            "target_temperature": 21,
+            "operational_mode": ACMode.COOL,
+            "fan_speed": ACFanSpeed.AUTO,
+            "swing_mode": ACSwingMode.OFF,
+            "eco_mode": False,
+            "turbo_mode": False,
+            "fahrenheit": False,
+            "indoor_temperature": 24.0,
+            "outdoor_temperature": 15.0,
+        }
+        self._read_unit()
+
+    def _read_unit(self):
+        for attribute, value in self.unit.items():
+            setattr(self, attribute, value)
+
+    def _send(self) -> bool:
+        self.active = self.responding
+        return self.responding
+
+    def authenticate(self, key: str, token: str) -> bool:
+        return self._send()
+
+    def get_capabilities(self):
+        self._send()
+
+    def refresh(self):
+        self.refreshes += 1
+        if self._send():
+            self._read_unit()
+
+    def apply(self):
+        self.applies += 1
+        if self._send():
+            for attribute in UPDATABLE_FIELDS.values():
+                self.unit[attribute] = getattr(self, attribute)
+            self._read_unit()
+
+
+@pytest.fixture
+def fake_units(monkeypatch) -> List[FakeAirConditioning]:
+    """
+    Replaces msmart's air_conditioning with FakeAirConditioning, returning
+    every one created
+    """
+    units = []
+
+    def create(*args) -> FakeAirConditioning:
+        unit = FakeAirConditioning(*args)
+        units.append(unit)
+        return unit
+
+    monkeypatch.setattr(async_aircon, "air_conditioning", create)
+    return units
+
+
+def create_device(name: str = "living_room", **kwargs) -> AsyncACDevice:
+    """
+    Returns an AsyncACDevice (fake_units should be in use)
+    """
+    return AsyncACDevice(
+        ACConnectionInfo(
+            name=name,
+            ip_address="127.0.0.1",
+            port=6444,
+            identifier=1,
+            key="key",
+            token="token",
+        ),
+        **kwargs,
+    )
+
+
+def wait_for(condition, timeout: float = 5) -> bool:
+    """
+    Waits for a condition to become true, returning whether it did
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
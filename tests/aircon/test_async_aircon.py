@@ -0,0 +1,70 @@
+import time
+
+import pytest
+from conftest import create_device
+
+from homecontrol import event_loop
+from homecontrol.aircon.exceptions import ACInvalidStateError
+from homecontrol.aircon.structs import ACFanSpeed, ACMode
+
+
+def test_update_state_refreshes_old_snapshot_first(fake_units):
+    device = create_device(update_max_age=0.05)
+    event_loop.run(device.connect())
+    event_loop.run(device.refresh())
+    unit = fake_units[0]
+
+    # Changed using the remote since the snapshot was taken
+    unit.unit["power_state"] = False
+    unit.unit["fan_speed"] = ACFanSpeed.LOW
+    time.sleep(0.1)
+
+    state = event_loop.run(device.update_state(power=True))
+    assert state.power
+    assert state.fan == ACFanSpeed.LOW
+    assert unit.applies == 1
+    assert unit.unit["power_state"]
+    assert unit.unit["fan_speed"] == ACFanSpeed.LOW
+
+
+def test_update_state_uses_recent_snapshot(fake_units):
+    device = create_device(update_max_age=60)
+    event_loop.run(device.connect())
+    event_loop.run(device.refresh())
+    unit = fake_units[0]
+
+    state = event_loop.run(device.update_state(target=23))
+    assert state.target == 23
+    assert unit.refreshes == 1
+    assert unit.applies == 1
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"target": "20"},
+        {"target": 20.5},
+        {"target": True},
+        {"power": 1},
+        {"mode": 99},
+        {"fan": "AUTO"},
+        {"indoor": 20},
+    ],
+)
+def test_update_state_rejects_invalid_values(fake_units, changes):
+    device = create_device()
+    event_loop.run(device.connect())
+
+    with pytest.raises(ACInvalidStateError):
+        event_loop.run(device.update_state(**changes))
+    assert fake_units[0].applies == 0
+
+
+def test_update_state_converts_enum_values(fake_units):
+    device = create_device()
+    event_loop.run(device.connect())
+
+    state = event_loop.run(device.update_state(mode=4, power=False))
+    assert state.mode is ACMode.HEAT
+    assert not state.power
+    assert fake_units[0].unit["operational_mode"] is ACMode.HEAT
@@ -0,0 +1,44 @@
+import pytest
+from conftest import create_device
+
+from homecontrol import event_loop
+from homecontrol.aircon.structs import ACFanSpeed
+from homecontrol.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitState,
+)
+from homecontrol.exceptions import DeviceConnectionError
+
+
+def test_breaker_opens_when_connected_unit_stops_responding(fake_units):
+    circuit_breaker = CircuitBreaker(
+        "living_room", CircuitBreakerConfig(failure_threshold=3, reset_timeout=60)
+    )
+    device = create_device(circuit_breaker=circuit_breaker)
+    event_loop.run(device.connect())
+    state = event_loop.run(device.get_state())
+    assert circuit_breaker.state == CircuitState.CLOSED
+
+    # msmart doesn't raise when the unit doesn't respond
+    fake_units[0].responding = False
+    with pytest.raises(DeviceConnectionError):
+        event_loop.run(device.refresh())
+    with pytest.raises(DeviceConnectionError):
+        event_loop.run(device.update_state(fan=ACFanSpeed.LOW))
+    with pytest.raises(DeviceConnectionError):
+        event_loop.run(device.set_state(state))
+
+    assert circuit_breaker.state == CircuitState.OPEN
+    assert circuit_breaker.get_stats().failures == 3
+    with pytest.raises(DeviceConnectionError):
+        circuit_breaker.check()
+
+
+def test_connect_fails_when_unit_doesnt_return_capabilities(fake_units):
+    device = create_device()
+    fake_units[0].get_capabilities = lambda: setattr(fake_units[0], "active", False)
+
+    with pytest.raises(DeviceConnectionError):
+        event_loop.run(device.connect())
+    assert not device.connected
@@ -0,0 +1,56 @@
+import pytest
+from conftest import create_device, wait_for
+
+from homecontrol import event_loop
+from homecontrol.aircon.poller import ACStatePoller
+from homecontrol.exceptions import DeviceConnectionError
+
+
+@pytest.fixture
+def device(fake_units):
+    device = create_device()
+    event_loop.run(device.connect())
+    return device
+
+
+def get_snapshot(device, max_age=None):
+    return event_loop.run(device.get_snapshot(max_age))
+
+
+def test_poller_keeps_snapshot_up_to_date(device, fake_units):
+    unit = fake_units[0]
+    poller = ACStatePoller(interval=0.01, refresh=device.refresh)
+    poller.start()
+    try:
+        unit.unit["indoor_temperature"] = 26.5
+        assert wait_for(lambda: get_snapshot(device).state.indoor == 26.5)
+    finally:
+        poller.stop()
+
+    # Reads are served from the snapshot without contacting the unit (once
+    # any refresh the poller left in progress has finished)
+    event_loop.run(device.refresh())
+    refreshes = unit.refreshes
+    assert get_snapshot(device, max_age=60).state.indoor == 26.5
+    assert unit.refreshes == refreshes
+
+
+def test_poller_keeps_last_snapshot_when_unit_stops_responding(device, fake_units):
+    unit = fake_units[0]
+    poller = ACStatePoller(interval=0.01, refresh=device.refresh)
+    poller.start()
+    try:
+        assert wait_for(lambda: unit.refreshes > 0)
+        snapshot = get_snapshot(device)
+
+        unit.responding = False
+        unit.unit["indoor_temperature"] = 30.0
+        refreshes = unit.refreshes
+        assert wait_for(lambda: unit.refreshes >= refreshes + 3)
+    finally:
+        poller.stop()
+
+    # Failed polls don't make the old state look fresh
+    assert get_snapshot(device) == snapshot
+    with pytest.raises(DeviceConnectionError):
+        get_snapshot(device, max_age=0)
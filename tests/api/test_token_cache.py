@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+
+from homecontrol.api.authentication import token_cache
+from homecontrol.api.authentication.structs import User, UserGroup
+from homecontrol.api.authentication.token_cache import TokenCache
+
+
+@pytest.fixture
+def clock(monkeypatch) -> SimpleNamespace:
+    """
+    Replaces the time used by the cache with one that only moves when told to
+    """
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(token_cache, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def make_user(username: str) -> User:
+    return User(username=username, uuid=f"{username}-uuid", group=UserGroup.default)
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TokenCache(max_size=4, ttl=60)
+    user = make_user("alice")
+    cache.put("token", user, token_expiry=clock.now + 3600)
+
+    clock.now += 59
+    assert cache.get("token") == user
+
+    clock.now += 1
+    assert cache.get("token") is None
+    assert cache.get_stats().size == 0
+
+
+def test_entries_expire_with_token(clock):
+    cache = TokenCache(max_size=4, ttl=60)
+    cache.put("token", make_user("alice"), token_expiry=clock.now + 10)
+
+    clock.now += 10
+    assert cache.get("token") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TokenCache(max_size=2, ttl=60)
+    expiry = clock.now + 3600
+    cache.put("a", make_user("a"), expiry)
+    cache.put("b", make_user("b"), expiry)
+
+    # Using a makes b the least recently used
+    assert cache.get("a") is not None
+    cache.put("c", make_user("c"), expiry)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    stats = cache.get_stats()
+    assert stats.size == 2
+    assert stats.max_size == 2
+    assert stats.evictions == 1
+
+
+def test_hits_and_misses_are_counted(clock):
+    cache = TokenCache(max_size=4, ttl=60)
+    cache.put("token", make_user("alice"), token_expiry=clock.now + 3600)
+
+    cache.get("token")
+    cache.get("token")
+    cache.get("unknown")
+    clock.now += 60
+    cache.get("token")
+
+    stats = cache.get_stats()
+    assert stats.hits == 2
+    assert stats.misses == 2
+    assert stats.evictions == 0
+
+
+def test_zero_size_disables_cache(clock):
+    cache = TokenCache(max_size=0, ttl=60)
+    cache.put("token", make_user("alice"), token_expiry=clock.now + 3600)
+
+    assert cache.get("token") is None
+    assert cache.get_stats().size == 0
@@ -0,0 +1,40 @@
+import pytest
+
+from homecontrol.broadlink.exceptions import IRMacroError
+from homecontrol.broadlink.macro import IRMacro
+
+
+def compile_macro(actions, **kwargs) -> IRMacro:
+    return IRMacro.compile(
+        actions,
+        get_packet=lambda command: command.encode(),
+        command_gap=0.1,
+        max_repeat=5,
+        max_duration=10,
+        **kwargs,
+    )
+
+
+def test_compile_plans_duration():
+    macro = compile_macro(["tv*2", "wait:2.5", "amp"])
+    assert [step.command for step in macro.steps] == ["tv", "tv", "amp"]
+    assert [step.delay for step in macro.steps] == [0, 0.1, 2.5]
+    assert macro.duration == pytest.approx(2.6)
+
+
+@pytest.mark.parametrize(
+    "actions",
+    [
+        ["wait:inf"],
+        ["wait:nan"],
+        ["wait:-1"],
+        ["wait:soon"],
+        ["tv", "wait:11"],
+        ["tv", "wait:6", "wait:6"],
+        ["tv*6"],
+        ["tv*0"],
+    ],
+)
+def test_compile_rejects_invalid_actions(actions):
+    with pytest.raises(IRMacroError):
+        compile_macro(actions)
@@ -0,0 +1,61 @@
+import json
+import time
+from threading import Event
+
+import pytest
+
+from homecontrol.broadlink.manager import BroadlinkManager
+from homecontrol.exceptions import DeviceConnectionError
+
+
+class FakeBroadlinkDevice:
+    """
+    Stands in for a BroadlinkDevice whose sends take a while
+    """
+
+    def __init__(self, send_time: float) -> None:
+        self.send_time = send_time
+        self.sent = []
+        self.released = Event()
+
+    def auth(self):
+        pass
+
+    def send_ir_packet(self, packet: bytes):
+        self.released.wait(self.send_time)
+        self.sent.append(packet)
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open("broadlink.json", "w", encoding="utf-8") as config_file:
+        json.dump({"macros": {"command_gap": 0, "send_timeout": 0.1}}, config_file)
+    with BroadlinkManager() as manager:
+        yield manager
+
+
+def test_run_ir_macro_returns_results(manager):
+    device = FakeBroadlinkDevice(send_time=0)
+    manager._add_device("tv", device)
+    manager._save_ir_command("tv", "power", b"power")
+
+    results = manager.run_ir_macro("tv", ["power", "wait:0.05", "power"])
+    assert [result.error for result in results] == [None, None]
+    assert device.sent == [b"power", b"power"]
+
+
+def test_run_ir_macro_times_out_and_skips_remaining_steps(manager):
+    device = FakeBroadlinkDevice(send_time=5)
+    manager._add_device("tv", device)
+    manager._save_ir_command("tv", "power", b"power")
+
+    start = time.monotonic()
+    with pytest.raises(DeviceConnectionError):
+        manager.run_ir_macro("tv", ["power", "power"])
+    assert time.monotonic() - start < 1
+
+    # The send in progress finishes but the next one is skipped
+    device.released.set()
+    time.sleep(0.1)
+    assert device.sent == [b"power"]
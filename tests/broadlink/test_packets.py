@@ -0,0 +1,71 @@
+import struct
+
+import pytest
+
+from homecontrol.broadlink.packets import (
+    HEADER_FORMAT,
+    MAX_GAP,
+    TICK,
+    can_combine_ir_packet,
+    combine_ir_packets,
+    get_combined_size,
+)
+
+
+def make_packet(data: bytes, packet_type: int = 0x26, repeat: int = 0) -> bytes:
+    """
+    Returns a packet as learnt by a broadlink device (padded to 16 bytes)
+    """
+    packet = struct.pack(HEADER_FORMAT, packet_type, repeat, len(data)) + data
+    return packet + bytes(-len(packet) % 16)
+
+
+# Pulse, gap, pulse, gap of 0x30 ticks
+FIRST = make_packet(bytes([0x10, 0x20, 0x10, 0x30]))
+# Pulse, gap
+SECOND = make_packet(bytes([0x11, 0x21]))
+
+
+def test_combine_extends_final_gap():
+    gap_ticks = round(0.1 / TICK)
+    assert gap_ticks > 0xFF
+
+    packet = combine_ir_packets([FIRST, SECOND], [0.1])
+
+    data = bytes([0x10, 0x20, 0x10, 0x00]) + gap_ticks.to_bytes(2, "big")
+    data += bytes([0x11, 0x21])
+    assert struct.unpack_from(HEADER_FORMAT, packet) == (0x26, 0, len(data))
+    assert packet[4 : 4 + len(data)] == data
+    assert len(packet) == 16
+    assert not any(packet[4 + len(data) :])
+    assert len(packet) <= get_combined_size([FIRST, SECOND])
+    assert can_combine_ir_packet(packet)
+
+
+def test_combine_keeps_longer_final_gap():
+    packet = combine_ir_packets([FIRST, SECOND], [0])
+
+    data = bytes([0x10, 0x20, 0x10, 0x30, 0x11, 0x21])
+    assert struct.unpack_from(HEADER_FORMAT, packet) == (0x26, 0, len(data))
+    assert packet[4 : 4 + len(data)] == data
+
+
+@pytest.mark.parametrize(
+    "packet",
+    [
+        make_packet(bytes([0x10, 0x20]), packet_type=0xB2),
+        make_packet(bytes([0x10, 0x20]), repeat=1),
+        make_packet(bytes([0x10, 0x20, 0x10])),
+        make_packet(bytes([0x10, 0x00, 0x01])),
+        make_packet(b""),
+    ],
+)
+def test_packets_that_cannot_be_combined(packet):
+    assert not can_combine_ir_packet(packet)
+    with pytest.raises(ValueError):
+        combine_ir_packets([FIRST, packet], [0.1])
+
+
+def test_combine_rejects_gap_too_long():
+    with pytest.raises(ValueError):
+        combine_ir_packets([FIRST, SECOND], [MAX_GAP + 0.01])
@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from homecontrol.database.mysql.exceptions import DatabasePoolTimeoutError
+from homecontrol.database.mysql.pool import DatabaseConnectionPool
+from homecontrol.database.mysql.structs import (
+    DatabaseConnectionInfo,
+    DatabasePoolConfig,
+)
+
+
+class FakeConnection:
+    """
+    Stands in for a MySQLConnection
+    """
+
+    def __init__(self) -> None:
+        self.broken = False
+        self.closed = False
+        self.rollbacks = 0
+
+    def ping(self, reconnect: bool = False):
+        if self.broken:
+            raise ConnectionError("Lost connection")
+
+    def rollback(self):
+        if self.broken:
+            raise ConnectionError("Lost connection")
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnector:
+    """
+    Makes fake connections, keeping track of all those made
+    """
+
+    def __init__(self) -> None:
+        self.connections = []
+
+    def __call__(self, **kwargs) -> FakeConnection:
+        connection = FakeConnection()
+        self.connections.append(connection)
+        return connection
+
+
+def make_pool(connector: FakeConnector, **config) -> DatabaseConnectionPool:
+    return DatabaseConnectionPool(
+        DatabaseConnectionInfo(
+            database="homecontrol", host="localhost", username="user", password=""
+        ),
+        DatabasePoolConfig(**config),
+        connect=connector,
+    )
+
+
+def test_released_connections_are_reused():
+    connector = FakeConnector()
+    pool = make_pool(connector)
+
+    connection = pool.acquire()
+    pool.release(connection)
+    assert pool.acquire() is connection
+    assert connection.rollbacks == 1
+
+    stats = pool.get_stats()
+    assert stats.connects == 1
+    assert stats.checkouts == 2
+    assert stats.reuses == 1
+    assert stats.open_connections == 1
+    assert stats.idle_connections == 0
+
+
+def test_exhausted_pool_times_out():
+    connector = FakeConnector()
+    pool = make_pool(connector, pool_size=2, checkout_timeout=0.05)
+
+    pool.acquire()
+    pool.acquire()
+    with pytest.raises(DatabasePoolTimeoutError):
+        pool.acquire()
+    assert len(connector.connections) == 2
+    assert pool.get_stats().checkout_timeouts == 1
+
+
+def test_exhausted_pool_waits_for_a_release():
+    connector = FakeConnector()
+    pool = make_pool(connector, pool_size=1, checkout_timeout=5)
+
+    connection = pool.acquire()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        waiting = executor.submit(pool.acquire)
+        pool.release(connection)
+        assert waiting.result(timeout=5) is connection
+    assert len(connector.connections) == 1
+
+
+def test_broken_connection_is_discarded_on_release():
+    connector = FakeConnector()
+    pool = make_pool(connector, pool_size=1)
+
+    connection = pool.acquire()
+    connection.broken = True
+    pool.release(connection)
+    assert connection.closed
+    assert pool.get_stats().open_connections == 0
+
+    # Frees up space in the pool for a new connection
+    new_connection = pool.acquire()
+    assert new_connection is not connection
+    assert len(connector.connections) == 2
+
+
+def test_broken_idle_connection_is_replaced_on_checkout():
+    connector = FakeConnector()
+    pool = make_pool(connector, pool_size=1, health_check_interval=0)
+
+    connection = pool.acquire()
+    pool.release(connection)
+    connection.broken = True
+
+    new_connection = pool.acquire()
+    assert new_connection is not connection
+    assert connection.closed
+    stats = pool.get_stats()
+    assert stats.health_check_failures == 1
+    assert stats.open_connections == 1
@@ -0,0 +1,157 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Thread
+
+import pytest
+
+from homecontrol.hue.api.cache import HueResourceCache
+from homecontrol.hue.api.events import HueEventStream
+from homecontrol.hue.api.structs import RoomGet
+from homecontrol.hue.structs import HueBridgeAuthConfig, HueBridgeConnectionInfo
+
+
+def make_room(identifier: str, name: str) -> dict:
+    """
+    Returns a room as the bridge would return it
+    """
+    return {
+        "type": "room",
+        "id": identifier,
+        "id_v1": f"/groups/{identifier}",
+        "metadata": {"name": name, "archetype": "living_room"},
+        "services": [],
+        "children": [],
+    }
+
+
+def make_update(identifier: str, name: str) -> list:
+    """
+    Returns a message from the event stream renaming a room
+    """
+    return [
+        {
+            "type": "update",
+            "data": [{"type": "room", "id": identifier, "metadata": {"name": name}}],
+        }
+    ]
+
+
+class FakeBridgeHandler(BaseHTTPRequestHandler):
+    """
+    Serves resources and a chunked event stream like a hue bridge
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        bridge = self.server
+        if self.path == HueEventStream.EVENT_STREAM_ENDPOINT:
+            bridge.connections += 1
+            connection = bridge.connections
+
+            # Same headers as the bridge (no charset)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            messages = (
+                bridge.messages[connection - 1]
+                if connection <= len(bridge.messages)
+                else []
+            )
+            for message in messages:
+                data = json.dumps(message, ensure_ascii=False)
+                self._write_chunk(f"id: {connection}\ndata: {data}\n\n".encode())
+
+            if connection == 1:
+                # Drop the stream, changing a room while disconnected
+                bridge.release_first.wait(5)
+                bridge.rooms.append(make_room("r2", "Bedroom"))
+            else:
+                bridge.stopping.wait(5)
+            self._write_chunk(b"")
+            self.close_connection = True
+            return
+
+        rtype = self.path[len(HueResourceCache.RESOURCE_ENDPOINT) :]
+        body = json.dumps(
+            {"data": list(bridge.rooms) if rtype == "room" else []}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def bridge():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBridgeHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.rooms = [make_room("r1", "Living room")]
+    server.messages = [[make_update("r1", "Küche")], [make_update("r2", "Salón")]]
+    server.release_first = Event()
+    server.stopping = Event()
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.release_first.set()
+    server.stopping.set()
+    server.shutdown()
+    server.server_close()
+
+
+def wait_for(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def get_room_name(cache: HueResourceCache, identifier: str):
+    rooms = cache.get_resources(
+        f"{HueResourceCache.RESOURCE_ENDPOINT}room/{identifier}", RoomGet
+    )
+    return rooms[0].metadata.name if rooms else None
+
+
+def test_event_stream_keeps_cache_in_sync(bridge):
+    cache = HueResourceCache()
+    stream = HueEventStream(
+        connection_info=HueBridgeConnectionInfo(
+            identifier="bridge", ip_address="127.0.0.1", port=bridge.server_port
+        ),
+        ca_cert="",
+        auth_config=HueBridgeAuthConfig(username="user", clientkey="key"),
+        cache=cache,
+    )
+    stream.RECONNECT_DELAY = 0.05
+    stream._session._base_url = f"http://127.0.0.1:{bridge.server_port}"
+    stream.start()
+    try:
+        # Resynced on connecting, then the update is applied (decoded as UTF-8)
+        assert wait_for(lambda: get_room_name(cache, "r1") == "Küche")
+        assert get_room_name(cache, "r2") is None
+
+        # Reconnects after the stream is lost and resyncs, picking up the
+        # change made while disconnected along with any new events
+        bridge.release_first.set()
+        assert wait_for(lambda: get_room_name(cache, "r2") == "Salón")
+        assert bridge.connections == 2
+        assert get_room_name(cache, "r1") == "Living room"
+    finally:
+        # End the stream from the bridge's side first as closing it can't
+        # interrupt a blocked read
+        bridge.stopping.set()
+        stream.stop()
+    assert not cache.synced